@@ -0,0 +1,156 @@
+"""
+说明：此脚本为RedisOperation的asyncio版本,基于redis.asyncio,用于在一个事件循环中同时执行多个互不依赖的操作
+(多个db的统计,多个key的查看,INFO轮询),不需要为每个操作占用一个线程.同步的RedisOperation仍供脚本和命令行使用
+事件循环与Qt的集成见async_task
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import asyncio
+
+import redis.asyncio as aioredis
+from redis import ResponseError
+
+from connection_manager import connection_manager
+from prefix_sketch import PrefixCounter
+from redis_operation import PREFIX_COUNT_SCRIPT, CENSUS_COUNT, transform_key_name_to_simple, parse_prefix_counts, \
+    count_key_prefixes, key_info_from_reply, described_keys, batch_key_stats, scan_cursor_progress, KeyStatsCounter
+
+
+async def run_blocking(fn, *args):
+    """
+    在默认线程池中执行按前缀计数,合并结果等CPU密集的函数.安装了qasync时事件循环就是GUI线程,不能在其中直接执行
+    :param fn: 普通函数
+    :param args: fn的参数
+    :return: fn的返回值
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+class AsyncRedisOperation(object):
+
+    def __init__(self, redis_db, redis_host, redis_port, password=None):
+        """
+        :param redis_db: db号码(0-15)
+        :param redis_host: ip
+        :param redis_port: 端口
+        :param password: 密码
+        """
+        self._redis_db = redis_db
+        self._db = aioredis.StrictRedis(connection_pool=connection_manager.get_async_pool(redis_host, redis_port,
+                                                                                          redis_db, password))
+        self._prefix_count_script = None
+
+    async def ping(self):
+        await self._db.ping()
+
+    async def info(self, section=None):
+        """
+        :param section: INFO的section,为None时为默认的section
+        :return: {字段:值}
+        """
+        return await self._db.info(section) if section else await self._db.info()
+
+    async def dbsize(self):
+        return await self._db.dbsize()
+
+    async def get_type(self, name):
+        """
+        :return: key的数据类型,key不存在返回None
+        """
+        key_type = (await self._db.type(name)).decode()
+        return None if key_type == 'none' else key_type
+
+    async def scan_keys_batches(self, count=10000, match=None):
+        """
+        按SCAN分片遍历所有的KEY,见RedisOperation.scan_keys_batches
+        :return: async generator (本次SCAN返回的cursor, key列表)
+        """
+        scan_cursor = 0
+        while True:
+            scan_cursor, key_list = await self._db.scan(scan_cursor, match=match, count=count)
+            yield scan_cursor, key_list
+            if scan_cursor == 0:
+                return
+
+    async def scan_prefix_counts(self, scan_cursor, count=10000):
+        """
+        在redis中执行一次SCAN并按前缀统计,见RedisOperation.scan_prefix_counts
+        """
+        if self._prefix_count_script is None:
+            self._prefix_count_script = self._db.register_script(PREFIX_COUNT_SCRIPT)
+        return parse_prefix_counts(await self._prefix_count_script(args=[scan_cursor, count]))
+
+    async def scan_prefix_batches(self, count=10000, server_side=False, namespace_rule=None, key_callback=None):
+        """
+        按SCAN分片统计key数量分布,参数见RedisOperation.scan_prefix_batches
+        :return: async generator (本次SCAN返回的cursor, 分片的{key:number})
+        """
+        transform = namespace_rule.transform_to_name if namespace_rule else transform_key_name_to_simple
+        if server_side and (namespace_rule is None or namespace_rule.is_simple):
+            try:
+                scan_cursor, batch_key_number_dict = await self.scan_prefix_counts(0, count)
+            except ResponseError:
+                server_side = False
+            else:
+                yield scan_cursor, batch_key_number_dict
+                while scan_cursor != 0:
+                    scan_cursor, batch_key_number_dict = await self.scan_prefix_counts(scan_cursor, count)
+                    yield scan_cursor, batch_key_number_dict
+                return
+        async for scan_cursor, key_list in self.scan_keys_batches(count=count):
+            if key_callback:
+                await run_blocking(key_callback, key_list)
+            yield scan_cursor, await run_blocking(count_key_prefixes, key_list, transform)
+
+    async def scan_all_keys(self, batch_callback=None, cancel_event=None, server_side=False, namespace_rule=None,
+                            key_callback=None, count=CENSUS_COUNT):
+        """
+        遍历所有的KEY,统计数量分布,参数和返回值见RedisOperation.scan_all_keys
+        """
+        key_number_counter = PrefixCounter()
+        dbsize = await self._db.dbsize() if batch_callback else 0
+        async for scan_cursor, batch_key_number_dict in self.scan_prefix_batches(count, server_side, namespace_rule,
+                                                                                  key_callback):
+            await run_blocking(key_number_counter.update, batch_key_number_dict)
+            if batch_callback:
+                batch_callback(batch_key_number_dict, scan_cursor_progress(scan_cursor, dbsize))
+            if cancel_event is not None and cancel_event.is_set():
+                break
+        return await run_blocking(key_number_counter.to_dict)
+
+    async def describe_keys(self, key_list, memory=True):
+        """
+        用两次pipeline获取一批key的类型,长度和占用内存,见RedisOperation.describe_keys
+        """
+        async with self._db.pipeline(transaction=False) as pipe:
+            for key_name in key_list:
+                pipe.type(key_name)
+                if memory:
+                    pipe.memory_usage(key_name)
+            key_info_list = key_info_from_reply(key_list, await pipe.execute(raise_on_error=False), memory)
+        async with self._db.pipeline(transaction=False) as pipe:
+            for key_name, key_type, command, memory_usage in key_info_list:
+                if command:
+                    pipe.execute_command(command, key_name)
+            return described_keys(key_info_list, await pipe.execute(raise_on_error=False))
+
+    async def scan_key_stats(self, batch_callback=None, cancel_event=None, memory=True, count=1000,
+                             namespace_rule=None, key_callback=None):
+        """
+        遍历所有的KEY,按前缀统计数据类型分布,元素数量和占用内存,参数和返回值见RedisOperation.scan_key_stats
+        """
+        key_stats_counter = KeyStatsCounter()
+        transform = namespace_rule.transform_to_name if namespace_rule else transform_key_name_to_simple
+        dbsize = await self._db.dbsize() if batch_callback else 0
+        async for scan_cursor, key_list in self.scan_keys_batches(count=count):
+            if key_callback:
+                await run_blocking(key_callback, key_list)
+            batch_key_stats_dict = await run_blocking(batch_key_stats, await self.describe_keys(key_list, memory),
+                                                      transform)
+            await run_blocking(key_stats_counter.update, batch_key_stats_dict)
+            if batch_callback:
+                batch_callback(batch_key_stats_dict, scan_cursor_progress(scan_cursor, dbsize))
+            if cancel_event is not None and cancel_event.is_set():
+                break
+        return await run_blocking(key_stats_counter.to_dict)
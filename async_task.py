@@ -0,0 +1,139 @@
+"""
+说明：此脚本用于在asyncio事件循环中执行async_operation的协程,接口与redis_task.start_task一致
+安装了qasync时,Qt的事件循环同时作为asyncio的事件循环,协程直接在GUI线程中执行,不占用任何线程;
+没有qasync时,所有协程在同一个后台线程的事件循环中执行,结果通过Qt信号排队回到GUI线程
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import asyncio
+import threading
+import traceback
+
+from instrumentation import action_scope
+from redis_task import TaskSignals
+
+try:
+    import qasync
+except ImportError:
+    qasync = None
+
+
+_loop = None  # 执行协程的事件循环
+_running_task_set = set()  # 持有运行中任务的引用,防止信号对象在任务结束前被回收
+
+
+def install_event_loop(app):
+    """
+    安装了qasync时把Qt的事件循环设置为asyncio的事件循环,在创建QApplication之后,创建窗口之前调用
+    :param app: QApplication
+    :return: 是否使用了qasync
+    """
+    global _loop
+    if qasync is None:
+        return False
+    _loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(_loop)
+    return True
+
+
+def event_loop():
+    """
+    :return: 执行协程的事件循环,没有安装qasync的事件循环时启动一个后台线程运行事件循环
+    """
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        threading.Thread(target=_loop.run_forever, name='redis-asyncio', daemon=True).start()
+    return _loop
+
+
+def uses_qt_loop():
+    return qasync is not None and isinstance(_loop, qasync.QEventLoop)
+
+
+def exec_app(app):
+    """
+    运行GUI的事件循环,代替app.exec_().使用qasync时由qasync的事件循环驱动Qt
+    :param app: QApplication
+    :return: 退出码
+    """
+    if not uses_qt_loop():
+        return app.exec_()
+    with _loop:
+        _loop.run_forever()
+    return 0
+
+
+class AsyncTask(object):
+
+    def __init__(self, coroutine_fn, *args, **kwargs):
+        """
+        :param coroutine_fn: 协程函数,第一个参数为当前task实例,可用于上报进度和检查取消状态
+        :param args: coroutine_fn的位置参数
+        :param kwargs: coroutine_fn的关键字参数
+        """
+        self.coroutine_fn = coroutine_fn
+        self.action = getattr(coroutine_fn, '__name__', 'task')  # 命令统计中的操作名,见instrumentation
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """
+        请求取消任务:设置cancel_event,协程在分片之间检查后返回已完成的部分
+        :return:
+        """
+        self.cancel_event.set()
+
+    def report_partial(self, data):
+        self.signals.partial.emit(data)
+
+    def report_progress(self, percent):
+        self.signals.progress.emit(max(0, min(100, int(percent))))
+
+    async def run(self):
+        try:
+            with action_scope(self.action):
+                result = await self.coroutine_fn(self, *self.args, **self.kwargs)
+        except asyncio.CancelledError:
+            self.cancel_event.set()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+def start_coroutine(coroutine_fn, *args, on_result=None, on_partial=None, on_progress=None, on_error=None,
+                    on_finished=None, action=None, **kwargs):
+    """
+    创建并在事件循环中执行一个协程任务,回调都在GUI线程执行,见redis_task.start_task
+    :param coroutine_fn: 协程函数 coroutine_fn(task, *args, **kwargs)
+    :param action: 命令统计中的操作名,默认为coroutine_fn的函数名
+    :return: AsyncTask
+    """
+    task = AsyncTask(coroutine_fn, *args, **kwargs)
+    if action:
+        task.action = action
+    for signal, slot in ((task.signals.result, on_result), (task.signals.partial, on_partial),
+                         (task.signals.progress, on_progress), (task.signals.error, on_error),
+                         (task.signals.finished, on_finished)):
+        if slot:
+            signal.connect(slot)
+    _running_task_set.add(task)
+    task.signals.finished.connect(lambda: _running_task_set.discard(task))
+    loop = event_loop()
+    if uses_qt_loop():
+        task.future = asyncio.ensure_future(task.run(), loop=loop)
+    else:
+        task.future = asyncio.run_coroutine_threadsafe(task.run(), loop)
+    return task
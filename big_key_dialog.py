@@ -0,0 +1,121 @@
+"""
+说明：此脚本用于展示大key扫描的结果,双击某行在主窗口中打开该key
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+from PyQt5.QtCore import Qt, pyqtSignal, QSortFilterProxyModel
+from PyQt5.QtGui import QStandardItemModel, QStandardItem
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QTableView, QProgressBar, QPushButton, \
+    QLabel, QAbstractItemView
+
+from big_keys import BigKeyScanner
+from redis_task import start_task
+
+
+ALL_TYPES = 'all types'
+
+
+class BigKeyDialog(QDialog):
+    key_selected = pyqtSignal(str, str)  # (db, key名) 双击某行时发送
+
+    def __init__(self, parent, con, db, namespace_rule=None, node_con_list=None):
+        """
+        :param parent: 主窗口
+        :param con: 当前db的RedisOperation实例
+        :param db: db号码
+        :param namespace_rule: key_namespace.NamespaceRule
+        :param node_con_list: 集群各master的RedisOperation实例,见BigKeyScanner
+        """
+        super(BigKeyDialog, self).__init__(parent)
+        self.setWindowTitle('Big keys - db{}'.format(db))
+        self.resize(760, 480)
+        self.db = db
+        self.result = {'type': dict(), 'prefix': dict()}
+        self.group_combo = QComboBox(self)
+        self.group_combo.currentTextChanged.connect(self.show_group)
+        self.status_label = QLabel(self)
+        self.progress_bar = QProgressBar(self)
+        self.cancel_button = QPushButton('Cancel', self)
+        self.model = QStandardItemModel(0, 5, self)
+        self.model.setHorizontalHeaderLabels(['key', 'type', 'length', 'bytes', 'prefix'])
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.table_view = QTableView(self)
+        self.table_view.setModel(self.proxy_model)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.doubleClicked.connect(self.open_key)
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(self.group_combo)
+        top_layout.addWidget(self.status_label)
+        top_layout.addStretch()
+        top_layout.addWidget(self.progress_bar)
+        top_layout.addWidget(self.cancel_button)
+        layout = QVBoxLayout(self)
+        layout.addLayout(top_layout)
+        layout.addWidget(self.table_view)
+        self.scanner = BigKeyScanner(con, namespace_rule=namespace_rule, node_con_list=node_con_list)
+        self.task = start_task(self.run_scanner, self.scanner, on_progress=self.progress_bar.setValue,
+                               on_partial=self.show_scan_number, on_result=self.show_result,
+                               on_error=self.show_error, on_finished=self.scan_stopped)
+        self.cancel_button.clicked.connect(self.task.cancel)
+
+    @staticmethod
+    def run_scanner(task, scanner):
+        """
+        后台线程:遍历db,上报进度和已遍历的key数量
+        """
+        def progress_callback(progress, scan_number):
+            task.report_progress(progress * 100)
+            task.report_partial(scan_number)
+        return scanner.run(progress_callback, task.cancel_event)
+
+    def show_scan_number(self, scan_number):
+        self.status_label.setText('scanned {} keys'.format(scan_number))
+
+    def show_result(self, result):
+        self.result = result
+        self.group_combo.clear()
+        self.group_combo.addItem(ALL_TYPES)
+        self.group_combo.addItems(['type: {}'.format(key_type) for key_type in sorted(result['type'])])
+        self.group_combo.addItems(['prefix: {}'.format(prefix) for prefix in sorted(result['prefix'])])
+
+    def show_error(self, message):
+        self.status_label.setText('error: {}'.format(message))
+
+    def scan_stopped(self):
+        self.cancel_button.setEnabled(False)
+        if self.task.cancelled:
+            self.status_label.setText('{} (cancelled)'.format(self.status_label.text()))
+
+    def show_group(self, group):
+        """
+        :param group: 下拉框中的分组, all types / type: xxx / prefix: xxx
+        :return:
+        """
+        if group == ALL_TYPES:
+            item_list = [item for item_list in self.result['type'].values() for item in item_list]
+        elif group.startswith('type: '):
+            item_list = self.result['type'].get(group[len('type: '):], [])
+        else:
+            item_list = self.result['prefix'].get(group[len('prefix: '):], [])
+        self.model.removeRows(0, self.model.rowCount())
+        for key_name, key_type, length, memory_usage in item_list:
+            row = [QStandardItem(key_name), QStandardItem(key_type)]
+            for value in (length, memory_usage if memory_usage is not None else -1):
+                item = QStandardItem()
+                item.setData(value, Qt.DisplayRole)  # 按数值排序
+                row.append(item)
+            row.append(QStandardItem(self.scanner.prefix_of(key_name)))
+            self.model.appendRow(row)
+        self.table_view.sortByColumn(3 if self.scanner.sort_by == 'bytes' else 2, Qt.DescendingOrder)
+
+    def open_key(self, index):
+        key_name = self.proxy_model.index(index.row(), 0).data()
+        self.key_selected.emit(self.db, key_name)
+
+    def closeEvent(self, event):
+        self.task.cancel()
+        super(BigKeyDialog, self).closeEvent(event)
@@ -0,0 +1,156 @@
+"""
+说明：此脚本用于遍历db找出各数据类型和各前缀中最大的key
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import heapq
+import itertools
+import threading
+
+from cluster import fan_out, NodeProgress
+from redis_operation import scan_cursor_progress, transform_key_name_to_simple
+
+
+TOP_K = 20  # 每种类型,每个前缀保留的最大key数量
+MAX_PREFIXES = 1000  # 最多为多少个前缀单独保留最大key,防止前缀数量爆炸时占用过多内存
+SCAN_COUNT = 1000  # 每次SCAN的COUNT,同时也是每次pipeline中的key数量
+
+
+class TopK(object):
+    """
+    固定大小的最小堆,只保留最大的k个元素.同一个key只保留一个(SCAN可能多次返回同一个key)
+    """
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self._heap = []  # [(size, 序号, key, item)],序号保证比较不会落到item上
+        self._entry_dict = dict()  # {key:堆中的元素}
+        self._counter = itertools.count()
+
+    def push(self, size, item, key=None):
+        """
+        :param size: 用于比较大小的值
+        :param item: 元素
+        :param key: 去重用的键,已存在时用本次的值替换,为None时不去重
+        :return:
+        """
+        if key is not None and key in self._entry_dict:
+            self._heap.remove(self._entry_dict.pop(key))
+            heapq.heapify(self._heap)
+        entry = (size, next(self._counter), key, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif size > self._heap[0][0]:
+            evicted = heapq.heapreplace(self._heap, entry)
+            self._entry_dict.pop(evicted[2], None)
+        else:
+            return
+        if key is not None:
+            self._entry_dict[key] = entry
+
+    def items(self):
+        """
+        :return: [(size, item)],从大到小排列
+        """
+        return [(size, item) for size, _, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class BigKeyScanner(object):
+
+    def __init__(self, con, top_k=TOP_K, sort_by='bytes', namespace_rule=None, node_con_list=None):
+        """
+        :param con: RedisOperation实例
+        :param top_k: 每种类型,每个前缀保留的最大key数量
+        :param sort_by: bytes 按MEMORY USAGE排序, length 按元素数量(string为字节数)排序
+        :param namespace_rule: key_namespace.NamespaceRule,为None时使用transform_key_name_to_simple
+        :param node_con_list: 集群各master的RedisOperation实例,传入时并发遍历各master,不使用con遍历
+        """
+        self.con = con
+        self.node_con_list = list(node_con_list or [])
+        self._lock = threading.Lock()  # 并发遍历各master时保护统计结果
+        self.top_k = top_k
+        self.sort_by = sort_by
+        self._transform = namespace_rule.transform_to_name if namespace_rule else transform_key_name_to_simple
+        self.type_top_dict = dict()  # {类型:TopK}
+        self.prefix_top_dict = dict()  # {统计命名:TopK}
+        self.scan_number = 0  # 已遍历的key数量
+
+    def add(self, key_name, key_type, length, memory_usage):
+        """
+        :param key_name: key名
+        :param key_type: key的数据类型
+        :param length: 元素数量(string为字节数)
+        :param memory_usage: 内存字节数,无法获取时为None
+        :return:
+        """
+        size = length if self.sort_by == 'length' or memory_usage is None else memory_usage
+        item = (key_name, key_type, length, memory_usage)
+        if key_type not in self.type_top_dict:
+            self.type_top_dict[key_type] = TopK(self.top_k)
+        self.type_top_dict[key_type].push(size, item, key_name)
+        simple_key_name = self.prefix_of(key_name)
+        prefix_top = self.prefix_top_dict.get(simple_key_name)
+        if prefix_top is None:
+            if len(self.prefix_top_dict) >= MAX_PREFIXES:
+                return
+            prefix_top = self.prefix_top_dict[simple_key_name] = TopK(self.top_k)
+        prefix_top.push(size, item, key_name)
+
+    def prefix_of(self, key_name):
+        """
+        :param key_name: key名
+        :return: 统计命名
+        """
+        return self._transform(key_name)
+
+    def run(self, progress_callback=None, cancel_event=None, count=SCAN_COUNT):
+        """
+        遍历当前db,每个SCAN分片用pipeline获取长度和内存
+        :param progress_callback: 每个SCAN分片完成后的回调 progress_callback(进度0-1, 已遍历的key数量)
+        :param cancel_event: threading.Event,被set后停止遍历并返回已统计的部分
+        :param count: 每次SCAN的COUNT
+        :return: self.result()
+        """
+        if not self.node_con_list:
+            self.scan(self.con, progress_callback, cancel_event, count)
+            return self.result()
+        node_progress = NodeProgress(len(self.node_con_list))
+
+        def scan_node(node_index, con):
+            node_progress_callback = None
+            if progress_callback:
+                def node_progress_callback(progress, scan_number):
+                    progress_callback(node_progress.update(node_index, progress), scan_number)
+            self.scan(con, node_progress_callback, cancel_event, count)
+
+        fan_out(scan_node, self.node_con_list)
+        return self.result()
+
+    def scan(self, con, progress_callback=None, cancel_event=None, count=SCAN_COUNT):
+        """
+        用con遍历一个db或一个master,参数见run
+        """
+        dbsize = con.dbsize() if progress_callback else 0
+        for scan_cursor, key_list in con.scan_keys_batches(count=count):
+            described_list = con.describe_keys(key_list, memory=True)
+            with self._lock:
+                for key_name, key_type, length, memory_usage in described_list:
+                    self.add(key_name.decode('utf-8', 'replace'), key_type, length, memory_usage)
+                self.scan_number += len(key_list)
+                scan_number = self.scan_number
+            if progress_callback:
+                progress_callback(scan_cursor_progress(scan_cursor, dbsize), scan_number)
+            if cancel_event is not None and cancel_event.is_set():
+                break
+
+    def result(self):
+        """
+        :return: {'type':{类型:[(key, 类型, 长度, 内存)]}, 'prefix':{统计命名:[(key, 类型, 长度, 内存)]}},从大到小排列
+        """
+        return {'type': {key_type: [item for _, item in top.items()] for key_type, top in self.type_top_dict.items()},
+                'prefix': {simple_key_name: [item for _, item in top.items()]
+                           for simple_key_name, top in self.prefix_top_dict.items()}}
@@ -0,0 +1,117 @@
+"""
+说明：此脚本用于把各db的key数量分布保存到本地sqlite,启动时直接展示上一次的统计结果,并对比各前缀的增长
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import sqlite3
+import time
+from contextlib import closing
+
+
+CACHE_FILE = 'census_cache.db'  # 本地缓存文件
+MAX_SNAPSHOTS = 50  # 每个连接的每个db最多保留的快照数量
+
+
+class CensusCache(object):
+
+    def __init__(self, path=CACHE_FILE):
+        """
+        :param path: sqlite文件路径.每次操作单独打开连接,可以在后台线程中使用
+        """
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS snapshot (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                         'connection TEXT NOT NULL, db TEXT NOT NULL, taken_at REAL NOT NULL, total INTEGER NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS snapshot_connection_db ON snapshot (connection, db, taken_at)')
+            conn.execute('CREATE TABLE IF NOT EXISTS prefix_count (snapshot_id INTEGER NOT NULL, '
+                         'prefix TEXT NOT NULL, number INTEGER NOT NULL, PRIMARY KEY (snapshot_id, prefix))')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def save(self, connection, all_db_keys_number_dict, taken_at=None):
+        """
+        保存一次统计结果,每个db一个快照
+        :param connection: 连接标识,例如 ip:port
+        :param all_db_keys_number_dict: {db:{key:number}}
+        :param taken_at: 统计时间戳,默认为当前时间
+        :return:
+        """
+        taken_at = time.time() if taken_at is None else taken_at
+        with closing(self._connect()) as conn, conn:
+            for db, key_number_dict in all_db_keys_number_dict.items():
+                cursor = conn.execute('INSERT INTO snapshot (connection, db, taken_at, total) VALUES (?, ?, ?, ?)',
+                                      (connection, str(db), taken_at, sum(key_number_dict.values())))
+                conn.executemany('INSERT INTO prefix_count (snapshot_id, prefix, number) VALUES (?, ?, ?)',
+                                 ((cursor.lastrowid, prefix, number) for prefix, number in key_number_dict.items()))
+                self._prune(conn, connection, str(db))
+
+    @staticmethod
+    def _prune(conn, connection, db):
+        old_id_list = [row[0] for row in conn.execute(
+            'SELECT id FROM snapshot WHERE connection = ? AND db = ? ORDER BY taken_at DESC LIMIT -1 OFFSET ?',
+            (connection, db, MAX_SNAPSHOTS))]
+        for snapshot_id in old_id_list:
+            conn.execute('DELETE FROM prefix_count WHERE snapshot_id = ?', (snapshot_id,))
+            conn.execute('DELETE FROM snapshot WHERE id = ?', (snapshot_id,))
+
+    def history(self, connection, db, limit=MAX_SNAPSHOTS):
+        """
+        :param connection: 连接标识
+        :param db: db号码
+        :param limit: 最多返回的快照数量
+        :return: [(快照id, 统计时间戳, key总数)],按时间从新到旧排列
+        """
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT id, taken_at, total FROM snapshot WHERE connection = ? AND db = ? '
+                                'ORDER BY taken_at DESC LIMIT ?', (connection, str(db), limit)).fetchall()
+
+    def load_snapshot(self, snapshot_id):
+        """
+        :param snapshot_id: 快照id
+        :return: {key:number}
+        """
+        with closing(self._connect()) as conn:
+            return dict(conn.execute('SELECT prefix, number FROM prefix_count WHERE snapshot_id = ?',
+                                     (snapshot_id,)))
+
+    def load_latest(self, connection):
+        """
+        读取该连接每个db最近一次的统计结果
+        :param connection: 连接标识
+        :return: ({db:{key:number}}, 最早的统计时间戳),没有缓存时返回 ({}, None)
+        """
+        with closing(self._connect()) as conn:
+            row_list = conn.execute('SELECT db, id, MAX(taken_at) FROM snapshot WHERE connection = ? GROUP BY db',
+                                    (connection,)).fetchall()
+        all_db_keys_number_dict = {db: self.load_snapshot(snapshot_id) for db, snapshot_id, _ in row_list}
+        return all_db_keys_number_dict, min((taken_at for _, _, taken_at in row_list), default=None)
+
+    def compare(self, connection, db, old_snapshot_id=None, new_snapshot_id=None):
+        """
+        对比两次快照中各前缀的数量,默认对比最近两次
+        :param connection: 连接标识
+        :param db: db号码
+        :param old_snapshot_id: 旧快照id
+        :param new_snapshot_id: 新快照id
+        :return: {key:(旧数量, 新数量, 变化量)},快照不足两次时返回{}
+        """
+        if old_snapshot_id is None or new_snapshot_id is None:
+            history = self.history(connection, db, 2)
+            if len(history) < 2:
+                return dict()
+            new_snapshot_id, old_snapshot_id = history[0][0], history[1][0]
+        old_dict = self.load_snapshot(old_snapshot_id)
+        new_dict = self.load_snapshot(new_snapshot_id)
+        return {prefix: (old_dict.get(prefix, 0), new_dict.get(prefix, 0),
+                         new_dict.get(prefix, 0) - old_dict.get(prefix, 0))
+                for prefix in set(old_dict) | set(new_dict)}
+
+
+def connection_key(redis_im):
+    """
+    :param redis_im: redis.txt中的连接信息 {'ip':, 'port':, 'auth':}
+    :return: 缓存中的连接标识
+    """
+    return '{}:{}'.format(redis_im['ip'], redis_im['port'])
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+"""
+说明：此脚本为命令行入口,不依赖Qt,可以在cron或ssh中执行统计,大key查找和导出
+用法示例：
+    python cli.py census -c local --db 0 1 -f csv
+    python cli.py bigkeys -c local --db 0 --top 50
+    python cli.py export -c local -o census.json
+    python cli.py dump -c local --db 0 --prefix user -f ndjson -o user.ndjson.gz
+    python cli.py load -c staging --db 0 --replace user.ndjson.gz
+连接redis集群时自动识别,census/bigkeys/dump并发遍历所有master,load按key路由
+--read-from replica时census/bigkeys/dump从从库读取,load始终写入主库,见read_routing
+--stats PATH把执行期间每个redis命令的次数,耗时分布和字节数写入json,见instrumentation
+为了启动足够快,redis等模块在各子命令中才导入
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from connection_store import REDIS_FILE, load_connections
+
+
+def resolve_connection(args):
+    """
+    :param args: 命令行参数,-c指定redis.txt中的连接名,或者--host/--port/--password直接指定
+    :return: {'ip':, 'port':, 'auth':},以及命令行或redis.txt中指定的读路由字段
+    """
+    if args.connection:
+        _, redis_im_dict = load_connections(args.redis_file)
+        if args.connection not in redis_im_dict:
+            raise SystemExit('unknown connection: {}'.format(args.connection))
+        redis_im = dict(redis_im_dict[args.connection])
+    else:
+        redis_im = {'ip': args.host, 'port': args.port, 'auth': args.password or ''}
+    for field in ('read_from', 'replicas', 'sentinels', 'master_name'):
+        if getattr(args, field):
+            redis_im[field] = getattr(args, field)
+    return redis_im
+
+
+def routed_connection(redis_im, node_list, read=True):
+    """
+    :param redis_im: resolve_connection的结果
+    :param node_list: 集群的master列表,集群不做路由
+    :param read: 为True时返回只读遍历使用的连接信息(可能为从库),否则为主库
+    :return: {'ip':, 'port':, 'auth':}
+    """
+    if node_list:
+        return redis_im
+    from read_routing import read_connection, write_connection
+    return read_connection(redis_im) if read else write_connection(redis_im)
+
+
+def open_output(args):
+    return open(args.output, 'w', newline='') if args.output else sys.stdout
+
+
+def write_result(args, json_result, header, row_iter):
+    """
+    :param args: 命令行参数
+    :param json_result: -f json时输出的对象
+    :param header: -f csv时的表头
+    :param row_iter: -f csv时的数据行
+    :return:
+    """
+    out = open_output(args)
+    try:
+        if args.format == 'csv':
+            writer = csv.writer(out)
+            writer.writerow(header)
+            writer.writerows(row_iter)
+        else:
+            json.dump(json_result, out, ensure_ascii=False, indent=2)
+            out.write('\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def report_progress(args, text):
+    if not args.quiet:
+        sys.stderr.write('\r' + text)
+        sys.stderr.flush()
+
+
+def find_masters(redis_im):
+    """
+    :return: 连接为集群时所有master的[(host, port)],否则为空列表,见cluster.cluster_masters
+    """
+    from cluster import cluster_masters
+    if redis_im.get('sentinels'):
+        return []  # 通过Sentinel访问的主从不是集群
+    return cluster_masters(redis_im['ip'], redis_im['port'], redis_im['auth'])
+
+
+def node_operations(redis_im, node_list, throttle=None):
+    from redis_operation import RedisOperation
+    return [RedisOperation(0, host, port, redis_im['auth'], throttle=throttle) for host, port in node_list]
+
+
+def build_throttle(args):
+    """
+    :return: --max-scan-ms/--max-ops对应的scan_throttle.ScanThrottle,都没有指定时为None
+    """
+    if not args.max_scan_ms and not args.max_ops:
+        return None
+    from scan_throttle import ScanThrottle
+    return ScanThrottle(args.max_scan_ms, args.max_ops)
+
+
+def add_throttle_arguments(parser):
+    parser.add_argument('--max-scan-ms', type=float, help='latency budget per SCAN call, COUNT and pauses adapt to it')
+    parser.add_argument('--max-ops', type=int, help='max commands per second sent while scanning')
+
+
+def load_rule(args):
+    from key_namespace import load_namespace_rule
+    return load_namespace_rule(args.namespace)
+
+
+def command_census(args):
+    redis_im = resolve_connection(args)
+    namespace_rule = load_rule(args)
+    db_progress_dict = dict()
+
+    def batch_callback(db, _, progress):
+        db_progress_dict[db] = progress
+        report_progress(args, 'census {:.0f}%'.format(100 * sum(db_progress_dict.values()) / len(db_list)))
+
+    node_list = find_masters(redis_im)
+    read_im = routed_connection(redis_im, node_list)
+    if args.sample:
+        from sample_census import SampleCensus, estimate_to_number
+        census = SampleCensus(read_im['ip'], read_im['port'], read_im['auth'], args.db,
+                              max_keys=args.max_keys, max_seconds=args.max_seconds, random_key=args.random_key,
+                              namespace_rule=namespace_rule, node_list=node_list)
+    else:
+        from key_census import KeyCensus
+        census = KeyCensus(read_im['ip'], read_im['port'], read_im['auth'], args.db, args.workers,
+                           server_side=args.server_side, detail=args.detail, namespace_rule=namespace_rule,
+                           node_list=node_list, throttle=build_throttle(args))
+    db_list = census.db_list
+    result = census.run(batch_callback=batch_callback)
+    report_progress(args, '\n')
+    if args.sample:
+        write_result(args, result, ['db', 'key', 'estimate', 'low', 'high'],
+                     ([db, key] + list(estimate) for db, key_estimate_dict in result.items()
+                      for key, estimate in key_estimate_dict.items()))
+        all_db_keys_number_dict = {db: estimate_to_number(key_estimate_dict)
+                                   for db, key_estimate_dict in result.items()}
+    elif args.detail:
+        from key_census import key_stats_to_number
+        type_list = ['string', 'list', 'hash', 'set', 'zset']
+        write_result(args, result, ['db', 'key', 'value'] + type_list + ['elements', 'mean', 'bytes'],
+                     ([db, key, key_stats['number']] + [key_stats['types'].get(key_type, 0) for key_type in type_list] +
+                      [key_stats['elements'], round(key_stats['mean'], 1), key_stats['bytes']]
+                      for db, key_stats_dict in result.items() for key, key_stats in key_stats_dict.items()))
+        all_db_keys_number_dict = {db: key_stats_to_number(key_stats_dict) for db, key_stats_dict in result.items()}
+    else:
+        write_result(args, result, ['db', 'key', 'value'],
+                     ([db, key, number] for db, key_number_dict in result.items()
+                      for key, number in key_number_dict.items()))
+        all_db_keys_number_dict = result
+    if args.save and not args.sample:  # 与GUI一样,只保存完整统计的结果
+        from census_cache import CensusCache, connection_key
+        CensusCache().save(connection_key(redis_im), all_db_keys_number_dict)
+    return 0
+
+
+def command_bigkeys(args):
+    from big_keys import BigKeyScanner
+    from redis_operation import RedisOperation
+    redis_im = resolve_connection(args)
+    node_list = find_masters(redis_im)
+    read_im = routed_connection(redis_im, node_list)
+    throttle = build_throttle(args)
+    con = RedisOperation(args.db, read_im['ip'], read_im['port'], read_im['auth'], throttle=throttle)
+    scanner = BigKeyScanner(con, args.top, args.sort_by, load_rule(args), node_operations(redis_im, node_list, throttle))
+    result = scanner.run(lambda progress, scan_number: report_progress(
+        args, 'scanned {} keys {:.0f}%'.format(scan_number, 100 * progress)))
+    report_progress(args, '\n')
+    write_result(args, result, ['group', 'name', 'key', 'type', 'length', 'bytes'],
+                 ([group, name] + list(item) for group, group_dict in sorted(result.items())
+                  for name, item_list in group_dict.items() for item in item_list))
+    return 0
+
+
+def command_export(args):
+    from census_cache import CensusCache, connection_key
+    redis_im = resolve_connection(args)
+    all_db_keys_number_dict, taken_at = CensusCache(args.cache).load_latest(connection_key(redis_im))
+    if args.db:
+        all_db_keys_number_dict = {db: key_number_dict for db, key_number_dict in all_db_keys_number_dict.items()
+                                   if int(db) in args.db}
+    if taken_at is None:
+        sys.stderr.write('no cached census for {}\n'.format(connection_key(redis_im)))
+        return 1
+    write_result(args, all_db_keys_number_dict, ['db', 'key', 'value'],
+                 ([db, key, number] for db, key_number_dict in sorted(all_db_keys_number_dict.items())
+                  for key, number in sorted(key_number_dict.items(), key=lambda item: item[1], reverse=True)))
+    return 0
+
+
+def command_dump(args):
+    from key_export import KeyExporter, progress_text
+    from redis_operation import RedisOperation
+    redis_im = resolve_connection(args)
+    node_list = find_masters(redis_im)
+    read_im = routed_connection(redis_im, node_list)
+    throttle = build_throttle(args)
+    con = RedisOperation(args.db, read_im['ip'], read_im['port'], read_im['auth'], cluster=bool(node_list),
+                         throttle=throttle)
+    exporter = KeyExporter(con, args.format, args.chunk_size, node_operations(redis_im, node_list, throttle))
+    result = exporter.export(args.output, args.key, args.prefix,
+                             lambda *progress: report_progress(args, progress_text(*progress)))
+    report_progress(args, '\n')
+    if not args.quiet:
+        sys.stderr.write('exported {keys} keys ({skipped} skipped) in {seconds:.1f}s\n'.format(**result))
+    return 0
+
+
+def command_load(args):
+    from key_import import KeyImporter, import_progress_text
+    redis_im = resolve_connection(args)
+    node_list = find_masters(redis_im)
+    write_im = routed_connection(redis_im, node_list, read=False)
+    importer = KeyImporter(args.db, write_im['ip'], write_im['port'], write_im['auth'], args.workers, args.replace,
+                           bool(node_list))
+    result = importer.import_file(args.input, args.format,
+                                  lambda *progress: report_progress(args, import_progress_text(*progress)))
+    report_progress(args, '\n')
+    if not args.quiet:
+        sys.stderr.write('imported {keys} keys, {ops} ops in {seconds:.1f}s ({ops_per_second:.0f} ops/s), '
+                         '{errors} errors\n'.format(**result))
+    if result['errors']:
+        sys.stderr.write('first error: {}\n'.format(result['first_error']))
+        return 1
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='redis_desktop command line')
+    connection_parent = argparse.ArgumentParser(add_help=False)
+    connection_parent.add_argument('-c', '--connection', help='connection name in redis.txt')
+    connection_parent.add_argument('--redis-file', default=REDIS_FILE, help='connection file, default redis.txt')
+    connection_parent.add_argument('--host', default='127.0.0.1')
+    connection_parent.add_argument('--port', default='6379')
+    connection_parent.add_argument('--password')
+    connection_parent.add_argument('--read-from', choices=['primary', 'replica'],
+                                   help='run census / bigkeys / dump on a replica, default from redis.txt or primary')
+    connection_parent.add_argument('--replicas', help='replica addresses "ip:port,ip:port", default from INFO')
+    connection_parent.add_argument('--sentinels', help='sentinel addresses "ip:port,ip:port"')
+    connection_parent.add_argument('--master-name', help='master name monitored by the sentinels')
+    connection_parent.add_argument('-q', '--quiet', action='store_true', help='no progress on stderr')
+    connection_parent.add_argument('--namespace', default='namespace.json', help='namespace rule file')
+    connection_parent.add_argument('--stats', metavar='PATH',
+                                   help='record latency/bytes of every redis command and write them to PATH as json')
+    common = argparse.ArgumentParser(add_help=False, parents=[connection_parent])
+    common.add_argument('-f', '--format', choices=['json', 'csv'], default='json')
+    common.add_argument('-o', '--output', help='output file, default stdout')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    census_parser = subparsers.add_parser('census', parents=[common], help='count keys per prefix')
+    census_parser.add_argument('--db', type=int, nargs='+', help='db numbers, default 0-15')
+    census_parser.add_argument('--workers', type=int,
+                               help='dbs (or cluster masters) scanned at the same time, default 4 (16 for a cluster)')
+    census_parser.add_argument('--server-side', action='store_true', help='count prefixes in redis with lua')
+    census_parser.add_argument('--detail', action='store_true', help='type / size / memory per prefix')
+    census_parser.add_argument('--sample', action='store_true', help='approximate census by sampling')
+    census_parser.add_argument('--max-keys', type=int, default=100000, help='sampled keys per db')
+    census_parser.add_argument('--max-seconds', type=float, default=30, help='sampling time per db')
+    census_parser.add_argument('--random-key', action='store_true', help='sample with RANDOMKEY')
+    census_parser.add_argument('--save', action='store_true', help='save the result to the census cache')
+    add_throttle_arguments(census_parser)
+    census_parser.set_defaults(func=command_census)
+
+    bigkeys_parser = subparsers.add_parser('bigkeys', parents=[common], help='largest keys per type and prefix')
+    bigkeys_parser.add_argument('--db', type=int, default=0)
+    bigkeys_parser.add_argument('--top', type=int, default=20)
+    bigkeys_parser.add_argument('--sort-by', choices=['bytes', 'length'], default='bytes')
+    add_throttle_arguments(bigkeys_parser)
+    bigkeys_parser.set_defaults(func=command_bigkeys)
+
+    export_parser = subparsers.add_parser('export', parents=[common], help='export the latest cached census')
+    export_parser.add_argument('--db', type=int, nargs='+')
+    export_parser.add_argument('--cache', default='census_cache.db', help='census cache file')
+    export_parser.set_defaults(func=command_export)
+
+    dump_parser = subparsers.add_parser('dump', parents=[connection_parent], help='stream keys to a file')
+    dump_parser.add_argument('--db', type=int, default=0)
+    dump_target = dump_parser.add_mutually_exclusive_group()
+    dump_target.add_argument('--key', help='export only this key')
+    dump_target.add_argument('--prefix', help='export keys starting with this prefix, default the whole db')
+    dump_parser.add_argument('-f', '--format', choices=['ndjson', 'csv', 'dump'], default='ndjson')
+    dump_parser.add_argument('-o', '--output', required=True, help='output file, gzip compressed if it ends with .gz')
+    dump_parser.add_argument('--chunk-size', type=int, default=1000, help='elements per chunk of a large collection')
+    add_throttle_arguments(dump_parser)
+    dump_parser.set_defaults(func=command_dump)
+
+    load_parser = subparsers.add_parser('load', parents=[connection_parent], help='import a file written by dump')
+    load_parser.add_argument('input', help='ndjson / csv / dump file, gzip compressed if it ends with .gz')
+    load_parser.add_argument('--db', type=int, default=0)
+    load_parser.add_argument('-f', '--format', choices=['ndjson', 'csv', 'dump'], help='default from the extension')
+    load_parser.add_argument('--workers', type=int, default=4, help='parallel connections')
+    load_parser.add_argument('--replace', action='store_true', help='overwrite keys that already exist')
+    load_parser.set_defaults(func=command_load)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from redis import RedisError
+    from redis.exceptions import RedisClusterException
+    from instrumentation import recorder, action_scope
+    if args.stats:
+        recorder.enable()
+    try:
+        with action_scope(args.command):
+            return args.func(args)
+    except (RedisError, RedisClusterException) as e:
+        sys.stderr.write('redis error: {}\n'.format(e))
+        return 1
+    finally:
+        if args.stats:
+            recorder.disable()
+            recorder.save(args.stats)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
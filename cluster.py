@@ -0,0 +1,80 @@
+"""
+说明：此脚本用于识别redis集群,获取所有master节点,以及把遍历类的任务并发分发到各master执行
+集群只有db 0,每个master的SCAN只返回该节点上的key,所以各master的结果合并即为整个集群的结果,
+耗时随master数量增加而线性下降
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import redis
+from redis import RedisError, ResponseError
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+
+from instrumentation import bind_action
+
+
+MAX_WORKERS = 16  # 同时遍历的master数量上限,即同时占用的连接数
+PROBE_TIMEOUT = 2  # 识别集群时的连接和读取超时(秒),节点不可达时尽快按单节点处理
+
+
+def cluster_masters(host, port, password=None):
+    """
+    :param host: 集群中任意一个节点的ip
+    :param port: 端口
+    :param password: 密码
+    :return: 集群所有master的[(host, port)],按地址排序.不是集群或连接失败时返回空列表
+    """
+    # 使用单独的短超时连接且不重试,不占用连接池,也不受连接池默认的无限超时影响
+    con = redis.StrictRedis(host=host, port=int(port), password=password or None, socket_timeout=PROBE_TIMEOUT,
+                            socket_connect_timeout=PROBE_TIMEOUT, retry=Retry(NoBackoff(), 0))
+    try:
+        if not con.info('cluster').get('cluster_enabled'):
+            return []
+        slot_list = con.execute_command('CLUSTER', 'SLOTS')
+    except ResponseError:  # INFO或CLUSTER命令被禁用,按单节点处理
+        return []
+    except RedisError:  # 连接失败或超时,按单节点处理
+        return []
+    finally:
+        con.connection_pool.disconnect()
+    master_set = set()
+    for slot_range in slot_list:
+        node_host, node_port = slot_range[2][0], slot_range[2][1]  # 每个slot范围的第一个节点为master
+        if isinstance(node_host, bytes):
+            node_host = node_host.decode()
+        master_set.add((node_host or host, int(node_port)))  # 地址为空代表与当前连接的节点相同
+    return sorted(master_set)
+
+
+def fan_out(fn, node_list, max_workers=MAX_WORKERS):
+    """
+    在各master上并发执行fn
+    :param fn: fn(node_index, (host, port)),在线程池中执行
+    :param node_list: [(host, port)]
+    :param max_workers: 同时执行的master数量上限
+    :return: 各master的结果列表,顺序与node_list一致.任何一个master出错时抛出该异常
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(node_list)))) as executor:
+        future_list = [executor.submit(bind_action(fn), node_index, node) for node_index, node in enumerate(node_list)]
+        return [future.result() for future in future_list]
+
+
+class NodeProgress(object):
+    """
+    汇总各master的进度:整体进度为各master进度的平均值,全部完成时才为1
+    """
+
+    def __init__(self, node_number):
+        self._progress_list = [0.0] * max(1, node_number)
+
+    def update(self, node_index, progress):
+        """
+        :param node_index: master的序号
+        :param progress: 该master的进度0-1
+        :return: 整体进度0-1
+        """
+        self._progress_list[node_index] = progress
+        return sum(self._progress_list) / len(self._progress_list)
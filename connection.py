@@ -1,121 +1,121 @@
-# -*- coding: utf-8 -*-
-
-# Form implementation generated from reading ui file 'connection.ui'
-#
-# Created by: PyQt5 UI code generator 5.15.4
-#
-# WARNING: Any manual changes made to this file will be lost when pyuic5 is
-# run again.  Do not edit this file unless you know what you are doing.
-
-
-from PyQt5 import QtCore, QtGui, QtWidgets
-
-
-class Ui_Connection(object):
-    def setupUi(self, Connection):
-        Connection.setObjectName("Connection")
-        Connection.resize(431, 654)
-        self.centralwidget = QtWidgets.QWidget(Connection)
-        self.centralwidget.setObjectName("centralwidget")
-        self.layoutWidget = QtWidgets.QWidget(self.centralwidget)
-        self.layoutWidget.setGeometry(QtCore.QRect(90, 70, 244, 280))
-        self.layoutWidget.setObjectName("layoutWidget")
-        self.horizontalLayout = QtWidgets.QHBoxLayout(self.layoutWidget)
-        self.horizontalLayout.setContentsMargins(0, 0, 0, 0)
-        self.horizontalLayout.setObjectName("horizontalLayout")
-        self.verticalLayout_2 = QtWidgets.QVBoxLayout()
-        self.verticalLayout_2.setObjectName("verticalLayout_2")
-        self.label = QtWidgets.QLabel(self.layoutWidget)
-        self.label.setMinimumSize(QtCore.QSize(30, 30))
-        self.label.setObjectName("label")
-        self.verticalLayout_2.addWidget(self.label)
-        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        self.verticalLayout_2.addItem(spacerItem)
-        self.label_2 = QtWidgets.QLabel(self.layoutWidget)
-        self.label_2.setMinimumSize(QtCore.QSize(30, 30))
-        self.label_2.setObjectName("label_2")
-        self.verticalLayout_2.addWidget(self.label_2)
-        spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        self.verticalLayout_2.addItem(spacerItem1)
-        self.label_3 = QtWidgets.QLabel(self.layoutWidget)
-        self.label_3.setMinimumSize(QtCore.QSize(30, 30))
-        self.label_3.setObjectName("label_3")
-        self.verticalLayout_2.addWidget(self.label_3)
-        spacerItem2 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        self.verticalLayout_2.addItem(spacerItem2)
-        self.label_4 = QtWidgets.QLabel(self.layoutWidget)
-        self.label_4.setMinimumSize(QtCore.QSize(30, 30))
-        self.label_4.setObjectName("label_4")
-        self.verticalLayout_2.addWidget(self.label_4)
-        self.horizontalLayout.addLayout(self.verticalLayout_2)
-        self.verticalLayout = QtWidgets.QVBoxLayout()
-        self.verticalLayout.setObjectName("verticalLayout")
-        self.name_input = QtWidgets.QLineEdit(self.layoutWidget)
-        self.name_input.setMinimumSize(QtCore.QSize(200, 30))
-        self.name_input.setText("")
-        self.name_input.setObjectName("name_input")
-        self.verticalLayout.addWidget(self.name_input)
-        spacerItem3 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        self.verticalLayout.addItem(spacerItem3)
-        self.host_input = QtWidgets.QLineEdit(self.layoutWidget)
-        self.host_input.setMinimumSize(QtCore.QSize(200, 30))
-        self.host_input.setText("")
-        self.host_input.setObjectName("host_input")
-        self.verticalLayout.addWidget(self.host_input)
-        spacerItem4 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        self.verticalLayout.addItem(spacerItem4)
-        self.port_input = QtWidgets.QSpinBox(self.layoutWidget)
-        self.port_input.setMinimumSize(QtCore.QSize(200, 30))
-        self.port_input.setMaximum(99999)
-        self.port_input.setProperty("value", 6379)
-        self.port_input.setObjectName("port_input")
-        self.verticalLayout.addWidget(self.port_input)
-        spacerItem5 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        self.verticalLayout.addItem(spacerItem5)
-        self.auth_input = QtWidgets.QLineEdit(self.layoutWidget)
-        self.auth_input.setMinimumSize(QtCore.QSize(200, 30))
-        self.auth_input.setText("")
-        self.auth_input.setObjectName("auth_input")
-        self.verticalLayout.addWidget(self.auth_input)
-        self.horizontalLayout.addLayout(self.verticalLayout)
-        self.layoutWidget1 = QtWidgets.QWidget(self.centralwidget)
-        self.layoutWidget1.setGeometry(QtCore.QRect(50, 390, 329, 30))
-        self.layoutWidget1.setObjectName("layoutWidget1")
-        self.horizontalLayout_2 = QtWidgets.QHBoxLayout(self.layoutWidget1)
-        self.horizontalLayout_2.setContentsMargins(0, 0, 0, 0)
-        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
-        self.test_connection_button = QtWidgets.QPushButton(self.layoutWidget1)
-        self.test_connection_button.setObjectName("test_connection_button")
-        self.horizontalLayout_2.addWidget(self.test_connection_button)
-        self.save_button = QtWidgets.QPushButton(self.layoutWidget1)
-        self.save_button.setObjectName("save_button")
-        self.horizontalLayout_2.addWidget(self.save_button)
-        self.cancel_button = QtWidgets.QPushButton(self.layoutWidget1)
-        self.cancel_button.setObjectName("cancel_button")
-        self.horizontalLayout_2.addWidget(self.cancel_button)
-        Connection.setCentralWidget(self.centralwidget)
-        self.menubar = QtWidgets.QMenuBar(Connection)
-        self.menubar.setGeometry(QtCore.QRect(0, 0, 431, 26))
-        self.menubar.setObjectName("menubar")
-        Connection.setMenuBar(self.menubar)
-        self.statusbar = QtWidgets.QStatusBar(Connection)
-        self.statusbar.setObjectName("statusbar")
-        Connection.setStatusBar(self.statusbar)
-
-        self.retranslateUi(Connection)
-        self.cancel_button.clicked.connect(Connection.close)
-        QtCore.QMetaObject.connectSlotsByName(Connection)
-
-    def retranslateUi(self, Connection):
-        _translate = QtCore.QCoreApplication.translate
-        Connection.setWindowTitle(_translate("Connection", "MainWindow"))
-        self.label.setText(_translate("Connection", "Name"))
-        self.label_2.setText(_translate("Connection", "Host"))
-        self.label_3.setText(_translate("Connection", "Port"))
-        self.label_4.setText(_translate("Connection", "Auth"))
-        self.name_input.setPlaceholderText(_translate("Connection", "Connection name"))
-        self.host_input.setPlaceholderText(_translate("Connection", "redis-server host"))
-        self.auth_input.setPlaceholderText(_translate("Connection", "auth"))
-        self.test_connection_button.setText(_translate("Connection", "Test Connection"))
-        self.save_button.setText(_translate("Connection", "OK"))
-        self.cancel_button.setText(_translate("Connection", "Cancel"))
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'connection.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.4
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Connection(object):
+    def setupUi(self, Connection):
+        Connection.setObjectName("Connection")
+        Connection.resize(431, 654)
+        self.centralwidget = QtWidgets.QWidget(Connection)
+        self.centralwidget.setObjectName("centralwidget")
+        self.layoutWidget = QtWidgets.QWidget(self.centralwidget)
+        self.layoutWidget.setGeometry(QtCore.QRect(90, 70, 244, 280))
+        self.layoutWidget.setObjectName("layoutWidget")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.layoutWidget)
+        self.horizontalLayout.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.label = QtWidgets.QLabel(self.layoutWidget)
+        self.label.setMinimumSize(QtCore.QSize(30, 30))
+        self.label.setObjectName("label")
+        self.verticalLayout_2.addWidget(self.label)
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_2.addItem(spacerItem)
+        self.label_2 = QtWidgets.QLabel(self.layoutWidget)
+        self.label_2.setMinimumSize(QtCore.QSize(30, 30))
+        self.label_2.setObjectName("label_2")
+        self.verticalLayout_2.addWidget(self.label_2)
+        spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_2.addItem(spacerItem1)
+        self.label_3 = QtWidgets.QLabel(self.layoutWidget)
+        self.label_3.setMinimumSize(QtCore.QSize(30, 30))
+        self.label_3.setObjectName("label_3")
+        self.verticalLayout_2.addWidget(self.label_3)
+        spacerItem2 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_2.addItem(spacerItem2)
+        self.label_4 = QtWidgets.QLabel(self.layoutWidget)
+        self.label_4.setMinimumSize(QtCore.QSize(30, 30))
+        self.label_4.setObjectName("label_4")
+        self.verticalLayout_2.addWidget(self.label_4)
+        self.horizontalLayout.addLayout(self.verticalLayout_2)
+        self.verticalLayout = QtWidgets.QVBoxLayout()
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.name_input = QtWidgets.QLineEdit(self.layoutWidget)
+        self.name_input.setMinimumSize(QtCore.QSize(200, 30))
+        self.name_input.setText("")
+        self.name_input.setObjectName("name_input")
+        self.verticalLayout.addWidget(self.name_input)
+        spacerItem3 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout.addItem(spacerItem3)
+        self.host_input = QtWidgets.QLineEdit(self.layoutWidget)
+        self.host_input.setMinimumSize(QtCore.QSize(200, 30))
+        self.host_input.setText("")
+        self.host_input.setObjectName("host_input")
+        self.verticalLayout.addWidget(self.host_input)
+        spacerItem4 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout.addItem(spacerItem4)
+        self.port_input = QtWidgets.QSpinBox(self.layoutWidget)
+        self.port_input.setMinimumSize(QtCore.QSize(200, 30))
+        self.port_input.setMaximum(99999)
+        self.port_input.setProperty("value", 6379)
+        self.port_input.setObjectName("port_input")
+        self.verticalLayout.addWidget(self.port_input)
+        spacerItem5 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout.addItem(spacerItem5)
+        self.auth_input = QtWidgets.QLineEdit(self.layoutWidget)
+        self.auth_input.setMinimumSize(QtCore.QSize(200, 30))
+        self.auth_input.setText("")
+        self.auth_input.setObjectName("auth_input")
+        self.verticalLayout.addWidget(self.auth_input)
+        self.horizontalLayout.addLayout(self.verticalLayout)
+        self.layoutWidget1 = QtWidgets.QWidget(self.centralwidget)
+        self.layoutWidget1.setGeometry(QtCore.QRect(50, 390, 329, 30))
+        self.layoutWidget1.setObjectName("layoutWidget1")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout(self.layoutWidget1)
+        self.horizontalLayout_2.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.test_connection_button = QtWidgets.QPushButton(self.layoutWidget1)
+        self.test_connection_button.setObjectName("test_connection_button")
+        self.horizontalLayout_2.addWidget(self.test_connection_button)
+        self.save_button = QtWidgets.QPushButton(self.layoutWidget1)
+        self.save_button.setObjectName("save_button")
+        self.horizontalLayout_2.addWidget(self.save_button)
+        self.cancel_button = QtWidgets.QPushButton(self.layoutWidget1)
+        self.cancel_button.setObjectName("cancel_button")
+        self.horizontalLayout_2.addWidget(self.cancel_button)
+        Connection.setCentralWidget(self.centralwidget)
+        self.menubar = QtWidgets.QMenuBar(Connection)
+        self.menubar.setGeometry(QtCore.QRect(0, 0, 431, 26))
+        self.menubar.setObjectName("menubar")
+        Connection.setMenuBar(self.menubar)
+        self.statusbar = QtWidgets.QStatusBar(Connection)
+        self.statusbar.setObjectName("statusbar")
+        Connection.setStatusBar(self.statusbar)
+
+        self.retranslateUi(Connection)
+        self.cancel_button.clicked.connect(Connection.close)
+        QtCore.QMetaObject.connectSlotsByName(Connection)
+
+    def retranslateUi(self, Connection):
+        _translate = QtCore.QCoreApplication.translate
+        Connection.setWindowTitle(_translate("Connection", "MainWindow"))
+        self.label.setText(_translate("Connection", "Name"))
+        self.label_2.setText(_translate("Connection", "Host"))
+        self.label_3.setText(_translate("Connection", "Port"))
+        self.label_4.setText(_translate("Connection", "Auth"))
+        self.name_input.setPlaceholderText(_translate("Connection", "Connection name"))
+        self.host_input.setPlaceholderText(_translate("Connection", "redis-server host"))
+        self.auth_input.setPlaceholderText(_translate("Connection", "auth"))
+        self.test_connection_button.setText(_translate("Connection", "Test Connection"))
+        self.save_button.setText(_translate("Connection", "OK"))
+        self.cancel_button.setText(_translate("Connection", "Cancel"))
@@ -0,0 +1,196 @@
+"""
+说明：此脚本用于在进程内缓存redis连接池,避免每次操作都重新建立TCP连接和AUTH
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+import redis.asyncio as aioredis
+from redis.backoff import NoBackoff
+from redis.cluster import RedisCluster
+from redis.retry import Retry
+
+
+IDLE_TIMEOUT = 300  # 连接池空闲超过该秒数后被回收
+MAX_POOLS = 32  # 最多缓存的连接池数量,超出后回收最久未使用的连接池
+HEALTH_CHECK_INTERVAL = 30  # 连接空闲超过该秒数后,复用前先发送PING检查
+
+
+class ConnectionManager(object):
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, max_pools=MAX_POOLS):
+        """
+        :param idle_timeout: 连接池空闲超过该秒数后被回收
+        :param max_pools: 最多缓存的连接池数量
+        """
+        self.idle_timeout = idle_timeout
+        self.max_pools = max_pools
+        self._lock = threading.Lock()
+        # {(host, port, db, password):[连接池, 最后使用时间]},按使用顺序排列.server级别的共享连接池的key末尾为'server'
+        self._pool_dict = OrderedDict()
+        # asyncio连接池 {(host, port, db, password):[连接池, 最后使用时间, 所属的事件循环]},连接绑定在创建它的事件循环上
+        self._async_pool_dict = OrderedDict()
+        self._cluster_dict = dict()  # {(host, port, 0, password):RedisCluster},集群客户端自己维护各节点的连接池
+
+    @staticmethod
+    def pool_key(host, port, db=0, password=None):
+        return str(host), int(port), int(db), password or None
+
+    def get_pool(self, host, port, db=0, password=None):
+        """
+        获取(host, port, db, password)对应的连接池,不存在则创建
+        :param host: ip
+        :param port: 端口
+        :param db: db号码
+        :param password: 密码
+        :return: redis.ConnectionPool
+        """
+        return self._get_pool(self.pool_key(host, port, db, password), health_check_interval=HEALTH_CHECK_INTERVAL)
+
+    def _get_pool(self, key, **kwargs):
+        """
+        :param key: _pool_dict的key,前4项为(host, port, db, password)
+        :param kwargs: 创建连接池时的其他参数
+        :return: redis.ConnectionPool
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._evict(now)
+            if key in self._pool_dict:
+                self._pool_dict[key][1] = now
+                self._pool_dict.move_to_end(key)
+                return self._pool_dict[key][0]
+            pool = redis.ConnectionPool(host=key[0], port=key[1], db=key[2], password=key[3], **kwargs)
+            self._pool_dict[key] = [pool, now]
+            while len(self._pool_dict) > self.max_pools:
+                close_pool(self._pool_dict.popitem(last=False)[1][0])
+            return pool
+
+    def get_async_pool(self, host, port, db=0, password=None):
+        """
+        获取(host, port, db, password)对应的redis.asyncio连接池,不存在则创建,与get_pool一样按空闲时间和数量回收.
+        只能在事件循环中调用,见async_operation
+        :return: redis.asyncio.ConnectionPool
+        """
+        key = self.pool_key(host, port, db, password)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            now = time.monotonic()
+            self._evict(now)
+            item = self._async_pool_dict.get(key)
+            if item and item[2] is loop:
+                item[1] = now
+                self._async_pool_dict.move_to_end(key)
+                return item[0]
+            if item:  # 属于其他事件循环的连接不能复用
+                close_async_pool(item[0], item[2])
+            pool = aioredis.ConnectionPool(host=key[0], port=key[1], db=key[2], password=key[3])
+            self._async_pool_dict[key] = [pool, now, loop]
+            while len(self._async_pool_dict) > self.max_pools:
+                old_pool, _, old_loop = self._async_pool_dict.popitem(last=False)[1]
+                close_async_pool(old_pool, old_loop)
+            return pool
+
+    def get_server_pool(self, host, port, password=None):
+        """
+        获取server级别的共享连接池(db 0),与get_pool(host, port, 0)是不同的连接池.
+        需要访问多个db时,独占其中一个连接并通过SELECT切换db,归还前切换回db 0(见RedisOperation.close).
+        断线重连后的连接只会回到db 0,之后的命令会静默地在db 0执行,所以这个连接池不自动重试,也不做健康检查:
+        连接出错时命令直接抛出异常,由调用方放弃这个db
+        :return: redis.ConnectionPool
+        """
+        return self._get_pool(self.pool_key(host, port, 0, password) + ('server',), retry=Retry(NoBackoff(), 0),
+                              health_check_interval=0)
+
+    def get_cluster(self, host, port, password=None):
+        """
+        获取集群客户端,不存在则创建.创建时读取slot分布,之后按key所在的slot把命令发送到对应的master,
+        遇到MOVED时自动刷新slot分布
+        :param host: 集群中任意一个节点的ip
+        :param port: 端口
+        :param password: 密码
+        :return: redis.cluster.RedisCluster
+        """
+        key = self.pool_key(host, port, 0, password)
+        with self._lock:
+            if key not in self._cluster_dict:
+                self._cluster_dict[key] = RedisCluster(host=key[0], port=key[1], password=key[3],
+                                                       health_check_interval=HEALTH_CHECK_INTERVAL)
+            return self._cluster_dict[key]
+
+    def discard_pool(self, host, port, db=0, password=None):
+        """
+        回收某个连接池,例如连接测试失败后不再缓存
+        """
+        with self._lock:
+            item = self._pool_dict.pop(self.pool_key(host, port, db, password), None)
+        if item:
+            close_pool(item[0])
+
+    def evict_idle(self):
+        """
+        回收空闲超时的连接池
+        :return:
+        """
+        with self._lock:
+            self._evict(time.monotonic())
+
+    def _evict(self, now):
+        idle_key_list = [key for key, (_, last_used) in self._pool_dict.items()
+                         if now - last_used > self.idle_timeout]
+        for key in idle_key_list:
+            close_pool(self._pool_dict.pop(key)[0])
+        idle_key_list = [key for key, (_, last_used, _) in self._async_pool_dict.items()
+                         if now - last_used > self.idle_timeout]
+        for key in idle_key_list:
+            pool, _, loop = self._async_pool_dict.pop(key)
+            close_async_pool(pool, loop)
+
+    def clear(self):
+        with self._lock:
+            while self._pool_dict:
+                close_pool(self._pool_dict.popitem()[1][0])
+            while self._async_pool_dict:
+                pool, _, loop = self._async_pool_dict.popitem()[1]
+                close_async_pool(pool, loop)
+            while self._cluster_dict:
+                self._cluster_dict.popitem()[1].close()
+
+    def stats(self):
+        """
+        :return: {'pools':连接池数量, 'connections':已建立的连接数, 'in_use':使用中的连接数},包括asyncio连接池
+        """
+        with self._lock:
+            pool_list = [pool for pool, _ in self._pool_dict.values()]
+            pool_list.extend(item[0] for item in self._async_pool_dict.values())
+        in_use = sum(len(getattr(pool, '_in_use_connections', ())) for pool in pool_list)
+        available = sum(len(getattr(pool, '_available_connections', ())) for pool in pool_list)
+        return {'pools': len(pool_list), 'connections': in_use + available, 'in_use': in_use}
+
+
+def close_pool(pool):
+    """
+    关闭连接池中空闲的连接.使用中的连接不受影响,仍可完成当前操作
+    :param pool: redis.ConnectionPool
+    :return:
+    """
+    pool.disconnect(inuse_connections=False)
+
+
+def close_async_pool(pool, loop):
+    """
+    在连接池所属的事件循环中关闭空闲的连接,可以在任意线程调用,不等待关闭完成
+    :param pool: redis.asyncio.ConnectionPool
+    :param loop: 创建连接池的事件循环
+    :return:
+    """
+    if not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(pool.disconnect(inuse_connections=False), loop)
+
+
+connection_manager = ConnectionManager()  # 进程内共享的连接池缓存
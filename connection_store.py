@@ -0,0 +1,48 @@
+"""
+说明：此脚本用于读写redis.txt中保存的连接信息,GUI和命令行共用
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import json
+
+
+REDIS_FILE = 'redis.txt'  # 每行一个连接 {"name":, "ip":, "port":, "auth":}
+# 可选的读路由字段,手动添加到redis.txt中,见read_routing
+# read_from:"primary"(默认)或"replica", replicas:"ip:port,ip:port", sentinels:"ip:port,ip:port", master_name:
+ROUTING_FIELDS = ('read_from', 'replicas', 'sentinels', 'master_name')
+
+
+def load_connections(path=REDIS_FILE):
+    """
+    :param path: 连接信息文件路径
+    :return: (连接名列表, {连接名:{'ip':, 'port':, 'auth':}}),存在读路由字段时一并返回
+    """
+    redis_name_list = []
+    redis_im_dict = {}
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            temp_dict = json.loads(line.strip())
+            redis_name_list.append(temp_dict['name'])
+            redis_im_dict[temp_dict['name']] = {'ip': temp_dict['ip'], 'port': temp_dict['port'],
+                                                'auth': temp_dict['auth']}
+            for field in ROUTING_FIELDS:
+                if temp_dict.get(field):
+                    redis_im_dict[temp_dict['name']][field] = temp_dict[field]
+    return redis_name_list, redis_im_dict
+
+
+def save_connection(name, ip, port, auth, path=REDIS_FILE):
+    """
+    追加一个连接信息
+    :param name: 连接名
+    :param ip: 连接ip
+    :param port: 连接端口
+    :param auth: 连接密码
+    :param path: 连接信息文件路径
+    :return:
+    """
+    with open(path, 'a') as f:
+        f.write(json.dumps({"name": name, "ip": ip, "port": port, "auth": auth}) + '\n')
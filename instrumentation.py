@@ -0,0 +1,373 @@
+"""
+说明：此脚本用于统计客户端发出的每个redis命令:调用次数,出错次数,耗时分布(p50/p99/max),请求和返回的字节数,pipeline大小,
+按命令和界面操作(后台任务名)分别汇总,可导出为json
+开启时替换redis-py客户端的execute_command和pipeline的execute(同步,集群和asyncio客户端),关闭时恢复原方法,
+关闭状态下没有任何额外开销
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import contextvars
+import functools
+import json
+import threading
+import time
+
+import redis.asyncio.client
+import redis.client
+import redis.cluster
+
+
+SUB_BUCKET_BITS = 7  # 直方图每个2的幂区间分为64个子区间,相对误差小于1/64
+DEFAULT_ACTION = 'gui'  # 不在后台任务中执行的命令所属的操作名
+PIPELINE = 'PIPELINE'  # pipeline整体的统计名
+
+_action_var = contextvars.ContextVar('redis_action', default=DEFAULT_ACTION)
+
+
+def current_action():
+    """
+    :return: 当前线程或协程所属的界面操作名
+    """
+    return _action_var.get()
+
+
+class action_scope(object):
+    """
+    with action_scope(操作名): 期间执行的命令计入该操作
+    """
+
+    def __init__(self, action):
+        self.action = action
+        self._token = None
+
+    def __enter__(self):
+        self._token = _action_var.set(self.action)
+        return self
+
+    def __exit__(self, *exc_info):
+        _action_var.reset(self._token)
+
+
+def bind_action(fn):
+    """
+    新线程不继承当前的操作名,提交到线程池或新线程的函数用它包装
+    :param fn: 在其他线程执行的函数
+    :return: 在当前操作名下执行fn的函数
+    """
+    action = current_action()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        with action_scope(action):
+            return fn(*args, **kwargs)
+    return run
+
+
+class Histogram(object):
+    """
+    HDR风格的直方图:小于2^SUB_BUCKET_BITS的值精确计数,更大的值按最高的SUB_BUCKET_BITS位分桶,
+    内存占用只与数值的数量级有关
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self._bucket_dict = dict()  # {桶序号:数量}
+
+    @staticmethod
+    def bucket_of(value):
+        if value < (1 << SUB_BUCKET_BITS):
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+    @staticmethod
+    def bucket_upper(index):
+        """
+        :return: 桶内的最大值
+        """
+        shift, top = index >> SUB_BUCKET_BITS, index & ((1 << SUB_BUCKET_BITS) - 1)
+        if shift == 0:
+            return top
+        return ((top + 1) << shift) - 1
+
+    def add(self, value):
+        """
+        :param value: 非负整数
+        """
+        value = max(0, int(value))
+        index = self.bucket_of(value)
+        self._bucket_dict[index] = self._bucket_dict.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for index, number in other._bucket_dict.items():
+            self._bucket_dict[index] = self._bucket_dict.get(index, 0) + number
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent):
+        """
+        :param percent: 0-100
+        :return: 该分位的值(所在桶的上界,不超过最大值),没有数据时为0
+        """
+        if not self.count:
+            return 0
+        target = max(1, int(self.count * percent / 100.0 + 0.5))
+        seen = 0
+        for index in sorted(self._bucket_dict):
+            seen += self._bucket_dict[index]
+            if seen >= target:
+                return min(self.bucket_upper(index), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / float(self.count) if self.count else 0.0
+
+
+class CommandStats(object):
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()  # 微秒
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.pipeline_size = Histogram()  # 只有PIPELINE有数据
+
+    def to_dict(self):
+        return {'calls': self.calls, 'errors': self.errors,
+                'p50_ms': self.latency.percentile(50) / 1000.0, 'p99_ms': self.latency.percentile(99) / 1000.0,
+                'max_ms': self.latency.max / 1000.0, 'mean_ms': self.latency.mean() / 1000.0,
+                'request_bytes': self.request_bytes, 'response_bytes': self.response_bytes,
+                'pipeline_mean': self.pipeline_size.mean(), 'pipeline_max': self.pipeline_size.max}
+
+
+def request_bytes(args):
+    """
+    :param args: 命令和参数
+    :return: 按RESP协议编码后的字节数
+    """
+    total = len(str(len(args))) + 3
+    for arg in args:
+        if isinstance(arg, str):
+            size = len(arg.encode('utf-8', 'surrogateescape'))
+        elif isinstance(arg, (bytes, bytearray, memoryview)):
+            size = len(arg)
+        else:
+            size = len(str(arg))
+        total += size + len(str(size)) + 5
+    return total
+
+
+def response_bytes(value):
+    """
+    :param value: 解析后的返回值
+    :return: 返回数据的字节数(按解析后的内容估算,不含协议开销),数字和None按8字节计
+    """
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if isinstance(value, (list, tuple, set)):
+        return sum(response_bytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(response_bytes(key) + response_bytes(item) for key, item in value.items())
+    return 8
+
+
+def command_name(args):
+    name = args[0] if args else ''
+    if isinstance(name, bytes):
+        name = name.decode('utf-8', 'replace')
+    return str(name).upper()
+
+
+def pipeline_args(pipe):
+    """
+    :return: pipeline中各命令的参数列表,兼容普通pipeline和集群pipeline
+    """
+    strategy = getattr(pipe, '_execution_strategy', None)
+    if strategy is not None:
+        return [command.args for command in strategy.command_queue]
+    return [args for args, _ in pipe.command_stack]
+
+
+class Recorder(object):
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats_dict = dict()  # {(操作名, 命令):CommandStats}
+        self._original_dict = dict()  # {(类, 方法名):原方法},开启期间保存被替换的方法
+        self.started_at = time.time()
+
+    @property
+    def enabled(self):
+        return bool(self._original_dict)
+
+    def record(self, command, seconds, sent, received, error=False, pipeline_size=None):
+        """
+        :param command: 命令名
+        :param seconds: 耗时
+        :param sent: 请求字节数
+        :param received: 返回字节数
+        :param error: 是否出错
+        :param pipeline_size: pipeline中的命令数量
+        """
+        key = (current_action(), command)
+        with self._lock:
+            stats = self._stats_dict.get(key)
+            if stats is None:
+                stats = self._stats_dict[key] = CommandStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.latency.add(seconds * 1e6)
+            stats.request_bytes += sent
+            stats.response_bytes += received
+            if pipeline_size is not None:
+                stats.pipeline_size.add(pipeline_size)
+
+    def reset(self):
+        with self._lock:
+            self._stats_dict.clear()
+            self.started_at = time.time()
+
+    def rows(self):
+        """
+        :return: [(操作名, 命令, CommandStats.to_dict())],按操作名和命令排序
+        """
+        with self._lock:
+            item_list = sorted(self._stats_dict.items())
+            return [(action, command, stats.to_dict()) for (action, command), stats in item_list]
+
+    def total(self):
+        """
+        :return: 所有命令合计的CommandStats(PIPELINE按一次调用计)
+        """
+        total_stats = CommandStats()
+        with self._lock:
+            for stats in self._stats_dict.values():
+                total_stats.calls += stats.calls
+                total_stats.errors += stats.errors
+                total_stats.latency.merge(stats.latency)
+                total_stats.request_bytes += stats.request_bytes
+                total_stats.response_bytes += stats.response_bytes
+        return total_stats
+
+    def summary(self):
+        """
+        :return: 状态栏展示的合计信息
+        """
+        total_stats = self.total()
+        return 'cmds: {} p99: {:.1f}ms out: {:.1f}KB in: {:.1f}KB'.format(
+            total_stats.calls, total_stats.latency.percentile(99) / 1000.0, total_stats.request_bytes / 1024.0,
+            total_stats.response_bytes / 1024.0)
+
+    def to_json(self):
+        return json.dumps({'started_at': self.started_at, 'seconds': time.time() - self.started_at,
+                           'commands': [dict(stats, action=action, command=command)
+                                        for action, command, stats in self.rows()]}, indent=2)
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            f.write(self.to_json())
+
+    def enable(self):
+        """
+        替换redis-py客户端的方法,之后执行的命令都被统计
+        :return:
+        """
+        if self.enabled:
+            return
+        for cls, name, wrapper in ((redis.client.Redis, 'execute_command', self._wrap_command),
+                                   (redis.cluster.RedisCluster, 'execute_command', self._wrap_command),
+                                   (redis.client.Pipeline, 'execute', self._wrap_pipeline),
+                                   (redis.cluster.ClusterPipeline, 'execute', self._wrap_pipeline),
+                                   (redis.asyncio.client.Redis, 'execute_command', self._wrap_async_command),
+                                   (redis.asyncio.client.Pipeline, 'execute', self._wrap_async_pipeline)):
+            original = cls.__dict__[name]
+            self._original_dict[(cls, name)] = original
+            setattr(cls, name, wrapper(original))
+
+    def disable(self):
+        """
+        恢复redis-py客户端的原方法
+        :return:
+        """
+        while self._original_dict:
+            (cls, name), original = self._original_dict.popitem()
+            setattr(cls, name, original)
+
+    def _wrap_command(self, original):
+        recorder = self
+
+        @functools.wraps(original)
+        def execute_command(client, *args, **options):
+            start = time.perf_counter()
+            try:
+                result = original(client, *args, **options)
+            except Exception:
+                recorder.record(command_name(args), time.perf_counter() - start, request_bytes(args), 0, True)
+                raise
+            recorder.record(command_name(args), time.perf_counter() - start, request_bytes(args),
+                            response_bytes(result))
+            return result
+        return execute_command
+
+    def _wrap_pipeline(self, original):
+        recorder = self
+
+        @functools.wraps(original)
+        def execute(pipe, *args, **kwargs):
+            args_list = pipeline_args(pipe)
+            sent = sum(request_bytes(command_args) for command_args in args_list)
+            start = time.perf_counter()
+            try:
+                result = original(pipe, *args, **kwargs)
+            except Exception:
+                recorder.record(PIPELINE, time.perf_counter() - start, sent, 0, True, len(args_list))
+                raise
+            recorder.record(PIPELINE, time.perf_counter() - start, sent, response_bytes(result), False,
+                            len(args_list))
+            return result
+        return execute
+
+    def _wrap_async_command(self, original):
+        recorder = self
+
+        @functools.wraps(original)
+        async def execute_command(client, *args, **options):
+            start = time.perf_counter()
+            try:
+                result = await original(client, *args, **options)
+            except Exception:
+                recorder.record(command_name(args), time.perf_counter() - start, request_bytes(args), 0, True)
+                raise
+            recorder.record(command_name(args), time.perf_counter() - start, request_bytes(args),
+                            response_bytes(result))
+            return result
+        return execute_command
+
+    def _wrap_async_pipeline(self, original):
+        recorder = self
+
+        @functools.wraps(original)
+        async def execute(pipe, *args, **kwargs):
+            args_list = pipeline_args(pipe)
+            sent = sum(request_bytes(command_args) for command_args in args_list)
+            start = time.perf_counter()
+            try:
+                result = await original(pipe, *args, **kwargs)
+            except Exception:
+                recorder.record(PIPELINE, time.perf_counter() - start, sent, 0, True, len(args_list))
+                raise
+            recorder.record(PIPELINE, time.perf_counter() - start, sent, response_bytes(result), False,
+                            len(args_list))
+            return result
+        return execute
+
+
+recorder = Recorder()  # 进程内共享的命令统计
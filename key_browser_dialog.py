@@ -0,0 +1,116 @@
+"""
+说明：此脚本用于按命名空间逐层浏览一个db的key,展开某层时才读取下一层,双击key在主窗口中打开
+有完整且不过旧的key索引时直接从索引读取,否则在后台用SCAN MATCH实时读取该层前缀下的key
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QStandardItemModel, QStandardItem
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTreeView, QLabel, QAbstractItemView
+
+from key_index import group_children, scan_match, SCAN_LIMIT
+from redis_task import start_task
+
+
+PREFIX_ROLE = Qt.UserRole + 1  # 节点对应的完整前缀或完整key名
+IS_PREFIX_ROLE = Qt.UserRole + 2  # 节点是否为前缀
+LOADING_TEXT = 'loading...'
+
+
+class KeyBrowserDialog(QDialog):
+    key_selected = pyqtSignal(str, str)  # (db, key名) 双击某个key时发送
+
+    def __init__(self, parent, con, db, key_index=None, delimiter=':'):
+        """
+        :param parent: 主窗口
+        :param con: 当前db的RedisOperation实例,用于实时SCAN MATCH
+        :param db: db号码
+        :param key_index: key_index.KeyIndex,为None或该db的索引不可用时实时读取
+        :param delimiter: 各层之间的分隔符
+        """
+        super(KeyBrowserDialog, self).__init__(parent)
+        self.setWindowTitle('Key browser - db{}'.format(db))
+        self.resize(560, 520)
+        self.con = con
+        self.db = db
+        self.delimiter = delimiter
+        self.key_index = key_index if key_index is not None and key_index.is_fresh(db) else None
+        self.task_list = []  # 正在实时读取的任务
+        self.status_label = QLabel(self)
+        self.model = QStandardItemModel(0, 2, self)
+        self.model.setHorizontalHeaderLabels(['key', 'keys'])
+        self.tree_view = QTreeView(self)
+        self.tree_view.setModel(self.model)
+        self.tree_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tree_view.setColumnWidth(0, 420)
+        self.tree_view.expanded.connect(self.expand_node)
+        self.tree_view.doubleClicked.connect(self.open_key)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.tree_view)
+        if self.key_index is not None:
+            self.status_label.setText('{} keys from the local index'.format(key_index.size(db)))
+        else:
+            self.status_label.setText('no fresh index, reading with SCAN MATCH (up to {} keys per level)'.format(
+                SCAN_LIMIT))
+        self.load_children(self.model.invisibleRootItem(), '')
+
+    def load_children(self, parent_item, prefix):
+        """
+        读取prefix的下一层,从索引读取时立即填充,否则在后台读取
+        """
+        if self.key_index is not None:
+            self.fill_children(parent_item, prefix, self.key_index.children(self.db, prefix, self.delimiter), True)
+            return
+        task = start_task(self.run_scan_match, self.con, prefix, self.delimiter,
+                          on_result=lambda result: self.fill_children(parent_item, prefix, *result),
+                          on_error=self.status_label.setText)
+        task.signals.finished.connect(lambda: task in self.task_list and self.task_list.remove(task))
+        self.task_list.append(task)
+
+    @staticmethod
+    def run_scan_match(task, con, prefix, delimiter):
+        """
+        后台线程:SCAN MATCH读取该前缀下的key并按下一层分组
+        :return: (见key_index.group_children, 是否完整)
+        """
+        key_list, complete = scan_match(con, prefix, cancel_event=task.cancel_event)
+        return group_children(key_list, prefix, delimiter), complete
+
+    def fill_children(self, parent_item, prefix, child_list, complete):
+        """
+        :param parent_item: 上一层节点,根节点为invisibleRootItem
+        :param prefix: 上一层的前缀
+        :param child_list: [(段名, key数量, 是否为下一层前缀)]
+        :param complete: 是否读取到了该前缀下的所有key
+        """
+        parent_item.removeRows(0, parent_item.rowCount())  # 去掉占位节点
+        for segment, number, is_prefix in child_list:
+            name_item = QStandardItem(segment)
+            name_item.setData(prefix + segment, PREFIX_ROLE)
+            name_item.setData(is_prefix, IS_PREFIX_ROLE)
+            if is_prefix:
+                name_item.appendRow(QStandardItem(LOADING_TEXT))  # 占位,展开时再读取下一层
+            number_item = QStandardItem(str(number) if complete else '{}+'.format(number))
+            parent_item.appendRow([name_item, number_item])
+        if not complete:
+            self.status_label.setText('{}: more than {} keys, showing the first part only'.format(
+                prefix or 'db{}'.format(self.db), SCAN_LIMIT))
+
+    def expand_node(self, index):
+        item = self.model.itemFromIndex(index.sibling(index.row(), 0))
+        if item.rowCount() == 1 and item.child(0).data(PREFIX_ROLE) is None:
+            item.child(0).setData('', PREFIX_ROLE)  # 标记为读取中,读取完成前再次展开不重复读取
+            self.load_children(item, item.data(PREFIX_ROLE))
+
+    def open_key(self, index):
+        item = self.model.itemFromIndex(index.sibling(index.row(), 0))
+        if not item.data(IS_PREFIX_ROLE) and item.data(PREFIX_ROLE) is not None:
+            self.key_selected.emit(str(self.db), item.data(PREFIX_ROLE))
+
+    def closeEvent(self, event):
+        for task in self.task_list:
+            task.cancel()
+            task.signals.result.disconnect()  # 窗口关闭后不再填充已删除的节点
+        super(KeyBrowserDialog, self).closeEvent(event)
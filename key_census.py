@@ -0,0 +1,208 @@
+"""
+说明：此脚本用于并发统计redis各db的key数量分布
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from async_operation import AsyncRedisOperation
+from cluster import fan_out, NodeProgress, MAX_WORKERS as CLUSTER_MAX_WORKERS
+from connection_manager import connection_manager
+from instrumentation import bind_action
+from prefix_sketch import PrefixCounter
+from redis_operation import RedisOperation, KeyStatsCounter
+
+
+DB_NUMBER = 16  # 默认统计的db数量(0-15)
+MAX_WORKERS = 4  # 同时扫描的db数量上限
+
+
+class KeyCensus(object):
+
+    def __init__(self, redis_host, redis_port, password=None, db_list=None, max_workers=None,
+                 server_side=False, detail=False, namespace_rule=None, key_index=None, node_list=None, throttle=None):
+        """
+        :param redis_host: ip
+        :param redis_port: 端口
+        :param password: 密码
+        :param db_list: 需要统计的db号码列表,默认为0-15
+        :param max_workers: 同时扫描的db数量上限,即同时独占的连接数.为None时为MAX_WORKERS,集群为cluster.MAX_WORKERS
+        :param server_side: 为True时通过lua脚本在redis中按前缀统计,key名不经过网络传输
+        :param detail: 为True时按前缀统计数据类型分布,元素数量和占用内存,结果见RedisOperation.scan_key_stats
+        :param namespace_rule: key_namespace.NamespaceRule,为None时使用transform_key_name_to_simple
+        :param key_index: key_index.KeyIndex,不为None时顺便保存key名建立索引,此时总是在客户端统计
+        :param node_list: 集群所有master的[(host, port)],见cluster.cluster_masters.传入时只统计db 0,
+                          各master并发遍历后合并结果,此时max_workers为同时遍历的master数量上限
+        :param throttle: scan_throttle.ScanThrottle,所有扫描线程共用的影响预算,为None时不限制
+        """
+        self.redis_host = redis_host
+        self.redis_port = redis_port
+        self.password = password
+        self.namespace_rule = namespace_rule
+        self.key_index = key_index
+        self.server_side = server_side and key_index is None
+        self.detail = detail
+        self.throttle = throttle
+        self.db_list = list(range(DB_NUMBER)) if db_list is None else list(db_list)
+        self.max_workers = max(1, min(max_workers or MAX_WORKERS, len(self.db_list) or 1))
+        # 同一server的所有db共用一个连接池,每个扫描线程独占其中一个连接并SELECT到目标db
+        self._pool = connection_manager.get_server_pool(redis_host, redis_port, password)
+        self.node_list = list(node_list or [])
+        if self.node_list:  # 集群只有db 0,每个master一个扫描线程
+            self.db_list = [0]
+            self.max_workers = max(1, min(max_workers or CLUSTER_MAX_WORKERS, len(self.node_list)))
+            self._node_pool_list = [connection_manager.get_server_pool(host, port, password)
+                                    for host, port in self.node_list]
+
+    def scan_db(self, db, batch_callback=None, cancel_event=None):
+        """
+        统计单个db的key数量分布
+        :param db: db号码
+        :param batch_callback: 每个SCAN分片完成后的回调 batch_callback(db, 分片的{key:number}, 进度0-1),db为str
+        :param cancel_event: threading.Event,被set后停止扫描
+        :return: {key:number},detail为True时为{key:统计结果}
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            return dict()
+        if self.key_index is not None:
+            self.key_index.begin(str(db))
+        try:
+            return self.scan_pool(self._pool, db, batch_callback, cancel_event)
+        finally:
+            if self.key_index is not None:
+                # 被取消时没有遍历完整个db,丢弃不完整的索引
+                self.key_index.finish(str(db), cancel_event is None or not cancel_event.is_set())
+
+    def scan_pool(self, pool, db, batch_callback=None, cancel_event=None):
+        """
+        独占pool中的一个连接遍历db,参数和返回值见scan_db
+        """
+        con = RedisOperation(db, None, None, connection_pool=pool, throttle=self.throttle)
+        key_callback = functools.partial(self.key_index.add_keys, str(db)) if self.key_index is not None else None
+        try:
+            db_batch_callback = functools.partial(batch_callback, str(db)) if batch_callback else None
+            if self.detail:
+                return con.scan_key_stats(db_batch_callback, cancel_event, namespace_rule=self.namespace_rule,
+                                          key_callback=key_callback)
+            return con.scan_all_keys(db_batch_callback, cancel_event, self.server_side, self.namespace_rule,
+                                     key_callback)
+        finally:
+            con.close()
+
+    def scan_cluster(self, batch_callback=None, cancel_event=None):
+        """
+        并发遍历集群的所有master,合并为db 0的结果.batch_callback的进度为各master进度的平均值
+        :param batch_callback: 见scan_db
+        :param cancel_event: 见scan_db
+        :return: 见scan_db
+        """
+        node_progress = NodeProgress(len(self.node_list))
+
+        def scan_node(node_index, node):
+            node_batch_callback = None
+            if batch_callback:
+                def node_batch_callback(db, batch, progress):
+                    batch_callback(db, batch, node_progress.update(node_index, progress))
+            return self.scan_pool(self._node_pool_list[node_index], 0, node_batch_callback, cancel_event)
+
+        if self.key_index is not None:
+            self.key_index.begin('0')
+        try:
+            node_result_list = fan_out(scan_node, self.node_list, self.max_workers)
+        finally:
+            if self.key_index is not None:
+                self.key_index.finish('0', cancel_event is None or not cancel_event.is_set())
+        key_number_counter = KeyStatsCounter() if self.detail else PrefixCounter()  # 合并各master的结果时同样有内存上限
+        for node_result in node_result_list:
+            key_number_counter.update(node_result)
+        return key_number_counter.to_dict()
+
+    def run(self, callback=None, batch_callback=None, cancel_event=None):
+        """
+        并发扫描所有db,每个db扫描完成后立即合并结果
+        :param callback: 每个db完成时的回调 callback(db, key_number_dict),db为str
+        :param batch_callback: 每个SCAN分片完成时的回调 batch_callback(db, 分片的{key:number}, 进度0-1)
+        :param cancel_event: threading.Event,被set后尚未开始的db不再扫描,扫描中的db返回已统计的部分
+        :return: {db:{key:number}},与ParentWindow.all_db_keys_number_dict结构一致.detail为True时为{db:{key:统计结果}}
+        """
+        if self.node_list:
+            key_number_dict = self.scan_cluster(batch_callback, cancel_event)
+            if callback:
+                callback('0', key_number_dict)
+            return {'0': key_number_dict}
+        all_db_keys_number_dict = dict()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_db_dict = {executor.submit(bind_action(self.scan_db), db, batch_callback, cancel_event): str(db)
+                              for db in self.db_list}
+            for future in as_completed(future_db_dict):
+                db = future_db_dict[future]
+                all_db_keys_number_dict[db] = future.result()
+                if callback:
+                    callback(db, all_db_keys_number_dict[db])
+        return all_db_keys_number_dict
+
+    async def scan_db_async(self, db, batch_callback=None, cancel_event=None):
+        """
+        scan_db的asyncio版本,每个db使用一个asyncio连接,参数和返回值见scan_db
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            return dict()
+        con = AsyncRedisOperation(db, self.redis_host, self.redis_port, self.password)
+        key_callback = None
+        if self.key_index is not None:
+            self.key_index.begin(str(db))
+            key_callback = functools.partial(self.key_index.add_keys, str(db))
+        db_batch_callback = functools.partial(batch_callback, str(db)) if batch_callback else None
+        try:
+            if self.detail:
+                return await con.scan_key_stats(db_batch_callback, cancel_event, namespace_rule=self.namespace_rule,
+                                                key_callback=key_callback)
+            return await con.scan_all_keys(db_batch_callback, cancel_event, self.server_side, self.namespace_rule,
+                                           key_callback)
+        finally:
+            if self.key_index is not None:
+                self.key_index.finish(str(db), cancel_event is None or not cancel_event.is_set())
+
+    async def run_async(self, batch_callback=None, cancel_event=None):
+        """
+        run的asyncio版本:所有db在同一个事件循环中交替扫描,不占用线程,同时扫描的db数量不超过max_workers.
+        集群(node_list)和throttle不支持asyncio,这两种情况在线程池中执行run
+        :param batch_callback: 见run
+        :param cancel_event: 见run
+        :return: 见run
+        """
+        if self.node_list or self.throttle is not None:
+            return await asyncio.get_running_loop().run_in_executor(None, bind_action(self.run), None, batch_callback,
+                                                                    cancel_event)
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def scan_db(db):
+            async with semaphore:
+                return await self.scan_db_async(db, batch_callback, cancel_event)
+
+        result_list = await asyncio.gather(*(scan_db(db) for db in self.db_list))
+        return {str(db): result for db, result in zip(self.db_list, result_list)}
+
+
+def key_stats_to_number(key_stats_dict):
+    """
+    :param key_stats_dict: {key:统计结果}
+    :return: {key:number}
+    """
+    return {simple_key_name: key_stats['number'] for simple_key_name, key_stats in key_stats_dict.items()}
+
+
+def key_stats_to_type_number(key_stats_dict):
+    """
+    汇总一个db下各数据结构的key数量
+    :param key_stats_dict: {key:统计结果}
+    :return: {"string":0,"list":0,"hash":0,"set":0,"zset":0}
+    """
+    type_number_dict = {'string': 0, 'list': 0, 'hash': 0, 'set': 0, 'zset': 0}
+    for key_stats in key_stats_dict.values():
+        for key_type, number in key_stats['types'].items():
+            type_number_dict[key_type] = type_number_dict.get(key_type, 0) + number
+    return type_number_dict
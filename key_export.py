@@ -0,0 +1,308 @@
+"""
+说明：此脚本用于把一个key,一个前缀或整个db流式导出到文件,大集合按块读取和写入,内存占用不随数据量增长
+导出格式：
+    ndjson 每行一个json {"key":, "type":, "pttl":, "value":},大集合拆分为多行,每行value为一块元素,导入时追加
+           string为字符串,list/set为列表,hash为对象,zset为[[member, score]].非utf-8的字节按surrogateescape保存
+    csv    每个元素一行 key,type,pttl,field,value.list的field为下标,hash为field,zset为score,string/set为空
+    dump   二进制,文件头DUMP_MAGIC,之后每个key为 key长度,key,pttl,DUMP数据长度,DUMP数据,可用RESTORE导入
+大string按GETRANGE分块导出为多行,导入时第一块SET,之后的块APPEND
+文件名以.gz结尾时使用gzip压缩.集群的各master并发导出到同一个文件,同一个key的多行总是相邻
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import csv
+import gzip
+import io
+import json
+import shutil
+import struct
+import tempfile
+import threading
+import time
+
+from cluster import fan_out, NodeProgress
+from redis_operation import scan_cursor_progress, escape_pattern
+
+
+EXPORT_FORMATS = ('ndjson', 'csv', 'dump')
+DUMP_MAGIC = b'REDIS-DESKTOP-DUMP 1\n'
+DUMP_HEADER = struct.Struct('>I')  # key长度和DUMP数据长度
+DUMP_PTTL = struct.Struct('>q')
+CHUNK_SIZE = 1000  # 大集合每次读取和每行写入的元素数量,元素数量不超过该值的key在pipeline中整体读取
+SCAN_COUNT = 1000  # 每次SCAN的COUNT
+STRING_CHUNK_BYTES = 256 << 10  # 大string每次GETRANGE读取和每行写入的字节数,不超过该值的string在pipeline中整体读取
+SPOOL_SIZE = 4 << 20  # 并发导出时大key暂存在内存中的上限,超出后暂存到临时文件
+BUFFER_SIZE = 1 << 20  # 文件写入缓冲区大小
+VALUE_TYPES = ('string', 'list', 'hash', 'set', 'zset')  # ndjson和csv支持的数据类型,其他类型只能用dump导出
+
+
+def decode(value):
+    return value.decode('utf-8', 'surrogateescape')
+
+
+def open_export_file(path, export_format):
+    """
+    :param path: 文件路径,以.gz结尾时使用gzip压缩
+    :param export_format: 导出格式
+    :return: dump为二进制文件,其他为utf-8文本文件
+    """
+    compressed = path.endswith('.gz')
+    if export_format == 'dump':
+        return gzip.open(path, 'wb') if compressed else open(path, 'wb', buffering=BUFFER_SIZE)
+    if compressed:
+        return gzip.open(path, 'wt', encoding='utf-8', errors='surrogateescape', newline='')
+    return open(path, 'w', buffering=BUFFER_SIZE, encoding='utf-8', errors='surrogateescape', newline='')
+
+
+def typed_value(key_type, value):
+    """
+    :param key_type: 数据类型
+    :param value: RedisOperation.read_values返回的一个value或一块元素
+    :return: 可以写入json的值
+    """
+    if key_type == 'string':
+        return decode(value)
+    if key_type == 'hash':
+        return {decode(field): decode(field_value) for field, field_value in value.items()}
+    if key_type == 'zset':
+        return [[decode(member), score] for member, score in value]
+    return [decode(member) for member in value]
+
+
+def progress_text(key_number, bytes_written, progress, elapsed):
+    """
+    :return: 导出进度的说明,包括吞吐量和预计剩余时间
+    """
+    elapsed = max(elapsed, 1e-6)
+    text = '{} keys, {:.0f} keys/s, {:.1f} MB/s, {:.0f}%'.format(
+        key_number, key_number / elapsed, bytes_written / elapsed / (1 << 20), 100 * progress)
+    if 0 < progress < 1:
+        text += ', ETA {:.0f}s'.format(elapsed * (1 - progress) / progress)
+    return text
+
+
+class KeyExporter(object):
+
+    def __init__(self, con, export_format='ndjson', chunk_size=CHUNK_SIZE, node_con_list=None):
+        """
+        :param con: RedisOperation实例,集群为按key路由的实例(RedisOperation的cluster参数),用于导出单个key
+        :param export_format: ndjson/csv/dump
+        :param chunk_size: 大集合每块的元素数量
+        :param node_con_list: 集群各master的RedisOperation实例,传入时按前缀或整个db导出时并发遍历各master
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError('unknown export format: {}'.format(export_format))
+        self.con = con
+        self.export_format = export_format
+        self.chunk_size = chunk_size
+        self.key_number = 0  # 已导出的key数量
+        self.skipped_number = 0  # 因类型不支持或执行期间被删除而跳过的key数量
+        self.bytes_written = 0  # 写入的字节数(压缩前)
+        self.node_con_list = list(node_con_list or [])
+        self._writer = None
+        self._lock = threading.Lock()  # 并发导出时每次写入一个完整的key,同一个key的多行不会被其他key隔开
+        self.spool = False  # 是否与其他导出器并发写入同一个文件,见export_large_value
+
+    def key_batches(self, key_name=None, prefix=None):
+        """
+        :param key_name: 只导出这一个key
+        :param prefix: 只导出该前缀的key,与key_name都为None时导出整个db
+        :return: generator (进度0-1, key列表)
+        """
+        if key_name is not None:
+            yield 1.0, [key_name.encode() if isinstance(key_name, str) else key_name]
+            return
+        dbsize = self.con.dbsize()
+        match = escape_pattern(prefix) if prefix else None
+        for scan_cursor, key_list in self.con.scan_keys_batches(SCAN_COUNT, match):
+            yield scan_cursor_progress(scan_cursor, dbsize), key_list
+
+    def value_chunks(self, key_name, key_type):
+        """
+        按块读取一个大key,string用GETRANGE每次读取STRING_CHUNK_BYTES个字节
+        :return: generator,每块的格式与RedisOperation.read_values一致
+        """
+        if key_type == 'string':
+            start = 0
+            while True:
+                chunk = self.con.getrange(key_name, start, start + STRING_CHUNK_BYTES - 1)
+                if chunk:
+                    yield chunk
+                if len(chunk) < STRING_CHUNK_BYTES:
+                    return
+                start += STRING_CHUNK_BYTES
+        if key_type == 'list':
+            start = 0
+            while True:
+                chunk = self.con.lrange_page(key_name, start, start + self.chunk_size - 1)
+                if not chunk:
+                    return
+                yield chunk
+                start += self.chunk_size
+        scan = {'hash': self.con.hscan, 'set': self.con.sscan, 'zset': self.con.zscan}[key_type]
+        cursor = 0
+        while True:
+            cursor, chunk = scan(key_name, cursor, count=self.chunk_size)
+            if chunk:
+                yield chunk
+            if cursor == 0:
+                return
+
+    def write_text(self, text):
+        self._writer.write(text)
+        self.bytes_written += len(text)
+
+    def format_value(self, key_name, key_type, pttl, value, index=0):
+        """
+        :param value: 整个value或一块元素
+        :param index: list该块第一个元素的下标,用于csv的field
+        :return: 写入文件的文本
+        """
+        if self.export_format == 'ndjson':
+            return json.dumps({'key': key_name, 'type': key_type, 'pttl': pttl,
+                               'value': typed_value(key_type, value)}) + '\n'
+        if key_type == 'string':
+            row_list = [('', decode(value))]
+        elif key_type == 'list':
+            row_list = [(index + i, decode(member)) for i, member in enumerate(value)]
+        elif key_type == 'hash':
+            row_list = [(decode(field), decode(field_value)) for field, field_value in value.items()]
+        elif key_type == 'zset':
+            row_list = [(score, decode(member)) for member, score in value]
+        else:
+            row_list = [('', decode(member)) for member in value]
+        text = io.StringIO(newline='')
+        csv.writer(text).writerows((key_name, key_type, pttl, field, field_value) for field, field_value in row_list)
+        return text.getvalue()
+
+    def is_small(self, key_type, length):
+        """
+        :return: 是否在pipeline中整体读取,否则按块读取
+        """
+        return length <= (STRING_CHUNK_BYTES if key_type == 'string' else self.chunk_size)
+
+    def export_values(self, key_list):
+        """
+        导出一批key:pipeline获取类型,长度和过期时间,小key在一个pipeline中整体读取,大key按块读取
+        """
+        described_list = [item for item in self.con.describe_keys(key_list, memory=False) if item[1] in VALUE_TYPES]
+        self.skipped_number += len(key_list) - len(described_list)
+        pttl_list = self.con.pttl_keys([item[0] for item in described_list])
+        small_list = [(key_name, key_type) for key_name, key_type, length, _ in described_list
+                      if self.is_small(key_type, length)]
+        small_value_iter = iter(self.con.read_values(small_list))
+        for (key_name, key_type, length, _), pttl in zip(described_list, pttl_list):
+            if self.is_small(key_type, length):
+                value = next(small_value_iter)
+                if isinstance(value, Exception) or value is None:
+                    self.skipped_number += 1
+                    continue
+                text = self.format_value(decode(key_name), key_type, pttl, value)
+                with self._lock:
+                    self.write_text(text)
+            else:
+                self.export_large_value(key_name, key_type, pttl)
+            self.key_number += 1
+
+    def export_large_value(self, key_name, key_type, pttl):
+        """
+        按块读取一个大key,读取时不持有写入锁.
+        多个导出器共用一个文件时(集群),各块先写入临时文件,读完后在锁内一次复制到导出文件,同一个key的多行仍然相邻
+        """
+        index = 0
+        if not self.spool:
+            for chunk in self.value_chunks(key_name, key_type):
+                text = self.format_value(decode(key_name), key_type, pttl, chunk, index)
+                with self._lock:
+                    self.write_text(text)
+                index += len(chunk)
+            return
+        with tempfile.SpooledTemporaryFile(SPOOL_SIZE, 'w+', encoding='utf-8', errors='surrogateescape',
+                                           newline='') as spool:
+            for chunk in self.value_chunks(key_name, key_type):
+                text = self.format_value(decode(key_name), key_type, pttl, chunk, index)
+                spool.write(text)
+                self.bytes_written += len(text)
+                index += len(chunk)
+            spool.seek(0)
+            with self._lock:
+                shutil.copyfileobj(spool, self._writer, BUFFER_SIZE)
+
+    def export_dumps(self, key_list):
+        dump_list = self.con.dump_keys(key_list)
+        for key_name, pttl, payload in dump_list:
+            with self._lock:
+                self._writer.write(DUMP_HEADER.pack(len(key_name)) + key_name + DUMP_PTTL.pack(pttl) +
+                                   DUMP_HEADER.pack(len(payload)))
+                self._writer.write(payload)
+            self.bytes_written += DUMP_HEADER.size * 2 + DUMP_PTTL.size + len(key_name) + len(payload)
+        self.key_number += len(dump_list)
+        self.skipped_number += len(key_list) - len(dump_list)
+
+    def export_batches(self, batch_iter, progress_callback=None, cancel_event=None, start_time=None):
+        """
+        :param batch_iter: key_batches返回的generator
+        :param progress_callback: 见export,进度为batch_iter返回的进度
+        """
+        for progress, key_list in batch_iter:
+            if self.export_format == 'dump':
+                self.export_dumps(key_list)
+            else:
+                self.export_values(key_list)
+            if progress_callback:
+                progress_callback(self.key_number, self.bytes_written, progress, time.time() - start_time)
+            if cancel_event is not None and cancel_event.is_set():
+                break
+
+    def export_nodes(self, prefix=None, progress_callback=None, cancel_event=None, start_time=None):
+        """
+        集群:每个master一个线程和一个子导出器,遍历该master上的key并写入同一个文件,结束后汇总各子导出器的数量
+        """
+        node_progress = NodeProgress(len(self.node_con_list))
+        exporter_list = []
+        for con in self.node_con_list:
+            exporter = KeyExporter(con, self.export_format, self.chunk_size)
+            exporter._writer, exporter._lock, exporter.spool = self._writer, self._lock, True
+            exporter_list.append(exporter)
+
+        def export_node(node_index, exporter):
+            node_progress_callback = None
+            if progress_callback:
+                def node_progress_callback(key_number, bytes_written, progress, elapsed):
+                    progress_callback(sum(item.key_number for item in exporter_list),
+                                      sum(item.bytes_written for item in exporter_list),
+                                      node_progress.update(node_index, progress), elapsed)
+            exporter.export_batches(exporter.key_batches(None, prefix), node_progress_callback, cancel_event,
+                                    start_time)
+
+        try:
+            fan_out(export_node, exporter_list)
+        finally:
+            for exporter in exporter_list:
+                self.key_number += exporter.key_number
+                self.skipped_number += exporter.skipped_number
+                self.bytes_written += exporter.bytes_written
+
+    def export(self, path, key_name=None, prefix=None, progress_callback=None, cancel_event=None):
+        """
+        :param path: 导出文件路径,以.gz结尾时使用gzip压缩
+        :param key_name: 只导出这一个key
+        :param prefix: 只导出该前缀的key,与key_name都为None时导出整个db
+        :param progress_callback: 每批key导出后的回调 progress_callback(已导出的key数量, 写入字节数, 进度0-1, 已用秒数)
+        :param cancel_event: threading.Event,被set后停止导出,已写入的部分保留
+        :return: {'keys': 导出的key数量, 'skipped': 跳过的key数量, 'bytes': 写入字节数, 'seconds': 用时}
+        """
+        start_time = time.time()
+        with open_export_file(path, self.export_format) as self._writer:
+            if self.export_format == 'dump':
+                self._writer.write(DUMP_MAGIC)
+            elif self.export_format == 'csv':
+                csv.writer(self._writer).writerow(('key', 'type', 'pttl', 'field', 'value'))
+            if self.node_con_list and key_name is None:
+                self.export_nodes(prefix, progress_callback, cancel_event, start_time)
+            else:
+                self.export_batches(self.key_batches(key_name, prefix), progress_callback, cancel_event, start_time)
+        self._writer = None
+        return {'keys': self.key_number, 'skipped': self.skipped_number, 'bytes': self.bytes_written,
+                'seconds': time.time() - start_time}
@@ -0,0 +1,284 @@
+"""
+说明：此脚本用于把key_export导出的ndjson/csv/dump文件批量导入redis
+读取线程把每个key转换为写命令,按key分配给多个写入线程,每个写入线程用自己的连接以pipeline批量执行,
+pipeline的大小根据实测的往返时间自动调整.同一个key的命令总是由同一个线程按顺序执行
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import queue
+import threading
+import time
+
+from instrumentation import bind_action
+from key_export import DUMP_MAGIC, DUMP_HEADER, DUMP_PTTL, CHUNK_SIZE, STRING_CHUNK_BYTES
+from redis_operation import RedisOperation
+
+
+WORKERS = 4  # 写入线程数量,即同时使用的连接数
+QUEUE_SIZE = 10000  # 每个写入线程待执行的key数量上限,读取快于写入时阻塞读取,内存占用固定
+MIN_BATCH = 16  # pipeline中命令数量的下限
+MAX_BATCH = 10000  # pipeline中命令数量的上限
+TARGET_SECONDS = 0.05  # 期望的每次pipeline往返时间,实测更快时扩大批量,更慢时缩小批量
+PROGRESS_INTERVAL = 0.5  # 两次进度回调的最小间隔(秒)
+
+
+def encode(value):
+    return value.encode('utf-8', 'surrogateescape')
+
+
+def detect_format(path):
+    """
+    :param path: 导入文件路径
+    :return: 按扩展名判断的格式 ndjson/csv/dump
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    for import_format in ('csv', 'dump'):
+        if name.endswith('.' + import_format):
+            return import_format
+    return 'ndjson'
+
+
+class AdaptiveBatch(object):
+    """
+    根据实测的pipeline执行时间调整批量:比目标时间快一倍以上时加倍,慢一倍以上时减半
+    """
+
+    def __init__(self, size=100, target_seconds=TARGET_SECONDS):
+        self.size = size
+        self.target_seconds = target_seconds
+
+    def record(self, seconds):
+        """
+        :param seconds: 本次pipeline的执行时间
+        :return:
+        """
+        if seconds < self.target_seconds / 2:
+            self.size = min(MAX_BATCH, self.size * 2)
+        elif seconds > self.target_seconds * 2:
+            self.size = max(MIN_BATCH, self.size // 2)
+
+
+class KeyImporter(object):
+
+    def __init__(self, redis_db, redis_host, redis_port, password=None, workers=WORKERS, replace=False,
+                 cluster=False):
+        """
+        :param redis_db: 导入的db
+        :param redis_host: ip
+        :param redis_port: 端口
+        :param password: 密码
+        :param workers: 写入线程数量
+        :param replace: 为True时覆盖已存在的key(ndjson/csv先DEL,dump使用RESTORE REPLACE);
+                        为False时ndjson/csv合并到已存在的key中,dump遇到已存在的key记为错误
+        :param cluster: 为True时导入集群,每个写入线程的pipeline按key分组发送到各master
+        """
+        self.redis_db = redis_db
+        self.redis_host = redis_host
+        self.redis_port = redis_port
+        self.password = password
+        self.workers = max(1, workers)
+        self.replace = replace
+        self.cluster = cluster
+        self.key_number = 0  # 已读取的key数量
+        self.ops_number = 0  # 已执行的命令数量
+        self.error_number = 0  # 执行失败的命令数量
+        self.first_error = None
+        self._lock = threading.Lock()
+
+    def open_file(self, path, binary):
+        """
+        :return: (原始文件, 读取用的文件),原始文件用于计算读取进度
+        """
+        raw_file = open(path, 'rb')
+        stream = gzip.GzipFile(fileobj=raw_file) if path.endswith('.gz') else raw_file
+        if binary:
+            return raw_file, stream
+        return raw_file, io.TextIOWrapper(stream, encoding='utf-8', errors='surrogateescape', newline='')
+
+    @staticmethod
+    def ndjson_records(f):
+        """
+        :return: generator (key, 数据类型, pttl, 值),值的格式与key_export.typed_value一致
+        """
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record['key'], record['type'], record['pttl'], record['value']
+
+    def csv_records(self, f):
+        """
+        把csv中同一个key的连续行合并为ndjson格式的记录,大集合每CHUNK_SIZE行合并为一条
+        :return: generator (key, 数据类型, pttl, 值)
+        """
+        csv.field_size_limit(max(csv.field_size_limit(), 2 * STRING_CHUNK_BYTES))  # 大string每行一块
+        reader = csv.reader(f)
+        next(reader, None)  # 表头
+        last_key, last_type, last_pttl, chunk = None, None, None, []
+        for key_name, key_type, pttl, field, value in reader:
+            if chunk and (key_name != last_key or len(chunk) >= CHUNK_SIZE):
+                yield self.csv_value(last_key, last_type, last_pttl, chunk)
+                chunk = []
+            last_key, last_type, last_pttl = key_name, key_type, int(pttl)
+            chunk.append((field, value))
+        if chunk:
+            yield self.csv_value(last_key, last_type, last_pttl, chunk)
+
+    @staticmethod
+    def csv_value(key_name, key_type, pttl, chunk):
+        if key_type == 'string':
+            value = ''.join(value for _, value in chunk)
+        elif key_type == 'hash':
+            value = dict(chunk)
+        elif key_type == 'zset':
+            value = [[member, float(score)] for score, member in chunk]
+        else:
+            value = [member for _, member in chunk]
+        return key_name, key_type, pttl, value
+
+    @staticmethod
+    def dump_records(f):
+        """
+        :return: generator (key, 'dump', pttl, DUMP数据)
+        """
+        if f.read(len(DUMP_MAGIC)) != DUMP_MAGIC:
+            raise ValueError('not a redis_desktop dump file')
+        while True:
+            header = f.read(DUMP_HEADER.size)
+            if not header:
+                return
+            key_name = f.read(DUMP_HEADER.unpack(header)[0])
+            pttl = DUMP_PTTL.unpack(f.read(DUMP_PTTL.size))[0]
+            payload = f.read(DUMP_HEADER.unpack(f.read(DUMP_HEADER.size))[0])
+            yield key_name, 'dump', pttl, payload
+
+    def record_commands(self, key_name, key_type, pttl, value, first_chunk):
+        """
+        :param first_chunk: 是否为该key的第一条记录,replace时只在第一条记录前DEL
+        :return: [(命令, 参数...)]
+        """
+        if key_type == 'dump':
+            return [('RESTORE', key_name, max(pttl, 0), value) + (('REPLACE',) if self.replace else ())]
+        key_name = encode(key_name)
+        command_list = [('DEL', key_name)] if self.replace and first_chunk else []
+        if key_type == 'string':  # 大string分块导出,之后的块追加
+            command_list.append(('SET' if first_chunk else 'APPEND', key_name, encode(value)))
+        elif key_type == 'list' and value:
+            command_list.append(('RPUSH', key_name) + tuple(encode(member) for member in value))
+        elif key_type == 'set' and value:
+            command_list.append(('SADD', key_name) + tuple(encode(member) for member in value))
+        elif key_type == 'hash' and value:
+            command_list.append(('HSET', key_name) + tuple(item for field, field_value in value.items()
+                                                          for item in (encode(field), encode(field_value))))
+        elif key_type == 'zset' and value:
+            command_list.append(('ZADD', key_name) + tuple(item for member, score in value
+                                                          for item in (score, encode(member))))
+        if pttl > 0:
+            command_list.append(('PEXPIRE', key_name, pttl))
+        return command_list
+
+    def write_worker(self, command_queue):
+        """
+        写入线程:从队列中取出命令,凑满一个批量或队列暂时为空时执行pipeline.
+        连接或执行出现任何异常时都继续消费队列直到结束标记,计为失败的命令,避免读取线程在put时阻塞
+        """
+        try:
+            con = RedisOperation(self.redis_db, self.redis_host, self.redis_port, self.password, cluster=self.cluster)
+            setup_error = None
+        except Exception as e:
+            con, setup_error = None, e
+        batch = AdaptiveBatch()
+        command_list = []
+        finished = False
+        while not finished:
+            try:
+                item = command_queue.get(timeout=0.1) if not command_list else command_queue.get_nowait()
+            except queue.Empty:
+                item = ()
+            if item is None:
+                finished = True
+            elif item:
+                command_list.extend(item)
+            if command_list and (finished or not item or len(command_list) >= batch.size):
+                start_time = time.time()
+                try:
+                    reply = con.execute_commands(command_list) if con else [setup_error] * len(command_list)
+                except Exception as e:  # 整个批量失败时继续消费队列,避免读取线程阻塞
+                    reply = [e] * len(command_list)
+                batch.record(time.time() - start_time)
+                error_list = [result for result in reply if isinstance(result, Exception)]
+                with self._lock:
+                    self.ops_number += len(command_list)
+                    self.error_number += len(error_list)
+                    if error_list and self.first_error is None:
+                        self.first_error = str(error_list[0])
+                command_list = []
+
+    def import_file(self, path, import_format=None, progress_callback=None, cancel_event=None):
+        """
+        :param path: 导入文件路径,以.gz结尾时按gzip解压
+        :param import_format: ndjson/csv/dump,为None时按扩展名判断
+        :param progress_callback: 进度回调 progress_callback(已读取的key数量, 已执行的命令数量, 读取进度0-1, 已用秒数)
+        :param cancel_event: threading.Event,被set后停止读取,已读取的部分写入后返回
+        :return: {'keys':, 'ops':, 'errors':, 'first_error':, 'seconds':, 'ops_per_second':}
+        """
+        import_format = import_format or detect_format(path)
+        file_size = max(1, os.path.getsize(path))
+        raw_file, f = self.open_file(path, import_format == 'dump')
+        queue_list = [queue.Queue(QUEUE_SIZE) for _ in range(self.workers)]
+        thread_list = [threading.Thread(target=bind_action(self.write_worker), args=(command_queue,), daemon=True)
+                       for command_queue in queue_list]
+        for thread in thread_list:
+            thread.start()
+        start_time = last_report_time = time.time()
+        try:
+            if import_format == 'dump':
+                record_iter = self.dump_records(f)
+            elif import_format == 'csv':
+                record_iter = self.csv_records(f)
+            else:
+                record_iter = self.ndjson_records(f)
+            last_key = None
+            for key_name, key_type, pttl, value in record_iter:
+                first_chunk = key_name != last_key  # 导出时同一个key的多条记录总是相邻
+                if first_chunk:
+                    self.key_number += 1
+                    last_key = key_name
+                queue_list[hash(key_name) % self.workers].put(
+                    self.record_commands(key_name, key_type, pttl, value, first_chunk))
+                if progress_callback and time.time() - last_report_time >= PROGRESS_INTERVAL:
+                    last_report_time = time.time()
+                    progress_callback(self.key_number, self.ops_number, raw_file.tell() / float(file_size),
+                                      last_report_time - start_time)
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+        finally:
+            for command_queue in queue_list:
+                command_queue.put(None)
+            for thread in thread_list:
+                thread.join()
+            f.close()
+            raw_file.close()
+        seconds = time.time() - start_time
+        if progress_callback:
+            progress_callback(self.key_number, self.ops_number, 1.0, seconds)
+        return {'keys': self.key_number, 'ops': self.ops_number, 'errors': self.error_number,
+                'first_error': self.first_error, 'seconds': seconds,
+                'ops_per_second': self.ops_number / max(seconds, 1e-6)}
+
+
+def import_progress_text(key_number, ops_number, progress, elapsed):
+    """
+    :return: 导入进度的说明,包括每秒执行的命令数量和预计剩余时间
+    """
+    elapsed = max(elapsed, 1e-6)
+    text = '{} keys, {} ops, {:.0f} ops/s, {:.0f}%'.format(key_number, ops_number, ops_number / elapsed,
+                                                           100 * progress)
+    if 0 < progress < 1:
+        text += ', ETA {:.0f}s'.format(elapsed * (1 - progress) / progress)
+    return text
@@ -0,0 +1,177 @@
+"""
+说明：此脚本用于在统计时顺便保存各db的key名,建立有序数组形式的key索引,用于key名自动补全和按层浏览
+索引有内存上限,超出上限,统计被取消,或索引过旧时改为实时SCAN MATCH
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import bisect
+import threading
+import time
+
+from redis_operation import escape_pattern
+
+
+MAX_INDEX_BYTES = 64 << 20  # 所有db的索引合计占用内存的上限(估算值)
+KEY_OVERHEAD = 60  # 每个key名在python中除字符本身外的大约开销(字节)
+STALE_SECONDS = 600  # 索引建立后超过该时间视为过旧
+COMPLETE_LIMIT = 50  # 自动补全最多返回的key数量
+SCAN_LIMIT = 10000  # 实时SCAN MATCH时最多读取的key数量
+MAX_CHAR = '\U0010ffff'
+
+
+def prefix_upper_bound(prefix):
+    """
+    :return: 大于所有以prefix开头的字符串的最小字符串,用于二分查找
+    """
+    return prefix + MAX_CHAR
+
+
+def group_children(key_list, prefix, delimiter):
+    """
+    把以prefix开头的有序key名按下一层分组
+    :param key_list: 有序的key名列表
+    :param prefix: 上一层的前缀,包含结尾的分隔符
+    :param delimiter: 分隔符
+    :return: [(段名, key数量, 是否为下一层前缀)],下一层前缀的段名包含结尾的分隔符,否则为完整key名的剩余部分
+    """
+    child_list = []
+    i = bisect.bisect_left(key_list, prefix)
+    end = bisect.bisect_left(key_list, prefix_upper_bound(prefix), i)
+    while i < end:
+        rest = key_list[i][len(prefix):]
+        pos = rest.find(delimiter)
+        if pos < 0:
+            child_list.append((rest, 1, False))
+            i += 1
+            continue
+        segment = rest[:pos + len(delimiter)]
+        j = bisect.bisect_left(key_list, prefix_upper_bound(prefix + segment), i, end)
+        child_list.append((segment, j - i, True))
+        i = j
+    return child_list
+
+
+class KeyIndex(object):
+
+    def __init__(self, max_bytes=MAX_INDEX_BYTES, stale_seconds=STALE_SECONDS):
+        """
+        :param max_bytes: 所有db的索引合计占用内存的上限
+        :param stale_seconds: 索引建立后超过该时间视为过旧
+        """
+        self.max_bytes = max_bytes
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        self._building_dict = dict()  # 正在建立的索引 {db:[key名]}
+        self._key_list_dict = dict()  # 已建立的有序索引 {db:[key名]}
+        self._built_at_dict = dict()  # {db:建立完成的时间戳}
+        self._bytes_dict = dict()  # {db:估算的内存占用}
+        self.overflow = False  # 是否因超出内存上限放弃了某个db的索引
+
+    def begin(self, db):
+        """
+        开始为db建立索引,统计线程在遍历前调用
+        """
+        with self._lock:
+            self._building_dict[db] = []
+            self._bytes_dict[db] = 0
+
+    def add_keys(self, db, key_list):
+        """
+        :param db: db号码(str)
+        :param key_list: 一个SCAN分片的key名列表(bytes)
+        :return:
+        """
+        building_list = self._building_dict.get(db)
+        if building_list is None:
+            return
+        batch_bytes = sum(len(key_name) for key_name in key_list) + KEY_OVERHEAD * len(key_list)
+        with self._lock:
+            if sum(self._bytes_dict.values()) + batch_bytes > self.max_bytes:
+                self._building_dict.pop(db, None)  # 超出内存上限,放弃该db的索引
+                self._bytes_dict.pop(db, None)
+                self.overflow = True
+                return
+            self._bytes_dict[db] += batch_bytes
+        building_list.extend(key_name.decode('utf-8', 'replace') for key_name in key_list)
+
+    def finish(self, db, complete=True):
+        """
+        :param db: db号码(str)
+        :param complete: 是否完整遍历了该db,未完整遍历的索引被丢弃
+        :return:
+        """
+        with self._lock:
+            building_list = self._building_dict.pop(db, None)
+        if building_list is None or not complete:
+            self.discard(db)
+            return
+        building_list.sort()
+        with self._lock:
+            self._key_list_dict[db] = building_list
+            self._built_at_dict[db] = time.time()
+
+    def discard(self, db):
+        with self._lock:
+            self._key_list_dict.pop(db, None)
+            self._built_at_dict.pop(db, None)
+            self._bytes_dict.pop(db, None)
+
+    def clear(self):
+        with self._lock:
+            self._building_dict.clear()
+            self._key_list_dict.clear()
+            self._built_at_dict.clear()
+            self._bytes_dict.clear()
+            self.overflow = False
+
+    def is_fresh(self, db):
+        """
+        :return: 该db是否有完整且不过旧的索引
+        """
+        built_at = self._built_at_dict.get(db)
+        return built_at is not None and time.time() - built_at <= self.stale_seconds
+
+    def size(self, db):
+        return len(self._key_list_dict.get(db, ()))
+
+    def complete(self, db, prefix, limit=COMPLETE_LIMIT):
+        """
+        :param db: db号码(str)
+        :param prefix: 已输入的key名前缀
+        :param limit: 最多返回的数量
+        :return: 以prefix开头的key名,按字典序排列
+        """
+        key_list = self._key_list_dict.get(db, [])
+        i = bisect.bisect_left(key_list, prefix)
+        result = []
+        while i < len(key_list) and len(result) < limit and key_list[i].startswith(prefix):
+            result.append(key_list[i])
+            i += 1
+        return result
+
+    def children(self, db, prefix='', delimiter=':'):
+        """
+        :param db: db号码(str)
+        :param prefix: 上一层的前缀,包含结尾的分隔符
+        :param delimiter: 分隔符
+        :return: 见group_children
+        """
+        return group_children(self._key_list_dict.get(db, []), prefix, delimiter)
+
+
+def scan_match(con, prefix, limit=SCAN_LIMIT, cancel_event=None):
+    """
+    索引不可用时用SCAN MATCH实时查找以prefix开头的key
+    :param con: RedisOperation实例
+    :param prefix: key名前缀
+    :param limit: 最多读取的key数量
+    :param cancel_event: threading.Event,被set后停止遍历
+    :return: (有序的key名列表, 是否完整)
+    """
+    key_set = set()
+    for scan_cursor, key_list in con.scan_keys_batches(1000, escape_pattern(prefix)):
+        key_set.update(key_name.decode('utf-8', 'replace') for key_name in key_list)
+        if len(key_set) >= limit or (cancel_event is not None and cancel_event.is_set()):
+            return sorted(key_set), False
+    return sorted(key_set), True
@@ -0,0 +1,178 @@
+"""
+说明：此脚本用于把key名按分隔符和规则归并为多层命名空间,并汇总为前缀树
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import json
+import os
+import re
+
+
+NAMESPACE_FILE = 'namespace.json'  # 命名空间规则的配置文件
+MAX_SEGMENT_CACHE = 100000  # 段名归并结果的缓存上限,超出后清空重新缓存
+
+# 常用的归并规则:(正则, 占位符),按顺序匹配,第一个匹配成功的规则生效
+DEFAULT_PATTERN_LIST = [
+    (r'^\d{13}$|^\d{10}$', '{ts}'),
+    (r'^\d+$', '{id}'),
+    (r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$', '{uuid}'),
+    (r'^\d{4}-?\d{2}-?\d{2}([T ]?\d{2}:?\d{2}(:?\d{2})?)?$', '{date}'),
+    (r'^[0-9a-fA-F]{16,}$', '{hex}'),
+]
+
+
+class NamespaceRule(object):
+
+    def __init__(self, delimiters=':', max_depth=1, pattern_list=None):
+        """
+        :param delimiters: 分隔符,可以有多个字符,每个字符都是分隔符
+        :param max_depth: 最多保留的层数
+        :param pattern_list: [(正则, 占位符)],段名匹配正则时归并为占位符
+        """
+        self.delimiters = delimiters
+        self.joiner = delimiters[0]  # 拼接各层时使用的分隔符
+        self.max_depth = max(1, int(max_depth))
+        self.pattern_list = [(re.compile(pattern), placeholder) for pattern, placeholder in pattern_list or []]
+        if len(delimiters) == 1:
+            self._split = lambda key_name: key_name.split(delimiters, self.max_depth)
+        else:
+            split_pattern = re.compile('[{}]'.format(re.escape(delimiters)))
+            self._split = lambda key_name: split_pattern.split(key_name, self.max_depth)
+        self._segment_cache = dict()  # {段名:归并后的段名},重复出现的段名不需要再次匹配正则
+
+    @property
+    def is_simple(self):
+        """
+        :return: 规则是否与transform_key_name_to_simple完全一致(只取第一个":"之前的部分)
+        """
+        return self.delimiters == ':' and self.max_depth == 1 and not self.pattern_list
+
+    def transform_segment(self, segment):
+        """
+        :param segment: 一层的段名
+        :return: 归并后的段名
+        """
+        simple_segment = self._segment_cache.get(segment)
+        if simple_segment is not None:
+            return simple_segment
+        simple_segment = segment
+        for pattern, placeholder in self.pattern_list:
+            if pattern.match(segment):
+                simple_segment = placeholder
+                break
+        if len(self._segment_cache) >= MAX_SEGMENT_CACHE:
+            self._segment_cache.clear()
+        self._segment_cache[segment] = simple_segment
+        return simple_segment
+
+    def transform(self, key_name):
+        """
+        :param key_name: key名
+        :return: 统计路径 (第一层, 第二层, ...),最多max_depth层
+        """
+        segment_list = self._split(key_name)[:self.max_depth]
+        if not self.pattern_list:
+            return tuple(segment_list)
+        return tuple(self.transform_segment(segment) for segment in segment_list)
+
+    def transform_to_name(self, key_name):
+        """
+        :param key_name: key名
+        :return: 统计命名,各层用第一个分隔符拼接
+        """
+        if self.max_depth == 1 and not self.pattern_list:
+            return self._split(key_name)[0]
+        return self.joiner.join(self.transform(key_name))
+
+    def split_name(self, simple_key_name):
+        """
+        :param simple_key_name: transform_to_name返回的统计命名
+        :return: 统计路径
+        """
+        return tuple(simple_key_name.split(self.joiner))
+
+
+def load_namespace_rule(path=NAMESPACE_FILE):
+    """
+    从配置文件读取命名空间规则,文件不存在时使用与transform_key_name_to_simple一致的默认规则
+    配置文件格式: {"delimiters": ":", "max_depth": 3, "patterns": [["^\\\\d+$", "{id}"]]}
+    patterns不填写时使用DEFAULT_PATTERN_LIST
+    :param path: 配置文件路径
+    :return: NamespaceRule
+    """
+    if not os.path.exists(path):
+        return NamespaceRule()
+    with open(path, 'r') as f:
+        config = json.load(f)
+    return NamespaceRule(config.get('delimiters', ':'), config.get('max_depth', 1),
+                         config.get('patterns', DEFAULT_PATTERN_LIST))
+
+
+class PrefixNode(object):
+    __slots__ = ('name', 'number', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.number = 0  # 该前缀下所有key的数量
+        self.children = dict()  # {下一层段名:PrefixNode}
+
+
+class PrefixTrie(object):
+    """
+    多层命名空间的前缀树,每个节点记录该前缀下key的数量
+    """
+
+    def __init__(self):
+        self.root = PrefixNode('')
+
+    @classmethod
+    def from_number_dict(cls, key_number_dict, namespace_rule):
+        """
+        :param key_number_dict: {统计命名:number}
+        :param namespace_rule: 生成统计命名的NamespaceRule
+        :return: PrefixTrie
+        """
+        trie = cls()
+        for simple_key_name, number in key_number_dict.items():
+            trie.add(namespace_rule.split_name(simple_key_name), number)
+        return trie
+
+    def add(self, path, number=1):
+        """
+        :param path: 统计路径
+        :param number: 数量
+        :return:
+        """
+        node = self.root
+        node.number += number
+        for segment in path:
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = PrefixNode(segment)
+            child.number += number
+            node = child
+
+    def find(self, path):
+        """
+        :param path: 统计路径
+        :return: 对应的节点,不存在返回None
+        """
+        node = self.root
+        for segment in path:
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def children(self, path=()):
+        """
+        展开某一层
+        :param path: 统计路径,空tuple代表第一层
+        :return: [(段名, 数量, 是否还有下一层)],按数量从大到小排列
+        """
+        node = self.find(path)
+        if node is None:
+            return []
+        return sorted(((child.name, child.number, bool(child.children)) for child in node.children.values()),
+                      key=lambda item: item[1], reverse=True)
@@ -0,0 +1,259 @@
+"""
+说明：此脚本用于订阅keyspace通知,根据key的新增和删除实时更新各db的key数量分布,不需要重新遍历所有key
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import threading
+
+import redis
+from redis import RedisError, ResponseError
+
+from connection_manager import connection_manager
+from redis_operation import RedisOperation, transform_key_name_to_simple
+from sample_census import SAMPLE_BATCH, estimate_interval
+
+
+# 订阅的事件及其对key数量的影响.new事件需要redis 7.2及以上,低版本无法感知新增的key,由定期校准修正
+EVENT_DELTA_DICT = {'new': 1, 'del': -1, 'expired': -1, 'evicted': -1, 'rename_from': -1, 'rename_to': 1}
+# notify-keyspace-events需要包含的标志:E keyevent通知, g DEL/RENAME等通用命令, x 过期, e 淘汰, n 新增key
+NOTIFY_FLAG_LIST = ['E', 'g', 'x', 'e', 'n']
+CHANNEL_PREFIX = '__keyevent@'
+DRIFT_RATIO = 0.001  # 校准时DBSIZE与统计数量的偏差超过该比例则抽样修正该db
+RECONCILE_SAMPLE_KEYS = 20000  # 校准时每个db最多抽样的key数量
+STOP_TIMEOUT = 3  # 退出程序时等待监听线程恢复通知配置的最长秒数
+
+_notify_lock = threading.Lock()
+# 修改过notify-keyspace-events的server {(host, port):[使用中的监听器数量, 原来的值, 开启时设置的值, 是否完整]},
+# 开关实时统计时新旧监听器可能短暂并存,最后一个监听器结束时才恢复
+_notify_dict = dict()
+
+
+class LiveCensus(object):
+
+    def __init__(self, redis_host, redis_port, password=None, namespace_rule=None):
+        """
+        :param redis_host: ip
+        :param redis_port: 端口
+        :param password: 密码
+        :param namespace_rule: key_namespace.NamespaceRule,为None时使用transform_key_name_to_simple
+        """
+        self._pool = connection_manager.get_server_pool(redis_host, redis_port, password)  # 校准时SELECT到各db
+        # CONFIG和订阅不切换db,使用会自动重连的db 0连接池
+        self._notify_pool = connection_manager.get_pool(redis_host, redis_port, 0, password)
+        self.namespace_rule = namespace_rule
+        self._transform = namespace_rule.transform_to_name if namespace_rule else transform_key_name_to_simple
+        self._lock = threading.Lock()
+        self._delta_dict = dict()  # 尚未被界面取走的变化量 {db:{key:delta}}
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._holds_notifications = False  # 是否修改了notify-keyspace-events且尚未恢复
+        self.error = None  # 监听线程退出时的异常信息
+
+    def enable_notifications(self):
+        """
+        在redis的notify-keyspace-events中补齐需要的标志,没有CONFIG权限时保持原样.
+        修改前的值在监听结束时恢复,见restore_notifications
+        :return: 是否已开启所需的全部通知
+        """
+        db = redis.StrictRedis(connection_pool=self._notify_pool)
+        with _notify_lock:
+            notify = _notify_dict.get(self.server)
+            if notify is not None:  # 其他监听器已经修改过
+                notify[0] += 1
+                self._holds_notifications = True
+                return notify[3]
+            try:
+                flags = db.config_get('notify-keyspace-events').get('notify-keyspace-events', '')
+                missing_flags = ''.join(flag for flag in NOTIFY_FLAG_LIST if flag not in flags and
+                                        not (flag in 'gxe' and 'A' in flags))
+                if not missing_flags:
+                    return True
+                try:
+                    db.config_set('notify-keyspace-events', flags + missing_flags)
+                    complete = True
+                except ResponseError:  # 低版本不支持n标志
+                    db.config_set('notify-keyspace-events', flags + missing_flags.replace('n', ''))
+                    complete = False
+                enabled_flags = db.config_get('notify-keyspace-events').get('notify-keyspace-events', '')
+            except ResponseError:
+                return False
+            _notify_dict[self.server] = [1, flags, enabled_flags, complete]
+            self._holds_notifications = True
+            return complete
+
+    def restore_notifications(self):
+        """
+        最后一个监听器结束时恢复enable_notifications修改前的notify-keyspace-events.期间被其他客户端改过时不覆盖
+        :return:
+        """
+        if not self._holds_notifications:
+            return
+        self._holds_notifications = False
+        with _notify_lock:
+            notify = _notify_dict[self.server]
+            notify[0] -= 1
+            if notify[0] > 0:
+                return
+            del _notify_dict[self.server]
+            db = redis.StrictRedis(connection_pool=self._notify_pool)
+            try:
+                if db.config_get('notify-keyspace-events').get('notify-keyspace-events', '') == notify[2]:
+                    db.config_set('notify-keyspace-events', notify[1])
+            except RedisError:
+                pass
+
+    @property
+    def server(self):
+        kwargs = self._notify_pool.connection_kwargs
+        return kwargs.get('host'), kwargs.get('port')
+
+    def start(self):
+        """
+        启动后台监听线程
+        :return:
+        """
+        self._stop_event.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self.listen, name='live-census', daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=False):
+        """
+        停止监听,监听线程退出时恢复notify-keyspace-events
+        :param wait: 是否等待监听线程退出,退出程序时使用
+        :return:
+        """
+        self._stop_event.set()
+        if wait and self._thread is not None:
+            self._thread.join(STOP_TIMEOUT)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def listen(self):
+        """
+        后台线程:订阅所有db的keyevent通知,按db和统计命名累计变化量
+        :return:
+        """
+        pubsub = redis.StrictRedis(connection_pool=self._notify_pool).pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.psubscribe(*[CHANNEL_PREFIX + '*__:' + event for event in EVENT_DELTA_DICT])
+            while not self._stop_event.is_set():
+                message = pubsub.get_message(timeout=1.0)
+                if message and message['type'] == 'pmessage':
+                    self.handle_message(message['channel'].decode('utf-8', 'replace'),
+                                        message['data'].decode('utf-8', 'replace'))
+        except Exception as e:  # 任何异常都记录下来,由界面提示监听已停止
+            self.error = str(e) or type(e).__name__
+        finally:
+            pubsub.close()
+            self.restore_notifications()
+
+    def handle_message(self, channel, key_name):
+        """
+        :param channel: 例如 __keyevent@0__:del
+        :param key_name: 发生事件的key
+        :return:
+        """
+        db, event = channel[len(CHANNEL_PREFIX):].split('__:', 1)
+        delta = EVENT_DELTA_DICT.get(event)
+        if not delta:
+            return
+        simple_key_name = self._transform(key_name)
+        with self._lock:
+            key_delta_dict = self._delta_dict.setdefault(db, dict())
+            key_delta_dict[simple_key_name] = key_delta_dict.get(simple_key_name, 0) + delta
+
+    def drain(self):
+        """
+        取走累计的变化量,由界面定时调用,把一段时间内的事件合并为一次刷新
+        :return: {db:{key:delta}}
+        """
+        with self._lock:
+            delta_dict, self._delta_dict = self._delta_dict, dict()
+        return delta_dict
+
+    def reconcile(self, all_db_keys_number_dict):
+        """
+        定期校准:对比各db的DBSIZE和当前统计的数量,偏差过大的db用SCAN抽样修正,不重新遍历整个db.
+        低于redis 7.2时没有new事件,新增的key只能靠这里修正
+        :param all_db_keys_number_dict: 当前统计的结果 {db:{key:number}}
+        :return: 修正后的db {db:{key:number}}
+        """
+        corrected_dict = dict()
+        for db, key_number_dict in all_db_keys_number_dict.items():
+            con = RedisOperation(int(db), None, None, connection_pool=self._pool)
+            try:
+                dbsize = con.dbsize()
+                if abs(dbsize - sum(key_number_dict.values())) > max(1, dbsize * DRIFT_RATIO):
+                    corrected_dict[db] = self.correct_db(con, key_number_dict, dbsize)
+            finally:
+                con.close()
+        return corrected_dict
+
+    def correct_db(self, con, key_number_dict, dbsize):
+        """
+        抽样最多RECONCILE_SAMPLE_KEYS个key,按DBSIZE外推各前缀的数量.
+        只修正与样本矛盾(不在置信区间内)的前缀,其余保留实时统计的精确数量
+        :param con: 该db的RedisOperation实例
+        :param key_number_dict: 当前统计的{key:number}
+        :param dbsize: DBSIZE
+        :return: 修正后的{key:number}
+        """
+        sample_dict = dict()
+        sample_number = 0
+        exact = dbsize == 0
+        for scan_cursor, key_list in con.scan_keys_batches(count=SAMPLE_BATCH):
+            for key_name in key_list:
+                simple_key_name = self._transform(key_name.decode('utf-8', 'replace'))
+                sample_dict[simple_key_name] = sample_dict.get(simple_key_name, 0) + 1
+            sample_number += len(key_list)
+            if scan_cursor == 0:
+                exact = True  # db很小,已遍历完,样本即为总体
+                break
+            if sample_number >= RECONCILE_SAMPLE_KEYS:
+                break
+        if exact:
+            return sample_dict
+        corrected_dict = dict()
+        for simple_key_name, number in sample_dict.items():
+            estimate, low, high = estimate_interval(number, sample_number, dbsize)
+            current = key_number_dict.get(simple_key_name, 0)
+            corrected_dict[simple_key_name] = current if low <= current <= high else estimate
+        unseen_high = estimate_interval(0, sample_number, dbsize)[2]  # 没有被抽到的前缀的数量上限
+        for simple_key_name, number in key_number_dict.items():
+            if simple_key_name not in corrected_dict and number <= unseen_high:
+                corrected_dict[simple_key_name] = number  # 数量太少而没有被抽到,超过上限的视为已被删除
+        return corrected_dict
+
+
+def merge_delta(pending_delta_dict, delta_dict):
+    """
+    把一批变化量累加到尚未应用的变化量中
+    :param pending_delta_dict: {db:{key:delta}}
+    :param delta_dict: {db:{key:delta}}
+    :return:
+    """
+    for db, key_delta_dict in delta_dict.items():
+        pending_key_delta_dict = pending_delta_dict.setdefault(db, dict())
+        for simple_key_name, delta in key_delta_dict.items():
+            pending_key_delta_dict[simple_key_name] = pending_key_delta_dict.get(simple_key_name, 0) + delta
+
+
+def apply_delta(all_db_keys_number_dict, delta_dict):
+    """
+    把keyspace通知的变化量合并到统计结果中,数量不大于0的统计命名被移除
+    :param all_db_keys_number_dict: {db:{key:number}}
+    :param delta_dict: {db:{key:delta}}
+    :return:
+    """
+    for db, key_delta_dict in delta_dict.items():
+        key_number_dict = all_db_keys_number_dict.setdefault(db, dict())
+        for simple_key_name, delta in key_delta_dict.items():
+            number = key_number_dict.get(simple_key_name, 0) + delta
+            if number > 0:
+                key_number_dict[simple_key_name] = number
+            else:
+                key_number_dict.pop(simple_key_name, None)
@@ -1,392 +1,1418 @@
-#!/usr/bin/env python
-"""
-说明：此脚本用于启动和控制redis的GUI界面
-作者：huangjunhao
-日期：2021-05-24
-"""
-import sys
-import json
-import re
-from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox
-from PyQt5.QtGui import QStandardItemModel, QStandardItem
-from connection import Ui_Connection
-from window import Ui_RedisDesktop
-from redis_operation import test_connection, RedisOperation, transform_key_name_to_simple
-
-
-SHOW_ROW_NUMBER = 100
-
-
-def up_window_im_by_bool(instance, status, true_title, true_im, false_title, false_im):
-    """
-    :param instance: 窗口类的实例
-    :param status: 状态
-    :param true_title: 状态为真的弹窗标题
-    :param true_im: 状态为真的弹窗信息
-    :param false_title: 状态为假的弹窗标题
-    :param false_im: 状态为假的弹窗信息
-    :return:
-    """
-    if status:
-        QMessageBox.information(instance, true_title, true_im, QMessageBox.Yes)
-    else:
-        QMessageBox.information(instance, false_title, false_im, QMessageBox.Yes)
-
-
-def up_window_question_by_bool(instance, title, im):
-    """
-    :param instance: 窗口类的实例
-    :param title: 弹窗标题
-    :param im: 弹窗信息
-    :return: 是否点击了确认键
-    """
-    reply = QMessageBox.question(instance, title, im, QMessageBox.Yes | QMessageBox.No)
-    return reply == QMessageBox.Yes
-
-
-class ChildWindow(QMainWindow, Ui_Connection):
-    def __init__(self, parent_instance):
-        """
-        窗口初始化,按钮和方法之间的绑定
-        :param parent_instance: 窗口父类的实例
-        """
-        super(ChildWindow, self).__init__()
-        self.setupUi(self)
-        self.parent_instance = parent_instance
-        self.test_connection_button.clicked.connect(self.detect_button)
-        self.save_button.clicked.connect(self.detect_button)
-
-    @staticmethod
-    def save_connection(name, ip, port, auth):
-        """
-        存储redis的连接信息至redis.txt
-        :param name: 连接名
-        :param ip: 连接ip
-        :param port: 连接端口
-        :param auth: 连接密码
-        :return:
-        """
-        with open("redis.txt", "a") as f:
-            f.write(json.dumps({"name": name, "ip": ip, "port": port, "auth": auth}) + '\n')
-
-    def detect_button(self):
-        """
-        监测哪个button被点击,然后执行对应的函数
-        :return:
-        """
-        sender = self.sender()
-        if sender.text() == "Test Connection":
-            if self.host_input.text() == "" or self.port_input.text() == "":
-                up_window_im_by_bool(self, False, "", "", "Invalid settings", "Invalid settings detected")
-            else:
-                connect_status = test_connection(self.host_input.text(), self.port_input.text(), self.auth_input.text())
-                up_window_im_by_bool(self, connect_status, "Successful connection", "Successful connection to redis",
-                                     "Can't connect to redis-server", "Can't connect to redis-server")
-        elif sender.text() == "OK":
-            if self.host_input.text() == "" or self.port_input.text() == "":
-                up_window_im_by_bool(self, False, "", "", "Invalid settings", "Invalid settings detected")
-            else:
-                self.save_connection(self.name_input.text(), self.host_input.text(), self.port_input.text(),
-                                     self.auth_input.text())
-                redis_name_list, self.parent_instance.redis_im_dict = self.parent_instance.get_redis_im()
-                self.parent_instance.connection_name.clear()
-                self.parent_instance.connection_name.addItems(redis_name_list)  # 更新所有im连接信息
-                self.close()
-
-
-class ParentWindow(QMainWindow, Ui_RedisDesktop):
-    def __init__(self):
-        super(ParentWindow, self).__init__()
-        self.setupUi(self)
-        self.model = object()
-        self.con = object()  # 当前redis连接实例
-        self.cur_db = '0'  # 当前的db
-        self.cur_key_deleted_number = 0  # 当前key被删除的数据行数(一定小于等于常量SHOW_ROW_NUMBER)
-        self.cur_key_length = 0   # 当前key的数据长度
-        self.key_name = None  # 当前key_name
-        self.key_type = None  # 当前key_type
-        self.all_db_keys_list = list()  # 所有db及其key的数量
-        self.all_db_keys_number_dict = dict()  # 所有db及其的key所有种类及数量 {0:{key:number}}
-        # 所有db下的五种数据结构key的数量 {0:{"string":0,"list":0,"hash":0,"set":0,"zset":0}}
-        redis_name_list, self.redis_im_dict = self.get_redis_im()
-        self.connection_name.addItems(redis_name_list)  # 加入所有im连接信息
-        self.select_connection_button.clicked.connect(self.select_all_db_keys_number)  # 统计当前连接方式下所有db的key的数量
-        self.select_db_button.clicked.connect(self.current_db_show_all_keys_number)  # 统计当前db的不同key种类的数量
-        self.select_button.clicked.connect(self.show_data)  # 展示当前key下的常量条数据
-        self.show_data_dict = dict()  # 临时保存数据字典,为了保存操作进行准备 {row:dict()/str()}
-        self.save_value_button.clicked.connect(self.edit_save_data)  # 编辑然后存储当前数据
-        self.delete_row_button.clicked.connect(self.delete_row)  # 删除当前数据
-        self.delete_key_button.clicked.connect(self.delete_key)  # 删除当前key
-
-    @staticmethod
-    def get_redis_im():
-        redis_name_list = []
-        redis_im_dict = {}
-        with open('redis.txt', 'r') as f:
-            a = f.readlines()
-            for i in a:
-                temp_dict = json.loads(i.strip())
-                redis_name_list.append(temp_dict['name'])
-                redis_im_dict[temp_dict['name']] = {'ip': temp_dict['ip'], 'port': temp_dict['port'],
-                                                    'auth': temp_dict['auth']}
-        return redis_name_list, redis_im_dict
-
-    #  获取当前连接方式下的redis,所有db的key数量
-    def select_all_db_keys_number(self):
-        self.all_db_keys_list.clear()
-        for i in range(0, 16):
-            con = RedisOperation(redis_db=i, redis_host=self.redis_im_dict[self.connection_name.currentText()]['ip'],
-                                 redis_port=self.redis_im_dict[self.connection_name.currentText()]['port'],
-                                 password=self.redis_im_dict[self.connection_name.currentText()]['auth'])
-            key_number_dict = con.scan_all_keys()
-            self.all_db_keys_number_dict[str(i)] = key_number_dict
-            db_key_number = sum(key_number_dict.values())
-            self.all_db_keys_list.append('db{} ({})'.format(i, db_key_number))
-        self.connection_db.clear()
-        self.connection_db.addItems(self.all_db_keys_list)
-
-    #  发生了key删除或者row删除后key消失的情况后,更新db的key数量
-    def cur_db_keys_number_reduce(self):
-        self.all_db_keys_list.clear()
-        self.all_db_keys_number_dict[self.cur_db][transform_key_name_to_simple(self.key_name)] -= 1
-        if self.all_db_keys_number_dict[self.cur_db][transform_key_name_to_simple(self.key_name)] == 0:
-            self.all_db_keys_number_dict[self.cur_db].pop(transform_key_name_to_simple(self.key_name))
-        for i in range(0, 16):
-            db_key_number = sum(self.all_db_keys_number_dict[str(i)].values())
-            self.all_db_keys_list.append('db{} ({})'.format(i, db_key_number))
-        self.connection_db.clear()
-        self.connection_db.addItems(self.all_db_keys_list)
-
-    #  统计当前db各类的key数量
-    def current_db_show_all_keys_number(self):
-        column_list = ['key','value']
-        self.cur_db = re.findall("db(\\d+) ", self.connection_db.currentText())[0]
-        key_number_dict = self.all_db_keys_number_dict[self.cur_db]
-        row_number = len(key_number_dict)
-        self.create_model(row_number, *column_list)
-        cur_row = 0
-        for key, number in key_number_dict.items():
-            self.model.setItem(cur_row, 0, QStandardItem(str(key)))
-            self.model.setItem(cur_row, 1, QStandardItem(str(number)))
-            cur_row += 1
-        self.tableView.setModel(self.model)
-        self.key_type_view.setText('key统计')
-        # 水平方向标签拓展剩下的窗口部分，填满表格
-        # self.key_number_view.horizontalHeader().setStretchLastSection(True)
-        # 水平和垂直方向，表格大小拓展到适当的尺寸
-        # self.key_number_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        # self.key_number_view.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
-
-    #  创建一个展示模板
-    def create_model(self, row_number, *args):
-        """
-        :param row_number: 行数量
-        :param args: 字段标题
-        """
-        self.model = QStandardItemModel(row_number, len(args))
-        self.model.setHorizontalHeaderLabels(list(args))
-
-    #  查找redis并展示中该key中的值
-    def show_data(self):
-        self.cur_key_deleted_number = 0  # 将删除数据置为0
-        self.con = RedisOperation(redis_db=self.cur_db,
-                                  redis_host=self.redis_im_dict[self.connection_name.currentText()]['ip'],
-                                  redis_port=self.redis_im_dict[self.connection_name.currentText()]['port'],
-                                  password=self.redis_im_dict[self.connection_name.currentText()]['auth'])
-        self.key_name = self.key_edit.text()
-        print('当前的key:' + self.key_name)
-        self.key_type = self.con.get_type(self.key_name)
-        if not self.key_type:  # key_type为None则代表该key并不存在,抛出警告
-            up_window_im_by_bool(self, False, "", "", "not existed", "key is not existed")
-        self.key_type_view.setText(self.key_type)
-        if self.key_type == "list":
-            column_list = ["value"]
-            self.create_model(SHOW_ROW_NUMBER, *column_list)
-            data_generator = self.con.lrange(self.key_name)
-            self.cur_key_length = self.con.llen(self.key_name)
-            for r_num in range(SHOW_ROW_NUMBER):
-                try:
-                    self.model.setItem(r_num, 0, QStandardItem((data_generator.__next__()).decode()))
-                except StopIteration:
-                    break
-            self.tableView.setModel(self.model)
-        elif self.key_type == "string":
-            row_number = 0
-            column_list = ["value"]
-            self.create_model(row_number, *column_list)
-            self.cur_key_length = 1
-            self.model.setItem(0, 0, QStandardItem(self.con.get(self.key_name)))
-            self.tableView.setModel(self.model)
-        elif self.key_type == "zset":
-            column_list = ["key", "value"]
-            self.create_model(SHOW_ROW_NUMBER, *column_list)
-            data_generator = self.con.zscan_iter(self.key_name)
-            self.cur_key_length = self.con.zcard(self.key_name)
-            for r_num in range(SHOW_ROW_NUMBER):
-                try:
-                    temp_tuple = data_generator.__next__()
-                    self.model.setItem(r_num, 0, QStandardItem(temp_tuple[0].decode()))
-                    self.model.setItem(r_num, 1, QStandardItem(str(temp_tuple[1])))
-                    self.show_data_dict[r_num] = temp_tuple[0].decode()  # 保存{行号:value}
-                except StopIteration:
-                    break
-            self.tableView.setModel(self.model)
-        elif self.key_type == "set":
-            column_list = ["value"]
-            self.create_model(SHOW_ROW_NUMBER, *column_list)
-            data_generator = self.con.sscan_iter(self.key_name)
-            self.cur_key_length = self.con.scard(self.key_name)
-            for r_num in range(SHOW_ROW_NUMBER):
-                try:
-                    temp_data = data_generator.__next__().decode()
-                    self.model.setItem(r_num, 0, QStandardItem(temp_data))
-                    self.show_data_dict[r_num] = temp_data  # 保存{行号:value}
-                except StopIteration:
-                    break
-            self.tableView.setModel(self.model)
-        elif self.key_type == "hash":
-            column_list = ["key", "value"]
-            self.create_model(SHOW_ROW_NUMBER, *column_list)
-            data_generator = self.con.hscan_iter(self.key_name)
-            self.cur_key_length = self.con.hlen(self.key_name)
-            for r_num in range(SHOW_ROW_NUMBER):
-                try:
-                    temp_tuple = data_generator.__next__()
-                    self.model.setItem(r_num, 0, QStandardItem(temp_tuple[0].decode()))
-                    self.model.setItem(r_num, 1, QStandardItem(temp_tuple[1].decode()))
-                    self.show_data_dict[r_num] = temp_tuple[0].decode()  # 保存{行号:value}
-                except StopIteration:
-                    break
-            self.tableView.setModel(self.model)
-        self.key_size_view.setText(str(self.cur_key_length))
-
-    #  删除当前db中的某key
-    def delete_key(self):
-        result = up_window_question_by_bool(self, 'Delete key', 'Do you really want to delete this key?')
-        if result and self.key_name:
-            result = self.con.delete(self.key_name)
-            if result:
-                self.tableView.setModel(None)
-                self.cur_db_keys_number_reduce()
-                self.key_name = None
-
-    #  删除:返回要删除的数据
-    def select_indexs_to_delete(self):
-        if self.tableView.selectionModel():
-            indexs = self.tableView.selectionModel().selection().indexes()
-        else:
-            return
-        values_list = []
-        index_row_list = []
-        if len(indexs) > 0:
-            for index in indexs:
-                index_row_list.append(index.row())
-            index_row_list = list(set(index_row_list))
-            for index in index_row_list:
-                values_list.append(self.model.item(index, column=0).text())
-            return values_list, sorted(index_row_list, reverse=True)
-        else:
-            return None, None
-
-    #  删除当前db中的某key的一行或多行数据
-    def delete_row(self):
-        """
-        删除当前的某行或多行数据
-        :return:
-        """
-        if self.key_type == "string":
-            self.delete_key()
-            self.model.removeRows(0, 1)
-            self.cur_db_keys_number_reduce()
-        elif self.key_type:
-            values_list, index_row_list = self.select_indexs_to_delete()
-            if values_list:
-                result = up_window_question_by_bool(self, 'Delete row', 'Do you really want to delete these rows?')
-                if not result:
-                    return
-                if self.key_type == "hash":
-                    self.con.hdel(self.key_name, *values_list)
-                elif self.key_type == "set":
-                    self.con.srem(self.key_name, *values_list)
-                elif self.key_type == "zset":
-                    self.con.zrem(self.key_name, *values_list)
-                elif self.key_type == "list":
-                    for value in values_list:  # 从队列头至尾,删除第一个碰到的value
-                        self.con.lrem(self.key_name, value)
-                else:
-                    return
-                self.cur_key_deleted_number += len(values_list)
-                #  删除界面上的展示数据
-                for index in index_row_list:
-                    self.model.removeRows(index, 1)
-                self.key_size_view.setText(str(self.cur_key_length-self.cur_key_deleted_number))
-                #  假如被删除的数据量等于key中数据量,则需重新更新db中key的数量
-                if self.cur_key_deleted_number == self.cur_key_length:
-                    self.cur_db_keys_number_reduce()
-                    self.key_name = None
-
-    #  修改:返回要修改的数据
-    def select_indexs_to_save(self, limit_length):
-        if self.tableView.selectionModel():
-            indexs = self.tableView.selectionModel().selection().indexes()
-        else:
-            return
-        values_list = []
-        print(indexs)
-        if 0 < len(indexs) <= 2 and len(indexs) == limit_length:
-            # 必须为同一行的数据 self.key_type == "hash" or self.key_type == "zset"
-            if len(indexs) == 2 and indexs[0].row() == indexs[1].row():
-                values_list.append(indexs[0].row())
-                values_list.append(self.model.item(indexs[0].row(), column=0).text())
-                values_list.append(self.model.item(indexs[0].row(), column=1).text())
-            elif len(indexs) == 1 and self.key_type == "string":
-                values_list.append(self.model.item(indexs[0].row(), column=0).text())
-            elif self.key_type == "list" or self.key_type == "set":
-                values_list.append(indexs[0].row())
-                values_list.append(self.model.item(indexs[0].row(), column=0).text())
-            return values_list
-        else:
-            up_window_im_by_bool(self, False, "", "", "错误", "需要选择单行数据！")
-
-    #  修改并存储数据
-    def edit_save_data(self):
-        """
-        编辑并存储单条数据,由于情况种类太多.目前hash,set,zset仅通过展示时存储的{行数：数据}来进行 删除添加操作
-        :return:
-        """
-        if self.key_type == "string":
-            values_list = self.select_indexs_to_save(1)
-            if values_list:
-                self.con.set(self.key_name, values_list[0])
-        elif self.key_type == "list":
-            values_list = self.select_indexs_to_save(1)
-            if values_list:
-                self.con.lset(self.key_name, values_list[0], values_list[1])
-        elif self.key_type == "hash":
-            values_list = self.select_indexs_to_save(2)
-            if values_list:
-                self.con.hdel(self.key_name, self.show_data_dict[values_list[0]][0])  # 删除
-                self.con.hset(self.key_name, values_list[1], values_list[2])  # 增加
-        elif self.key_type == "set":
-            values_list = self.select_indexs_to_save(1)
-            if values_list:
-                self.con.srem(self.key_name, self.show_data_dict[values_list[0]])  # 删除
-                self.con.sadd(self.key_name, values_list[1])  # 增加
-        elif self.key_type == "zset":
-            values_list = self.select_indexs_to_save(2)
-            if values_list:
-                self.con.zrem(self.key_name, self.show_data_dict[values_list[0]][0])  # 删除
-                self.con.zadd(self.key_name, {values_list[1]:values_list[2]})  # 增加
-        else:
-            return
-        up_window_im_by_bool(self, True, "Save value", "Value was updated", "", "")
-
-
-if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    myWin = ParentWindow()
-    myWin.child_window = ChildWindow(myWin)  # 父窗口关联子窗口
-    myWin.add_connection_button.clicked.connect(myWin.child_window.show)
-    myWin.show()
-    sys.exit(app.exec_())
-
+#!/usr/bin/env python
+"""
+说明：此脚本用于启动和控制redis的GUI界面
+作者：huangjunhao
+日期：2021-05-24
+"""
+import sys
+import re
+import time
+from PyQt5.QtCore import Qt, QTimer, QRect, QStringListModel
+from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox, QProgressBar, QPushButton, QWidget, \
+    QHBoxLayout, QLineEdit, QAbstractItemView, QLabel, QAction, QTreeView, QInputDialog, QFileDialog, QSpinBox, \
+    QCheckBox, QCompleter, QVBoxLayout, QComboBox
+from PyQt5.QtGui import QStandardItemModel, QStandardItem
+from redis import RedisError
+from connection import Ui_Connection
+from window import Ui_RedisDesktop
+from redis_operation import test_connection, RedisOperation, KeyStatsCounter
+from key_census import KeyCensus, key_stats_to_number, key_stats_to_type_number
+from connection_manager import connection_manager
+from connection_store import load_connections, save_connection
+from redis_task import start_task, start_command
+from key_namespace import load_namespace_rule, PrefixTrie
+from live_census import LiveCensus, apply_delta, merge_delta
+from census_cache import CensusCache, connection_key
+from prefix_sketch import PrefixCounter, OTHER_PREFIX
+from sample_census import SampleCensus, SAMPLE_KEYS, SAMPLE_SECONDS, estimate_to_number
+from value_reader import create_page_reader, search_values, find_exact, is_binary, StringChunkReader, ZsetRankReader, \
+    SEARCH_COUNT, MAX_SEARCH_ROWS, SMALL_STRING, SNIFF_BYTES
+from value_model import LazyValueModel, StreamValueModel
+from big_key_dialog import BigKeyDialog
+from key_export import KeyExporter, progress_text
+from key_import import KeyImporter, import_progress_text
+from key_index import KeyIndex, scan_match, COMPLETE_LIMIT
+from key_browser_dialog import KeyBrowserDialog
+from cluster import cluster_masters
+from read_routing import resolve_connection, cached_connection, invalidate
+from scan_throttle import ScanThrottle
+from async_operation import AsyncRedisOperation
+from async_task import start_coroutine, install_event_loop, exec_app
+from instrumentation import recorder
+from stats_dialog import StatsDialog
+
+
+def up_window_im_by_bool(instance, status, true_title, true_im, false_title, false_im):
+    """
+    :param instance: 窗口类的实例
+    :param status: 状态
+    :param true_title: 状态为真的弹窗标题
+    :param true_im: 状态为真的弹窗信息
+    :param false_title: 状态为假的弹窗标题
+    :param false_im: 状态为假的弹窗信息
+    :return:
+    """
+    if status:
+        QMessageBox.information(instance, true_title, true_im, QMessageBox.Yes)
+    else:
+        QMessageBox.information(instance, false_title, false_im, QMessageBox.Yes)
+
+
+def up_window_question_by_bool(instance, title, im):
+    """
+    :param instance: 窗口类的实例
+    :param title: 弹窗标题
+    :param im: 弹窗信息
+    :return: 是否点击了确认键
+    """
+    reply = QMessageBox.question(instance, title, im, QMessageBox.Yes | QMessageBox.No)
+    return reply == QMessageBox.Yes
+
+
+class ChildWindow(QMainWindow, Ui_Connection):
+    def __init__(self, parent_instance):
+        """
+        窗口初始化,按钮和方法之间的绑定
+        :param parent_instance: 窗口父类的实例
+        """
+        super(ChildWindow, self).__init__()
+        self.setupUi(self)
+        self.parent_instance = parent_instance
+        self.test_connection_button.clicked.connect(self.detect_button)
+        self.save_button.clicked.connect(self.detect_button)
+
+    @staticmethod
+    def save_connection(name, ip, port, auth):
+        """
+        存储redis的连接信息至redis.txt
+        :param name: 连接名
+        :param ip: 连接ip
+        :param port: 连接端口
+        :param auth: 连接密码
+        :return:
+        """
+        save_connection(name, ip, port, auth)
+
+    def detect_button(self):
+        """
+        监测哪个button被点击,然后执行对应的函数
+        :return:
+        """
+        sender = self.sender()
+        if sender.text() == "Test Connection":
+            if self.host_input.text() == "" or self.port_input.text() == "":
+                up_window_im_by_bool(self, False, "", "", "Invalid settings", "Invalid settings detected")
+            else:
+                connect_status = test_connection(self.host_input.text(), self.port_input.text(), self.auth_input.text())
+                up_window_im_by_bool(self, connect_status, "Successful connection", "Successful connection to redis",
+                                     "Can't connect to redis-server", "Can't connect to redis-server")
+        elif sender.text() == "OK":
+            if self.host_input.text() == "" or self.port_input.text() == "":
+                up_window_im_by_bool(self, False, "", "", "Invalid settings", "Invalid settings detected")
+            else:
+                self.save_connection(self.name_input.text(), self.host_input.text(), self.port_input.text(),
+                                     self.auth_input.text())
+                redis_name_list, self.parent_instance.redis_im_dict = self.parent_instance.get_redis_im()
+                self.parent_instance.cluster_node_dict.clear()  # 连接信息可能被修改,重新识别是否为集群
+                self.parent_instance.cluster_detect_dict.clear()
+                self.parent_instance.connection_name.clear()
+                self.parent_instance.connection_name.addItems(redis_name_list)  # 更新所有im连接信息
+                self.close()
+
+
+class ParentWindow(QMainWindow, Ui_RedisDesktop):
+    def __init__(self):
+        super(ParentWindow, self).__init__()
+        self.setupUi(self)
+        self.model = object()
+        self.con = object()  # 当前redis连接实例
+        self.cur_db = '0'  # 当前的db
+        self.cur_key_length = 0   # 当前key的数据长度
+        self.key_name = None  # 当前key_name
+        self.key_type = None  # 当前key_type
+        self.all_db_keys_list = list()  # 所有db及其key的数量
+        self.all_db_keys_number_dict = dict()  # 所有db及其的key所有种类及数量 {0:{key:number}}
+        # 所有db下的五种数据结构key的数量 {0:{"string":0,"list":0,"hash":0,"set":0,"zset":0}}
+        self.all_db_type_number_dict = dict()
+        # 详细统计时所有db下各key种类的类型分布,元素数量和内存 {0:{key:统计结果}},见RedisOperation.scan_key_stats
+        self.all_db_keys_stats_dict = dict()
+        self.cluster_node_dict = dict()  # 集群连接的所有master {连接名:[(host, port)]},单节点为空列表
+        self.cluster_detect_dict = dict()  # 正在识别是否为集群的连接 {连接名:[识别完成后的回调]}
+        self.routing_task = None  # 正在后台选择主从的任务,见current_connection
+        redis_name_list, self.redis_im_dict = self.get_redis_im()
+        self.connection_name.addItems(redis_name_list)  # 加入所有im连接信息
+        self.select_connection_button.clicked.connect(self.select_all_db_keys_number)  # 统计当前连接方式下所有db的key的数量
+        self.select_db_button.clicked.connect(self.current_db_show_all_keys_number)  # 统计当前db的不同key种类的数量
+        self.select_button.clicked.connect(self.show_data)  # 展示当前key下的数据,滚动时按页加载
+        self.save_value_button.clicked.connect(self.edit_save_data)  # 编辑然后存储当前数据
+        self.delete_row_button.clicked.connect(self.delete_row)  # 删除当前数据
+        self.delete_key_button.clicked.connect(self.delete_key)  # 删除当前key
+        self.census_task = None  # 正在后台执行的统计任务
+        self.census_dirty = False  # 统计结果有更新但尚未刷新到界面
+        self.census_stale_db_set = set()  # 计数器有更新但尚未写入all_db_keys_number_dict的db
+        self.db_progress_dict = dict()  # 统计任务中各db的扫描进度 {db:0-1}
+        self.census_refresh_timer = QTimer(self)  # 统计过程中定时刷新界面
+        self.census_refresh_timer.setInterval(300)
+        self.census_refresh_timer.timeout.connect(self.refresh_census_view)
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.hide()
+        self.cancel_button = QPushButton('Cancel', self)
+        self.cancel_button.hide()
+        self.cancel_button.clicked.connect(self.cancel_census)  # 取消正在执行的统计
+        self.statusbar.addPermanentWidget(self.progress_bar)
+        self.statusbar.addPermanentWidget(self.cancel_button)
+        self.pool_stats_label = QLabel(self)
+        self.statusbar.addPermanentWidget(self.pool_stats_label)
+        self.pool_stats_timer = QTimer(self)  # 定时回收空闲连接池并刷新连接数
+        self.pool_stats_timer.timeout.connect(self.refresh_pool_stats)
+        self.pool_stats_timer.start(5000)
+        # 统计方式菜单
+        self.census_menu = self.menubar.addMenu('Census')
+        self.server_side_action = QAction('Count prefixes on server (Lua)', self, checkable=True)
+        self.census_menu.addAction(self.server_side_action)
+        self.detail_action = QAction('Type / size / memory per prefix', self, checkable=True)
+        self.census_menu.addAction(self.detail_action)
+        self.reload_namespace_action = QAction('Reload namespace rules', self)
+        self.reload_namespace_action.triggered.connect(self.reload_namespace_rule)  # 重新读取namespace.json
+        self.census_menu.addAction(self.reload_namespace_action)
+        self.live_action = QAction('Live mode (keyspace notifications)', self, checkable=True)
+        self.live_action.toggled.connect(self.toggle_live_census)  # 订阅keyspace通知实时更新统计结果
+        self.census_menu.addAction(self.live_action)
+        self.live_census = None  # 实时统计的监听器
+        self.live_pending_delta_dict = dict()  # 全量统计进行中收到的变化量,统计结束后再应用 {db:{key:delta}}
+        self.live_apply_timer = QTimer(self)  # 定时合并一批keyspace通知,避免每个事件都刷新界面
+        self.live_apply_timer.setInterval(1000)
+        self.live_apply_timer.timeout.connect(self.apply_live_delta)
+        self.live_reconcile_timer = QTimer(self)  # 定时校准实时统计的结果
+        self.live_reconcile_timer.setInterval(60000)
+        self.live_reconcile_timer.timeout.connect(self.reconcile_live_census)
+        self.namespace_rule = load_namespace_rule()  # key名归并为统计命名的规则
+        self.prefix_trie = None  # 多层命名空间时当前db的前缀树
+        # 多层命名空间的统计结果用树展示,逐层展开,与tableView位置相同
+        self.prefix_tree_view = QTreeView(self.centralwidget)
+        self.prefix_tree_view.setGeometry(self.tableView.geometry())
+        self.prefix_tree_view.hide()
+        self.prefix_tree_view.expanded.connect(self.expand_prefix_node)
+        self.census_cache = CensusCache()  # 本地保存的统计结果
+        self.census_connection_key = None  # 正在统计的连接标识
+        self.cached_connection_key = None  # 界面正在展示缓存结果的连接标识
+        self.census_key_number_dict = dict()
+        self.growth_action = QAction('Prefix growth since previous census', self)
+        self.growth_action.triggered.connect(self.show_prefix_growth)  # 对比当前db最近两次统计结果
+        self.census_menu.addAction(self.growth_action)
+        self.census_menu.addSeparator()
+        self.sample_action = QAction('Approximate census (sampling)', self)
+        self.sample_action.triggered.connect(self.select_all_db_keys_estimate)  # 抽样估算所有db的key数量分布
+        self.census_menu.addAction(self.sample_action)
+        self.random_key_action = QAction('Sample with RANDOMKEY instead of SCAN slices', self, checkable=True)
+        self.census_menu.addAction(self.random_key_action)
+        self.refine_action = QAction('Keep refining until cancelled', self, checkable=True)
+        self.census_menu.addAction(self.refine_action)
+        self.census_menu.addSeparator()
+        self.index_action = QAction('Build key index during census', self, checkable=True)
+        self.census_menu.addAction(self.index_action)
+        self.key_index = KeyIndex()  # 统计时顺便建立的key名索引,用于自动补全和key浏览
+        self.key_index_connection_key = None  # key索引所属的连接标识
+        self.census_menu.addSeparator()
+        self.scan_budget_action = QAction('Scan impact budget...', self)
+        self.scan_budget_action.triggered.connect(self.set_scan_budget)  # 限制统计,大key查找和导出对redis的影响
+        self.census_menu.addAction(self.scan_budget_action)
+        self.scan_budget = (0, 0)  # (每次SCAN的耗时上限毫秒, 每秒命令数上限),0代表不限制
+        self.census_throttle = None  # 正在执行的统计任务的ScanThrottle
+        self.async_action = QAction('Async engine (census and INFO polling on asyncio)', self, checkable=True)
+        self.census_menu.addAction(self.async_action)
+        self.server_info_task = None  # 正在执行的INFO轮询
+        self.server_info_text = ''  # 最近一次INFO轮询的结果
+        # 抽样统计时所有db的估算结果 {0:{key:(估计值, 下限, 上限)}},见SampleCensus
+        self.all_db_estimate_dict = dict()
+        self.connection_name.currentTextChanged.connect(lambda _: self.load_cached_census())
+        # 表格下方的数据浏览工具栏
+        self.value_toolbar = QWidget(self.centralwidget)
+        self.value_toolbar.setGeometry(QRect(330, 523, 541, 26))
+        self.value_toolbar_layout = QHBoxLayout(self.value_toolbar)
+        self.value_toolbar_layout.setContentsMargins(0, 0, 0, 0)
+        self.index_edit = QLineEdit(self.value_toolbar)
+        self.index_edit.setPlaceholderText('index / member')
+        self.index_edit.setToolTip('list index (-1 = tail), or zset rank / member when sorted by score')
+        self.index_edit.setMaximumWidth(90)
+        self.index_edit.returnPressed.connect(self.go_to_index)
+        self.go_to_index_button = QPushButton('Go', self.value_toolbar)
+        self.go_to_index_button.setMaximumWidth(40)
+        self.go_to_index_button.clicked.connect(self.go_to_index)  # 跳转到list的某个下标或zset的某个排名
+        self.filter_edit = QLineEdit(self.value_toolbar)
+        self.filter_edit.setPlaceholderText('MATCH pattern, e.g. user*')
+        self.filter_edit.returnPressed.connect(self.search_values)
+        self.count_spin = QSpinBox(self.value_toolbar)  # 每次HSCAN/SSCAN/ZSCAN的COUNT
+        self.count_spin.setRange(10, 100000)
+        self.count_spin.setValue(SEARCH_COUNT)
+        self.count_spin.setToolTip('COUNT per scan')
+        self.exact_check = QCheckBox('exact', self.value_toolbar)
+        self.exact_check.setToolTip('look up one field / member directly (HGET / SISMEMBER / ZSCORE)')
+        self.search_button = QPushButton('Filter', self.value_toolbar)
+        self.search_button.setMaximumWidth(50)
+        self.search_button.clicked.connect(self.search_values)  # 在redis中过滤hash/set/zset
+        self.stop_search_button = QPushButton('Stop', self.value_toolbar)
+        self.stop_search_button.setMaximumWidth(45)
+        self.stop_search_button.setEnabled(False)
+        self.stop_search_button.clicked.connect(lambda: self.search_task and self.search_task.cancel())
+        self.search_task = None  # 正在后台执行的过滤任务
+        self.value_toolbar_layout.addWidget(self.index_edit)
+        self.value_toolbar_layout.addWidget(self.go_to_index_button)
+        self.value_toolbar_layout.addWidget(self.filter_edit)
+        self.value_toolbar_layout.addWidget(self.count_spin)
+        self.value_toolbar_layout.addWidget(self.exact_check)
+        self.value_toolbar_layout.addWidget(self.search_button)
+        self.value_toolbar_layout.addWidget(self.stop_search_button)
+        # 按钮下方的zset排序面板:按排名或分数范围分页读取
+        self.zset_panel = QWidget(self.centralwidget)
+        self.zset_panel.setGeometry(QRect(891, 360, 101, 130))
+        self.zset_panel_layout = QVBoxLayout(self.zset_panel)
+        self.zset_panel_layout.setContentsMargins(0, 0, 0, 0)
+        self.zset_order_combo = QComboBox(self.zset_panel)
+        self.zset_order_combo.addItem('scan order', None)
+        self.zset_order_combo.addItem('score asc', 'asc')
+        self.zset_order_combo.addItem('score desc', 'desc')
+        self.zset_order_combo.setToolTip('zset order: ZSCAN order, or ZRANGE by rank')
+        self.min_score_edit = QLineEdit(self.zset_panel)
+        self.min_score_edit.setPlaceholderText('min score')
+        self.max_score_edit = QLineEdit(self.zset_panel)
+        self.max_score_edit.setPlaceholderText('max score')
+        self.zset_apply_button = QPushButton('Apply', self.zset_panel)
+        self.zset_apply_button.clicked.connect(self.apply_zset_view)  # 按选择的顺序和分数范围重新读取zset
+        self.zset_panel_layout.addWidget(self.zset_order_combo)
+        self.zset_panel_layout.addWidget(self.min_score_edit)
+        self.zset_panel_layout.addWidget(self.max_score_edit)
+        self.zset_panel_layout.addWidget(self.zset_apply_button)
+        # 工具菜单
+        self.tools_menu = self.menubar.addMenu('Tools')
+        self.big_key_action = QAction('Find big keys (current db)', self)
+        self.big_key_action.triggered.connect(self.find_big_keys)  # 找出当前db各类型和各前缀中最大的key
+        self.tools_menu.addAction(self.big_key_action)
+        self.export_key_action = QAction('Export current key...', self)
+        self.export_key_action.triggered.connect(lambda: self.export_keys(current_key=True))
+        self.tools_menu.addAction(self.export_key_action)
+        self.export_db_action = QAction('Export keys (current db)...', self)
+        self.export_db_action.triggered.connect(lambda: self.export_keys(current_key=False))  # 按前缀或整个db导出
+        self.tools_menu.addAction(self.export_db_action)
+        self.cancel_export_action = QAction('Cancel export', self)
+        self.cancel_export_action.setEnabled(False)
+        self.cancel_export_action.triggered.connect(lambda: self.export_task and self.export_task.cancel())
+        self.tools_menu.addAction(self.cancel_export_action)
+        self.import_action = QAction('Import file into current db...', self)
+        self.import_action.triggered.connect(self.import_keys)  # 导入export导出的文件
+        self.tools_menu.addAction(self.import_action)
+        self.export_task = None  # 正在后台执行的导出任务
+        self.key_browser_action = QAction('Browse keys (current db)...', self)
+        self.key_browser_action.triggered.connect(self.open_key_browser)  # 按命名空间逐层浏览当前db的key
+        self.tools_menu.addAction(self.key_browser_action)
+        self.tools_menu.addSeparator()
+        self.record_stats_action = QAction('Record command stats', self, checkable=True)
+        self.record_stats_action.toggled.connect(self.toggle_command_stats)  # 统计每个命令的耗时,字节数和pipeline大小
+        self.tools_menu.addAction(self.record_stats_action)
+        self.command_stats_action = QAction('Command stats...', self)
+        self.command_stats_action.triggered.connect(self.open_command_stats)
+        self.tools_menu.addAction(self.command_stats_action)
+        self.tools_menu.addSeparator()
+        self.hex_action = QAction('Show strings as hex', self, checkable=True)
+        self.hex_action.toggled.connect(lambda _: self.key_type == "string" and self.show_data())
+        self.tools_menu.addAction(self.hex_action)
+        self.full_string_action = QAction('Load whole string value', self)
+        self.full_string_action.triggered.connect(lambda: self.show_data(full_string=True))  # 整体读取大string
+        self.tools_menu.addAction(self.full_string_action)
+        self.value_read_only = False  # 当前展示的数据是否不能按行修改(分块展示的string)
+        # key名自动补全:有可用的key索引时从索引查找,否则在后台SCAN MATCH
+        self.key_completion_model = QStringListModel(self)
+        self.key_completer = QCompleter(self.key_completion_model, self)
+        self.key_completer.setCaseSensitivity(Qt.CaseSensitive)
+        self.key_edit.setCompleter(self.key_completer)
+        self.key_completion_task = None  # 正在后台SCAN MATCH的补全任务
+        self.key_completion_timer = QTimer(self)  # 输入停顿后再查找,避免每个字符都查找一次
+        self.key_completion_timer.setSingleShot(True)
+        self.key_completion_timer.setInterval(200)
+        self.key_completion_timer.timeout.connect(self.update_key_completion)
+        self.key_edit.textEdited.connect(lambda _: self.key_completion_timer.start())
+
+    @staticmethod
+    def get_redis_im():
+        return load_connections()
+
+    def cluster_nodes(self):
+        """
+        :return: 当前连接为集群时所有master的[(host, port)],否则为空列表.只读取detect_cluster缓存的结果,识别完成前为空列表
+        """
+        return self.cluster_node_dict.get(self.connection_name.currentText(), [])
+
+    def detect_cluster(self, then=None):
+        """
+        在后台识别当前连接是否为集群,结果按连接名缓存,不是集群和连接失败的结果也缓存.单节点时同时选择读路由的主从
+        :param then: 识别完成后在GUI线程调用的函数,已缓存时立即调用
+        """
+        name = self.connection_name.currentText()
+        if name not in self.redis_im_dict:
+            return
+        if name in self.cluster_node_dict:
+            if then is not None:
+                then()
+            return
+        if name not in self.cluster_detect_dict:  # 同一个连接只识别一次
+            self.cluster_detect_dict[name] = []
+            start_task(self.run_detect_cluster, self.redis_im_dict[name],
+                       on_result=lambda node_list: self.cluster_detected(name, node_list),
+                       on_error=lambda _: self.cluster_detected(name, []))
+        if then is not None:
+            self.cluster_detect_dict[name].append(then)
+
+    @staticmethod
+    def run_detect_cluster(task, redis_im):
+        if redis_im.get('sentinels'):  # 通过Sentinel访问的主从不是集群
+            node_list = []
+        else:
+            node_list = cluster_masters(redis_im['ip'], redis_im['port'], redis_im['auth'])
+        if not node_list:
+            try:
+                resolve_connection(redis_im)
+            except RedisError:
+                pass  # 出错时current_connection使用原始连接信息
+        return node_list
+
+    def cluster_detected(self, name, node_list):
+        """
+        :param name: 连接名
+        :param node_list: 所有master的[(host, port)],单节点为空列表
+        """
+        callback_list = self.cluster_detect_dict.pop(name, None)
+        if callback_list is None:  # 识别期间连接信息被修改,结果作废
+            return
+        self.cluster_node_dict[name] = node_list
+        if name != self.connection_name.currentText():
+            return
+        self.refresh_db_list()  # 集群只有db 0
+        for callback in callback_list:
+            callback()
+
+    def current_connection(self, read=False):
+        """
+        :param read: 为True时返回只读遍历任务使用的连接信息(可能为从库),否则为主库
+        :return: 当前连接的连接信息,集群不做路由.只使用缓存的选择结果,过期时在后台重新选择,
+                 尚未选择或探测从库,Sentinel出错时返回原始连接信息
+        """
+        redis_im = self.redis_im_dict[self.connection_name.currentText()]
+        if self.cluster_nodes():
+            return redis_im
+        routed_im, expired = cached_connection(redis_im, read)
+        if expired:
+            self.refresh_routing()
+        return routed_im or redis_im
+
+    #  在后台重新选择当前连接的主库和从库
+    def refresh_routing(self):
+        if self.routing_task or self.connection_name.currentText() not in self.redis_im_dict:
+            return
+        redis_im = self.redis_im_dict[self.connection_name.currentText()]
+        self.routing_task = start_task(lambda task: resolve_connection(redis_im), on_error=self.routing_failed,
+                                       on_finished=self.routing_finished, action='resolve_connection')
+
+    def routing_failed(self, message):
+        self.statusbar.showMessage('read routing failed: {}'.format(message), 5000)
+
+    def routing_finished(self):
+        if self.routing_task and self.sender() is self.routing_task.signals:
+            self.routing_task = None
+
+    def current_operation(self, read=False, throttle=None):
+        """
+        :param read: 为True时只读命令发送到选中的从库,用于遍历类的后台任务;查看和编辑key时读写都使用主库
+        :param throttle: 遍历类后台任务的ScanThrottle
+        :return: 当前连接和db的RedisOperation实例,集群时按key路由到所在的master
+        """
+        redis_im = self.current_connection()
+        read_im = self.current_connection(read=True) if read else redis_im
+        return RedisOperation(redis_db=self.cur_db, redis_host=redis_im['ip'], redis_port=redis_im['port'],
+                              password=redis_im['auth'], cluster=bool(self.cluster_nodes()),
+                              read_host=read_im['ip'], read_port=read_im['port'], throttle=throttle)
+
+    def node_operations(self, throttle=None):
+        """
+        :param throttle: 各master共用的ScanThrottle
+        :return: 集群各master的RedisOperation实例,用于并发遍历.单节点时为空列表
+        """
+        redis_im = self.redis_im_dict[self.connection_name.currentText()]
+        return [RedisOperation(0, host, port, redis_im['auth'], throttle=throttle)
+                for host, port in self.cluster_nodes()]
+
+    #  设置遍历类任务对redis的影响预算,之后开始的统计,大key查找和导出生效
+    def set_scan_budget(self):
+        max_call_ms, ok = QInputDialog.getInt(self, 'Scan impact budget', 'max ms per SCAN call (0 = no limit):',
+                                              self.scan_budget[0], 0, 10000)
+        if not ok:
+            return
+        max_ops, ok = QInputDialog.getInt(self, 'Scan impact budget', 'max commands per second (0 = no limit):',
+                                          self.scan_budget[1], 0, 10000000)
+        if ok:
+            self.scan_budget = (max_call_ms, max_ops)
+
+    def new_scan_throttle(self):
+        """
+        :return: 按scan_budget创建的ScanThrottle,一个任务一个实例,没有设置预算时为None
+        """
+        max_call_ms, max_ops = self.scan_budget
+        if not max_call_ms and not max_ops:
+            return None
+        return ScanThrottle(max_call_ms or None, max_ops or None)
+
+    #  获取当前连接方式下的redis,所有db的key数量.在后台线程中执行,按SCAN分片刷新界面
+    def select_all_db_keys_number(self):
+        if self.connection_name.currentText() not in self.cluster_node_dict:
+            self.detect_cluster(self.select_all_db_keys_number)  # 先识别是否为集群,再按节点分发
+            return
+        if self.census_task:
+            self.census_task.cancel()
+        read_im = self.current_connection(read=True)
+        census = KeyCensus(redis_host=read_im['ip'], redis_port=read_im['port'], password=read_im['auth'],
+                           server_side=self.server_side_action.isChecked(), detail=self.detail_action.isChecked(),
+                           namespace_rule=self.namespace_rule,
+                           key_index=self.key_index if self.index_action.isChecked() else None,
+                           node_list=self.cluster_nodes(), throttle=self.new_scan_throttle())
+        self.census_throttle = census.throttle
+        self.census_connection_key = connection_key(self.redis_im_dict[self.connection_name.currentText()])
+        if census.key_index is not None and self.key_index_connection_key != self.census_connection_key:
+            self.key_index.clear()  # 索引属于其他连接
+            self.key_index_connection_key = self.census_connection_key
+        # 正在统计的各db的key数量.界面展示的是缓存结果时,某个db统计完成后才替换该db的缓存结果
+        # 前缀数量过多时自动切换为概率统计,只保留数量最多的前缀
+        self.census_key_number_dict = {str(db): PrefixCounter() for db in census.db_list}
+        self.census_stale_db_set.clear()
+        if self.cached_connection_key != self.census_connection_key:
+            self.all_db_keys_number_dict = {db: key_number_counter.to_dict()
+                                            for db, key_number_counter in self.census_key_number_dict.items()}
+        # 详细统计的各db结果,前缀过多时只保留数量最多的前缀
+        self.all_db_keys_stats_dict = {str(db): KeyStatsCounter() for db in census.db_list} if census.detail else dict()
+        self.all_db_type_number_dict = dict()
+        self.all_db_estimate_dict = dict()
+        self.db_progress_dict = {str(db): 0.0 for db in census.db_list}
+        # 异步引擎:所有db在一个事件循环中交替扫描,不占用线程.集群和限速时run_async仍使用线程池
+        use_async = self.async_action.isChecked()
+        self.census_task = (start_coroutine if use_async else start_task)(
+            self.run_census_async if use_async else self.run_census, census, on_partial=self.merge_census_batch,
+            on_result=self.finish_census, on_error=self.show_task_error, on_finished=self.census_stopped)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.cancel_button.show()
+        self.census_refresh_timer.start()
+        self.refresh_db_list()
+
+    @staticmethod
+    def run_census(task, census):
+        """
+        后台线程:执行统计,每个SCAN分片的结果通过partial信号发回GUI线程
+        """
+        return census.run(batch_callback=lambda db, batch, progress: task.report_partial((db, batch, progress)),
+                          cancel_event=task.cancel_event)
+
+    @staticmethod
+    async def run_census_async(task, census):
+        """
+        事件循环中执行统计,与run_census相同,通过partial信号发回GUI线程
+        """
+        return await census.run_async(
+            batch_callback=lambda db, batch, progress: task.report_partial((db, batch, progress)),
+            cancel_event=task.cancel_event)
+
+    #  抽样估算当前连接方式下所有db的key数量分布,估算结果在抽样过程中不断细化
+    def select_all_db_keys_estimate(self):
+        if self.connection_name.currentText() not in self.cluster_node_dict:
+            self.detect_cluster(self.select_all_db_keys_estimate)  # 集群时在各master上分别抽样
+            return
+        if self.census_task:
+            self.census_task.cancel()
+        refine = self.refine_action.isChecked()
+        read_im = self.current_connection(read=True)
+        census = SampleCensus(redis_host=read_im['ip'], redis_port=read_im['port'], password=read_im['auth'],
+                              max_keys=None if refine else SAMPLE_KEYS, max_seconds=None if refine else SAMPLE_SECONDS,
+                              random_key=self.random_key_action.isChecked(), namespace_rule=self.namespace_rule,
+                              node_list=self.cluster_nodes())
+        self.census_connection_key = connection_key(self.redis_im_dict[self.connection_name.currentText()])
+        self.cached_connection_key = None
+        self.census_throttle = None
+        self.all_db_keys_number_dict = {str(db): dict() for db in census.db_list}
+        self.census_key_number_dict = dict()
+        self.all_db_estimate_dict = dict()
+        self.all_db_keys_stats_dict = dict()
+        self.all_db_type_number_dict = dict()
+        self.db_progress_dict = {str(db): 0.0 for db in census.db_list}
+        self.census_task = start_task(self.run_census, census, on_partial=self.merge_estimate_batch,
+                                      on_result=self.finish_estimate, on_error=self.show_task_error,
+                                      on_finished=self.census_stopped)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.cancel_button.show()
+        self.census_refresh_timer.start()
+        self.refresh_db_list()
+
+    #  抽样统计发回的估算结果替换该db原有的估算结果
+    def merge_estimate_batch(self, data):
+        if not self.census_task or self.sender() is not self.census_task.signals:
+            return
+        db, key_estimate_dict, progress = data
+        self.all_db_estimate_dict[db] = key_estimate_dict
+        self.all_db_keys_number_dict[db] = estimate_to_number(key_estimate_dict)
+        self.db_progress_dict[db] = progress
+        self.progress_bar.setValue(int(100 * sum(self.db_progress_dict.values()) / len(self.db_progress_dict)))
+        self.census_dirty = True
+
+    #  抽样统计完成.估算结果不保存到本地缓存,避免与完整统计的快照混在一起对比
+    def finish_estimate(self, all_db_estimate_dict):
+        if self.census_task and self.sender() is self.census_task.signals:
+            self.all_db_estimate_dict.update(all_db_estimate_dict)
+            for db, key_estimate_dict in all_db_estimate_dict.items():
+                self.all_db_keys_number_dict[db] = estimate_to_number(key_estimate_dict)
+            self.census_dirty = True
+
+    #  合并统计任务发回的一个SCAN分片
+    def merge_census_batch(self, data):
+        if not self.census_task or self.sender() is not self.census_task.signals:
+            return  # 已被取消或替换的统计任务
+        db, batch_key_number_dict, progress = data
+        if db in self.all_db_keys_stats_dict:  # 详细统计,分片为{key:统计结果}
+            self.all_db_keys_stats_dict[db].update(batch_key_number_dict)
+            batch_key_number_dict = key_stats_to_number(batch_key_number_dict)
+        key_number_counter = self.census_key_number_dict.setdefault(db, PrefixCounter())
+        key_number_counter.update(batch_key_number_dict)
+        if progress >= 1.0 or self.cached_connection_key != self.census_connection_key:
+            self.census_stale_db_set.add(db)  # 刷新界面时再复制计数器的结果,不在每个分片都复制
+        self.db_progress_dict[db] = progress
+        self.progress_bar.setValue(int(100 * sum(self.db_progress_dict.values()) / len(self.db_progress_dict)))
+        self.census_dirty = True
+
+    #  把计数器的结果写入all_db_keys_number_dict
+    def flush_census_counts(self):
+        for db in self.census_stale_db_set:
+            key_number_counter = self.census_key_number_dict.get(db)
+            if key_number_counter is not None:
+                self.all_db_keys_number_dict[db] = key_number_counter.to_dict()
+        self.census_stale_db_set.clear()
+
+    #  统计完成,用最终结果覆盖分片合并的结果
+    def finish_census(self, all_db_keys_number_dict):
+        if self.census_task and self.sender() is self.census_task.signals:
+            self.flush_census_counts()
+            if self.all_db_keys_stats_dict:
+                for db, key_stats_dict in all_db_keys_number_dict.items():
+                    key_stats_counter = self.all_db_keys_stats_dict[db] = KeyStatsCounter()
+                    key_stats_counter.update(key_stats_dict)
+                all_db_keys_number_dict = {db: key_stats_to_number(key_stats_dict)
+                                           for db, key_stats_dict in all_db_keys_number_dict.items()}
+                self.all_db_type_number_dict = {db: key_stats_to_type_number(key_stats_counter.to_dict())
+                                                for db, key_stats_counter in self.all_db_keys_stats_dict.items()}
+            if self.census_task.cancelled:  # 已完成的db在合并分片时已经替换,未完成的db保留原结果
+                return
+            self.all_db_keys_number_dict.update(all_db_keys_number_dict)
+            self.census_dirty = True
+            self.cached_connection_key = None
+            start_command(self.census_cache.save, self.census_connection_key,  # 完整的统计结果保存到本地缓存
+                          {db: dict(key_number_dict) for db, key_number_dict in all_db_keys_number_dict.items()},
+                          on_error=self.show_task_error)
+
+    def census_stopped(self):
+        if not self.census_task or self.sender() is not self.census_task.signals:
+            return
+        if self.census_task.cancelled:
+            self.statusbar.showMessage('census cancelled', 5000)
+        elif self.key_index.overflow:
+            self.key_index.overflow = False
+            self.statusbar.showMessage('key index memory cap reached, some dbs fall back to SCAN MATCH', 5000)
+        self.census_task = None
+        self.census_throttle = None
+        self.census_refresh_timer.stop()
+        self.progress_bar.hide()
+        self.cancel_button.hide()
+        self.apply_pending_live_delta()
+        self.refresh_census_view()
+
+    def cancel_census(self):
+        if self.census_task:
+            self.census_task.cancel()
+
+    #  定时刷新统计中的db列表和key统计表格,避免每个分片都重绘界面
+    def refresh_census_view(self):
+        if not self.census_dirty:
+            return
+        self.census_dirty = False
+        self.flush_census_counts()
+        self.refresh_db_list()
+        if self.census_throttle is not None:
+            self.statusbar.showMessage(self.census_throttle.summary(), 2000)
+        if self.key_type_view.text() == 'key统计':
+            self.show_key_number_table()
+
+    #  按all_db_keys_number_dict刷新db下拉框中的key数量
+    def refresh_db_list(self):
+        self.all_db_keys_list.clear()
+        for i in range(0, 1 if self.cluster_nodes() else 16):  # 集群只有db 0
+            db_key_number = sum(self.all_db_keys_number_dict.get(str(i), dict()).values())
+            if str(i) in self.all_db_estimate_dict:  # 抽样估算的数量
+                db_key_number = '~{}'.format(db_key_number)
+            self.all_db_keys_list.append('db{} ({})'.format(i, db_key_number))
+        if self.connection_db.count() == len(self.all_db_keys_list):
+            for i, text in enumerate(self.all_db_keys_list):  # 原地更新,保留当前选中的db
+                self.connection_db.setItemText(i, text)
+        else:
+            self.connection_db.clear()
+            self.connection_db.addItems(self.all_db_keys_list)
+
+    #  展示本地缓存中当前连接最近一次的统计结果,refresh为True时随后在后台重新统计
+    def load_cached_census(self, refresh=False):
+        self.detect_cluster()  # 选中连接时在后台识别一次是否为集群
+        if self.live_census:  # 实时统计订阅的是原来连接的通知
+            self.live_action.setChecked(False)
+        if self.census_task or self.connection_name.currentText() not in self.redis_im_dict:
+            return
+        all_db_keys_number_dict, taken_at = self.census_cache.load_latest(
+            connection_key(self.redis_im_dict[self.connection_name.currentText()]))
+        self.all_db_keys_number_dict = all_db_keys_number_dict
+        self.all_db_keys_stats_dict = dict()
+        self.all_db_estimate_dict = dict()
+        self.all_db_type_number_dict = dict()
+        self.refresh_db_list()
+        if taken_at is None:
+            self.cached_connection_key = None
+            return
+        self.cached_connection_key = connection_key(self.redis_im_dict[self.connection_name.currentText()])
+        self.statusbar.showMessage('cached census from {}'.format(
+            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(taken_at))), 5000)
+        if refresh:
+            self.select_all_db_keys_number()
+
+    #  对比当前db最近两次统计中各前缀的数量
+    def show_prefix_growth(self):
+        if self.connection_name.currentText() not in self.redis_im_dict:
+            return
+        cur_connection_key = connection_key(self.redis_im_dict[self.connection_name.currentText()])
+        start_command(self.census_cache.compare, cur_connection_key, self.cur_db,
+                      on_result=self.show_prefix_growth_table, on_error=self.show_task_error)
+
+    def show_prefix_growth_table(self, growth_dict):
+        if not growth_dict:
+            up_window_im_by_bool(self, False, "", "", "错误", "当前db的统计快照不足两次！")
+            return
+        self.show_value_table()
+        self.create_model(len(growth_dict), 'key', 'previous', 'current', 'change')
+        growth_list = sorted(growth_dict.items(), key=lambda item: abs(item[1][2]), reverse=True)
+        for cur_row, (key, (old_number, new_number, change)) in enumerate(growth_list):
+            for cur_column, value in enumerate((key, old_number, new_number, '{:+d}'.format(change))):
+                self.model.setItem(cur_row, cur_column, QStandardItem(str(value)))
+        self.tableView.setModel(self.model)
+        self.key_type_view.setText('key增长')
+
+    #  开启或关闭实时统计
+    def toggle_live_census(self, checked):
+        if self.live_census:
+            self.live_census.stop()
+            self.live_census = None
+        self.live_apply_timer.stop()
+        self.live_reconcile_timer.stop()
+        if not checked:
+            return
+        if self.connection_name.currentText() not in self.cluster_node_dict:
+            self.detect_cluster(lambda: self.toggle_live_census(self.live_action.isChecked()))
+            return
+        if self.cluster_nodes():  # 每个master只发布自己的keyspace通知,只订阅一个节点会漏掉其他master的变化
+            self.live_action.setChecked(False)
+            up_window_im_by_bool(self, False, "", "", "Live mode", "Live mode is not available for cluster connections")
+            return
+        redis_im = self.current_connection()  # keyspace通知只在主库上产生
+        self.live_census = LiveCensus(redis_im['ip'], redis_im['port'], redis_im['auth'], self.namespace_rule)
+        self.live_pending_delta_dict = dict()
+        if not self.live_census.enable_notifications():
+            self.statusbar.showMessage('keyspace notifications are incomplete, counts rely on reconciliation', 5000)
+        self.live_census.start()
+        self.live_apply_timer.start()
+        self.live_reconcile_timer.start()
+
+    def closeEvent(self, event):
+        if self.live_census:  # 退出前等待监听线程恢复redis的notify-keyspace-events
+            self.live_census.stop(wait=True)
+        super(ParentWindow, self).closeEvent(event)
+
+    #  合并这段时间内的keyspace通知
+    def apply_live_delta(self):
+        if not self.live_census:
+            return
+        if not self.live_census.running:
+            error = self.live_census.error
+            self.live_action.setChecked(False)
+            self.show_task_error('live mode stopped: {}'.format(error))
+            return
+        delta_dict = self.live_census.drain()
+        if delta_dict and self.census_task:  # 全量统计进行中,暂存到统计结束后再应用
+            merge_delta(self.live_pending_delta_dict, delta_dict)
+        elif delta_dict:
+            apply_delta(self.all_db_keys_number_dict, delta_dict)
+            self.census_dirty = True
+            self.refresh_census_view()
+
+    #  全量统计结束后应用统计期间暂存的keyspace通知
+    def apply_pending_live_delta(self):
+        delta_dict, self.live_pending_delta_dict = self.live_pending_delta_dict, dict()
+        if delta_dict and self.live_census:
+            apply_delta(self.all_db_keys_number_dict, delta_dict)
+            self.census_dirty = True
+
+    #  后台校准实时统计的结果,只重新统计DBSIZE与统计数量偏差过大的db
+    def reconcile_live_census(self):
+        if not self.live_census or self.census_task:
+            return
+        all_db_keys_number_dict = {db: dict(key_number_dict)
+                                   for db, key_number_dict in self.all_db_keys_number_dict.items()}
+        start_command(self.live_census.reconcile, all_db_keys_number_dict,
+                      on_result=self.live_census_reconciled, on_error=self.show_task_error)
+
+    def live_census_reconciled(self, corrected_dict):
+        if corrected_dict:
+            self.all_db_keys_number_dict.update(corrected_dict)
+            self.census_dirty = True
+            self.refresh_census_view()
+
+    #  发生了key删除或者row删除后key消失的情况后,更新db的key数量
+    def cur_db_keys_number_reduce(self):
+        key_number_dict = self.all_db_keys_number_dict.get(self.cur_db, dict())
+        simple_key_name = self.namespace_rule.transform_to_name(self.key_name)
+        if simple_key_name in key_number_dict:
+            key_number_dict[simple_key_name] -= 1
+            if key_number_dict[simple_key_name] <= 0:
+                key_number_dict.pop(simple_key_name)
+        self.refresh_db_list()
+
+    #  回收空闲的连接池,并在状态栏展示当前缓存的连接池和连接数量
+    def refresh_pool_stats(self):
+        connection_manager.evict_idle()
+        stats = connection_manager.stats()
+        self.pool_stats_label.setText('pools: {} connections: {}{}{}'.format(
+            stats['pools'], stats['connections'], self.server_info_text,
+            ' | ' + recorder.summary() if recorder.enabled else ''))
+        if self.async_action.isChecked() and self.server_info_task is None and \
+                self.connection_name.currentText() in self.redis_im_dict:
+            self.server_info_task = start_coroutine(self.poll_server_info, self.current_connection(),
+                                                    on_result=self.show_server_info,
+                                                    on_error=self.show_server_info_error,
+                                                    on_finished=self.server_info_polled)
+        elif not self.async_action.isChecked():
+            self.server_info_text = ''
+
+    @staticmethod
+    async def poll_server_info(task, redis_im):
+        """
+        事件循环中读取INFO,不占用线程
+        :return: 状态栏展示的server信息
+        """
+        con = AsyncRedisOperation(0, redis_im['ip'], redis_im['port'], redis_im['auth'])
+        info_dict = await con.info()
+        return ' | ops/s: {} mem: {} clients: {}'.format(info_dict.get('instantaneous_ops_per_sec', '-'),
+                                                         info_dict.get('used_memory_human', '-'),
+                                                         info_dict.get('connected_clients', '-'))
+
+    def show_server_info(self, text):
+        if self.async_action.isChecked():
+            self.server_info_text = text
+
+    def show_server_info_error(self, message):
+        self.server_info_text = ' | INFO failed: {}'.format(message)
+
+    def server_info_polled(self):
+        if self.server_info_task and self.sender() is self.server_info_task.signals:
+            self.server_info_task = None
+
+    def show_task_error(self, message):
+        if self.connection_name.currentText() in self.redis_im_dict:
+            invalidate(self.redis_im_dict[self.connection_name.currentText()])  # 从库可能已不可用,重新选择
+            self.refresh_routing()
+        up_window_im_by_bool(self, False, "", "", "Error", message)
+
+    #  统计当前db各类的key数量
+    def current_db_show_all_keys_number(self):
+        self.cur_db = re.findall("db(\\d+) ", self.connection_db.currentText())[0]
+        self.show_key_number_table()
+        self.key_type_view.setText('key统计')
+
+    #  把当前db的key统计结果填入表格,详细统计时增加类型分布,元素数量和内存列,多层命名空间时用树展示
+    def show_key_number_table(self):
+        if self.namespace_rule.max_depth > 1:
+            self.show_prefix_tree()
+            return
+        self.show_value_table()
+        key_stats_counter = self.all_db_keys_stats_dict.get(self.cur_db)
+        if key_stats_counter is not None and key_stats_counter.total:
+            self.show_key_stats_table(key_stats_counter.to_dict())
+            return
+        key_estimate_dict = self.all_db_estimate_dict.get(self.cur_db)
+        if key_estimate_dict:
+            self.show_key_estimate_table(key_estimate_dict)
+            return
+        column_list = ['key','value']
+        key_number_dict = self.all_db_keys_number_dict.get(self.cur_db, dict())
+        row_number = len(key_number_dict)
+        self.create_model(row_number, *column_list)
+        cur_row = 0
+        for key, number in key_number_dict.items():
+            self.model.setItem(cur_row, 0, QStandardItem(str(key)))
+            self.model.setItem(cur_row, 1, QStandardItem(str(number)))
+            cur_row += 1
+        self.tableView.setModel(self.model)
+        if OTHER_PREFIX in key_number_dict:  # 前缀数量过多,只展示了数量最多的前缀
+            key_number_counter = self.census_key_number_dict.get(self.cur_db)
+            distinct = key_number_counter.distinct() if key_number_counter else 'many'
+            self.statusbar.showMessage('~{} distinct prefixes, showing the top {}; {} sums the rest'.format(
+                distinct, len(key_number_dict) - 1, OTHER_PREFIX))
+
+    def show_key_stats_table(self, key_stats_dict):
+        type_list = ['string', 'list', 'hash', 'set', 'zset']
+        column_list = ['key', 'value'] + type_list + ['elements', 'mean', 'bytes']
+        self.create_model(len(key_stats_dict), *column_list)
+        for cur_row, (key, key_stats) in enumerate(key_stats_dict.items()):
+            value_list = [key, key_stats['number']] + [key_stats['types'].get(key_type, 0) for key_type in type_list]
+            value_list += [key_stats['elements'], '{:.1f}'.format(key_stats['mean']), key_stats['bytes']]
+            for cur_column, value in enumerate(value_list):
+                self.model.setItem(cur_row, cur_column, QStandardItem(str(value)))
+        self.tableView.setModel(self.model)
+        type_number_dict = self.all_db_type_number_dict.get(self.cur_db)
+        if type_number_dict:
+            self.statusbar.showMessage('  '.join('{}: {}'.format(key_type, number)
+                                                 for key_type, number in type_number_dict.items()))
+        # 水平方向标签拓展剩下的窗口部分，填满表格
+        # self.key_number_view.horizontalHeader().setStretchLastSection(True)
+        # 水平和垂直方向，表格大小拓展到适当的尺寸
+        # self.key_number_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # self.key_number_view.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+    def show_key_estimate_table(self, key_estimate_dict):
+        self.create_model(len(key_estimate_dict), 'key', 'estimate', '95% low', '95% high')
+        estimate_list = sorted(key_estimate_dict.items(), key=lambda item: item[1][0], reverse=True)
+        for cur_row, (key, estimate) in enumerate(estimate_list):
+            for cur_column, value in enumerate((key,) + tuple(estimate)):
+                self.model.setItem(cur_row, cur_column, QStandardItem(str(value)))
+        self.tableView.setModel(self.model)
+
+    #  用前缀树展示当前db的统计结果,只加载第一层,展开时再加载下一层
+    def show_prefix_tree(self):
+        self.prefix_trie = PrefixTrie.from_number_dict(self.all_db_keys_number_dict.get(self.cur_db, dict()),
+                                                       self.namespace_rule)
+        tree_model = QStandardItemModel(0, 2, self.prefix_tree_view)
+        tree_model.setHorizontalHeaderLabels(['key', 'value'])
+        self.add_prefix_children(tree_model.invisibleRootItem(), ())
+        self.prefix_tree_view.setModel(tree_model)
+        self.tableView.hide()
+        self.prefix_tree_view.show()
+
+    def add_prefix_children(self, parent_item, path):
+        """
+        :param parent_item: 父节点的QStandardItem
+        :param path: 父节点的统计路径
+        """
+        for name, number, has_children in self.prefix_trie.children(path):
+            name_item = QStandardItem(name)
+            name_item.setData(path + (name,), Qt.UserRole)
+            name_item.setEditable(False)
+            if has_children:
+                name_item.appendRow(QStandardItem())  # 占位,展开时替换为下一层
+            number_item = QStandardItem(str(number))
+            number_item.setEditable(False)
+            parent_item.appendRow([name_item, number_item])
+
+    def expand_prefix_node(self, index):
+        item = self.prefix_tree_view.model().itemFromIndex(index.siblingAtColumn(0))
+        if item.rowCount() == 1 and item.child(0).data(Qt.UserRole) is None:
+            item.removeRow(0)
+            self.add_prefix_children(item, item.data(Qt.UserRole))
+
+    def show_value_table(self):
+        self.prefix_tree_view.hide()
+        self.tableView.show()
+
+    def reload_namespace_rule(self):
+        self.namespace_rule = load_namespace_rule()
+        self.statusbar.showMessage('namespace rules reloaded, run the census again to apply them', 5000)
+
+    def find_big_keys(self):
+        throttle = self.new_scan_throttle()
+        con = self.current_operation(read=True, throttle=throttle)
+        dialog = BigKeyDialog(self, con, self.cur_db, self.namespace_rule, self.node_operations(throttle))
+        dialog.key_selected.connect(self.open_key)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def open_key(self, db, key_name):
+        self.cur_db = db
+        self.key_edit.setText(key_name)
+        self.show_data()
+
+    def current_key_index(self):
+        """
+        :return: 当前连接的key索引,属于其他连接时为None
+        """
+        if self.key_index_connection_key != connection_key(self.redis_im_dict[self.connection_name.currentText()]):
+            return None
+        return self.key_index
+
+    def open_key_browser(self):
+        con = self.current_operation(read=True)
+        dialog = KeyBrowserDialog(self, con, self.cur_db, self.current_key_index(), self.namespace_rule.joiner)
+        dialog.key_selected.connect(self.open_key)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def toggle_command_stats(self, checked):
+        if checked:
+            recorder.enable()
+        else:
+            recorder.disable()
+        self.refresh_pool_stats()
+
+    def open_command_stats(self):
+        dialog = StatsDialog(self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    #  按key_edit中已输入的前缀更新自动补全列表
+    def update_key_completion(self):
+        prefix = self.key_edit.text()
+        if self.key_completion_task:
+            self.key_completion_task.cancel()
+            self.key_completion_task = None
+        if not prefix or self.connection_name.currentText() not in self.redis_im_dict:
+            return
+        key_index = self.current_key_index()
+        if key_index is not None and key_index.is_fresh(self.cur_db):
+            self.show_key_completion(key_index.complete(self.cur_db, prefix))
+            return
+        con = self.current_operation(read=True)
+        self.key_completion_task = start_task(self.run_key_completion, con, prefix,
+                                              on_result=self.key_completion_found, on_error=self.show_task_error)
+
+    @staticmethod
+    def run_key_completion(task, con, prefix):
+        """
+        后台线程:没有可用的key索引时SCAN MATCH查找补全候选
+        """
+        return scan_match(con, prefix, COMPLETE_LIMIT, task.cancel_event)[0][:COMPLETE_LIMIT]
+
+    def key_completion_found(self, key_list):
+        if self.key_completion_task and self.sender() is self.key_completion_task.signals:
+            self.key_completion_task = None
+            self.show_key_completion(key_list)
+
+    def show_key_completion(self, key_list):
+        self.key_completion_model.setStringList(key_list)
+        if key_list and self.key_edit.hasFocus():
+            self.key_completer.complete()
+
+    #  把当前key,或当前db中某前缀的key导出到文件,在后台线程中流式写入
+    def export_keys(self, current_key=False):
+        if self.export_task:
+            self.show_task_error('an export is already running')
+            return
+        key_name, prefix = None, None
+        if current_key:
+            key_name = self.key_edit.text()
+            if not key_name:
+                return
+        else:
+            prefix, ok = QInputDialog.getText(self, 'Export keys', 'key prefix (empty = whole db):')
+            if not ok:
+                return
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, 'Export to', '', 'NDJSON (*.ndjson *.ndjson.gz);;CSV (*.csv *.csv.gz);;Redis DUMP (*.dump *.dump.gz)')
+        if not path:
+            return
+        export_format = {'NDJSON': 'ndjson', 'CSV': 'csv', 'Redis': 'dump'}[selected_filter.split(' ')[0]]
+        throttle = self.new_scan_throttle()
+        con = self.current_operation(read=True, throttle=throttle)
+        exporter = KeyExporter(con, export_format, node_con_list=self.node_operations(throttle))
+        self.export_task = start_task(self.run_export, exporter, path, key_name, prefix or None,
+                                      on_partial=self.statusbar.showMessage, on_result=self.export_finished,
+                                      on_error=self.show_task_error, on_finished=self.export_stopped)
+        self.cancel_export_action.setEnabled(True)
+
+    @staticmethod
+    def run_export(task, exporter, path, key_name, prefix):
+        """
+        后台线程:导出并上报吞吐量和预计剩余时间
+        """
+        return exporter.export(path, key_name, prefix, lambda *progress: task.report_partial(progress_text(*progress)),
+                               task.cancel_event)
+
+    def export_finished(self, result):
+        self.statusbar.showMessage('exported {keys} keys ({skipped} skipped) in {seconds:.1f}s'.format(**result), 10000)
+
+    def export_stopped(self):
+        self.export_task = None
+        self.cancel_export_action.setEnabled(False)
+
+    #  把ndjson/csv/dump文件导入当前db,在后台线程中批量写入
+    def import_keys(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, 'Import from', '', 'Exported keys (*.ndjson *.csv *.dump *.gz);;All files (*)')
+        if not path:
+            return
+        replace = up_window_question_by_bool(self, 'Import', 'Overwrite keys that already exist?')
+        redis_im = self.current_connection()
+        importer = KeyImporter(int(self.cur_db), redis_im['ip'], redis_im['port'], redis_im['auth'], replace=replace,
+                               cluster=bool(self.cluster_nodes()))
+        self.import_action.setEnabled(False)
+        start_task(self.run_import, importer, path, on_partial=self.statusbar.showMessage,
+                   on_result=self.import_finished, on_error=self.show_task_error,
+                   on_finished=lambda: self.import_action.setEnabled(True))
+
+    @staticmethod
+    def run_import(task, importer, path):
+        """
+        后台线程:导入并上报每秒执行的命令数量
+        """
+        return importer.import_file(path, progress_callback=lambda *progress: task.report_partial(
+            import_progress_text(*progress)), cancel_event=task.cancel_event)
+
+    def import_finished(self, result):
+        self.statusbar.showMessage('imported {keys} keys, {ops} ops in {seconds:.1f}s ({ops_per_second:.0f} ops/s), '
+                                   '{errors} errors'.format(**result), 10000)
+        if result['errors']:
+            self.show_task_error('first error: {}'.format(result['first_error']))
+
+    #  创建一个展示模板
+    def create_model(self, row_number, *args):
+        """
+        :param row_number: 行数量
+        :param args: 字段标题
+        """
+        self.model = QStandardItemModel(row_number, len(args))
+        self.model.setHorizontalHeaderLabels(list(args))
+
+    #  查找redis并展示中该key中的值,读取在后台线程中执行.大string和二进制string分块读取,full_string为True时整体读取
+    def show_data(self, full_string=False):
+        self.con = self.current_operation()
+        self.key_name = self.key_edit.text()
+        print('当前的key:' + self.key_name)
+        start_task(self.load_data, self.con, self.key_name, self.hex_action.isChecked(), full_string,
+                   self.zset_order_combo.currentData(), self.score_range(),
+                   on_result=self.fill_data, on_error=self.show_task_error)
+
+    #  zset排序面板中的分数范围,都为空时返回None.分数可以使用redis的格式,如 -inf, (10
+    def score_range(self):
+        min_score, max_score = self.min_score_edit.text().strip(), self.max_score_edit.text().strip()
+        if not min_score and not max_score:
+            return None
+        return min_score or '-inf', max_score or '+inf'
+
+    def apply_zset_view(self):
+        if self.key_type == "zset" and self.key_name:
+            self.show_data()
+
+    @staticmethod
+    def load_data(task, con, key_name, hex_view=False, full_string=False, zset_order=None, score_range=None):
+        """
+        后台线程:读取key的类型,长度,以及string的值或其他类型的第一页数据
+        :param hex_view: string是否按十六进制展示
+        :param full_string: 是否整体读取文本string,为False时只整体读取不超过SMALL_STRING的文本string.二进制string总是分块读取
+        :param zset_order: zset的顺序,见create_page_reader
+        :param score_range: zset的分数范围,见create_page_reader
+        :return: (key_type, key_length, 按页读取器, [(列1, 列2)...]),string的key_length为字节数
+        """
+        key_type = con.get_type(key_name)
+        if key_type == "string":
+            string_length = con.strlen(key_name)
+            binary = is_binary(con.getrange(key_name, 0, SNIFF_BYTES - 1))
+            if not (hex_view or binary) and (full_string or string_length <= SMALL_STRING):
+                return key_type, string_length, None, [(con.get(key_name),)]
+            reader = StringChunkReader(con, key_name, hex_view or binary, string_length=string_length)
+            return key_type, string_length, reader, reader.read_page(0)
+        if key_type not in ("list", "zset", "set", "hash"):
+            return key_type, 0, None, []
+        key_length = {"list": con.llen, "zset": con.zcard, "set": con.scard, "hash": con.hlen}[key_type](key_name)
+        reader = create_page_reader(con, key_name, key_type, key_length=key_length, zset_order=zset_order,
+                                    score_range=score_range)
+        return key_type, key_length, reader, reader.read_page(0)
+
+    #  把后台读取的数据填入表格,list/hash/set/zset滚动到底部时再按页加载
+    def fill_data(self, data):
+        self.key_type, key_length, reader, row_list = data
+        if not self.key_type:  # key_type为None则代表该key并不存在,抛出警告
+            up_window_im_by_bool(self, False, "", "", "not existed", "key is not existed")
+        self.key_type_view.setText(self.key_type)
+        self.show_value_table()
+        if self.key_type:
+            self.cur_key_length = key_length
+            column_list = ["key", "value"] if self.key_type in ("zset", "hash") else ["value"]
+            column_list = getattr(reader, 'column_list', column_list)
+            self.value_read_only = getattr(reader, 'read_only', False)
+            if reader is None:
+                self.create_model(len(row_list), *column_list)
+                for r_num, row in enumerate(row_list):
+                    for c_num, value in enumerate(row):
+                        self.model.setItem(r_num, c_num, QStandardItem(value))
+            else:
+                self.model = LazyValueModel(reader, column_list, first_page_rows=row_list)
+                self.model.page_error.connect(self.show_task_error)
+                if hasattr(reader, 'min_score'):
+                    self.statusbar.showMessage('{} members with score between {} and {}'.format(
+                        reader.row_number, reader.min_score, reader.max_score), 5000)
+            self.tableView.setModel(self.model)
+        self.key_size_view.setText(str(self.cur_key_length))
+
+    #  跳转到list的某个下标,只读取该下标所在的一页
+    def go_to_index(self):
+        if not isinstance(self.model, LazyValueModel) or not getattr(self.model.reader, 'random_access', False):
+            up_window_im_by_bool(self, False, "", "", "错误", "只有list和按分数排序的zset支持跳转！")
+            return
+        text = self.index_edit.text()
+        if isinstance(self.model.reader, ZsetRankReader) and not re.fullmatch(r'-?\d+', text):
+            model = self.model  # 输入的不是排名时在后台按value查找排名
+            start_command(model.reader.rank_of, text,
+                          on_result=lambda rank: self.rank_found(model, rank),
+                          on_error=self.show_task_error)
+            return
+        self.scroll_to_index(text)
+
+    #  按value查到zset中的排名后跳转,查找期间已切换到其他key则忽略
+    def rank_found(self, model, rank):
+        if model is not self.model:
+            return
+        if rank is None:
+            up_window_im_by_bool(self, False, "", "", "错误", "zset中不存在该value！")
+            return
+        self.scroll_to_index(str(rank))
+
+    #  滚动到指定下标所在的行并选中
+    def scroll_to_index(self, text):
+        try:
+            row = self.model.reader.normalize_index(int(text))
+        except ValueError:
+            up_window_im_by_bool(self, False, "", "", "错误", "下标必须为整数！")
+            return
+        except IndexError:
+            up_window_im_by_bool(self, False, "", "", "错误", "下标超出范围！")
+            return
+        index = self.model.index(row, 0)
+        self.tableView.scrollTo(index, QAbstractItemView.PositionAtTop)
+        self.tableView.selectRow(row)
+
+    #  用MATCH在redis中过滤当前hash/set/zset,匹配结果逐批追加到表格.过滤条件为空时重新加载全部数据
+    def search_values(self):
+        if self.search_task:
+            self.search_task.cancel()
+        if self.key_type not in ("hash", "set", "zset") or not self.key_name:
+            up_window_im_by_bool(self, False, "", "", "错误", "只有hash/set/zset支持过滤！")
+            return
+        pattern = self.filter_edit.text()
+        if not pattern:
+            self.show_data()
+            return
+        column_list = ["key", "value"] if self.key_type in ("zset", "hash") else ["value"]
+        self.model = StreamValueModel(column_list)
+        self.tableView.setModel(self.model)
+        if self.exact_check.isChecked():
+            start_command(find_exact, self.con, self.key_name, self.key_type, pattern,
+                          on_result=self.exact_matched, on_error=self.show_task_error)
+            return
+        self.search_task = start_task(self.run_search, self.con, self.key_name, self.key_type, pattern,
+                                      self.count_spin.value(), self.cur_key_length,
+                                      on_partial=self.search_matched, on_error=self.show_task_error,
+                                      on_progress=lambda progress: self.statusbar.showMessage(
+                                          'filtering... {}%, {} matches'.format(progress, self.model.rowCount())),
+                                      on_finished=self.search_stopped)
+        self.stop_search_button.setEnabled(True)
+
+    @staticmethod
+    def run_search(task, con, key_name, key_type, pattern, count, key_length):
+        """
+        后台线程:逐批扫描,每批匹配结果通过partial信号发回GUI线程
+        """
+        match_number = 0
+        for rows, progress in search_values(con, key_name, key_type, pattern, count, key_length):
+            if rows:
+                task.report_partial(rows)
+                match_number += len(rows)
+            task.report_progress(int(100 * progress))
+            if task.cancelled or match_number >= MAX_SEARCH_ROWS:
+                break
+        return match_number
+
+    def search_matched(self, rows):
+        if self.search_task and self.sender() is self.search_task.signals and isinstance(self.model, StreamValueModel):
+            self.model.append_rows(rows)
+
+    def exact_matched(self, rows):
+        if isinstance(self.model, StreamValueModel):
+            self.model.append_rows(rows)
+            self.statusbar.showMessage('{} matches'.format(self.model.rowCount()), 5000)
+
+    def search_stopped(self):
+        if not self.search_task or self.sender() is not self.search_task.signals:
+            return
+        self.statusbar.showMessage('{} matches{}'.format(
+            self.model.rowCount(), ' (stopped)' if self.search_task.cancelled else ''), 5000)
+        self.search_task = None
+        self.stop_search_button.setEnabled(False)
+
+    #  删除当前db中的某key
+    def delete_key(self):
+        result = up_window_question_by_bool(self, 'Delete key', 'Do you really want to delete this key?')
+        if result and self.key_name:
+            start_command(self.con.delete, self.key_name, on_result=self.key_deleted, on_error=self.show_task_error)
+
+    def key_deleted(self, result):
+        if result:
+            self.tableView.setModel(None)
+            self.cur_db_keys_number_reduce()
+            self.key_name = None
+
+    #  删除:返回要删除的数据
+    def select_indexs_to_delete(self):
+        if self.tableView.selectionModel():
+            indexs = self.tableView.selectionModel().selection().indexes()
+        else:
+            return
+        values_list = []
+        index_row_list = []
+        if len(indexs) > 0:
+            for index in indexs:
+                index_row_list.append(index.row())
+            index_row_list = list(set(index_row_list))
+            for index in index_row_list:
+                values_list.append(self.model.index(index, 0).data())
+            return values_list, sorted(index_row_list, reverse=True)
+        else:
+            return None, None
+
+    #  删除当前db中的某key的一行或多行数据
+    def delete_row(self):
+        """
+        删除当前的某行或多行数据
+        :return:
+        """
+        if self.key_type == "string":
+            self.delete_key()
+        elif self.key_type in ("hash", "set", "zset", "list"):
+            values_list, _ = self.select_indexs_to_delete()
+            if values_list:
+                result = up_window_question_by_bool(self, 'Delete row', 'Do you really want to delete these rows?')
+                if not result:
+                    return
+                start_command(self.delete_values, self.con, self.key_type, self.key_name, values_list,
+                              on_result=self.rows_deleted,
+                              on_error=self.show_task_error)
+
+    @staticmethod
+    def delete_values(con, key_type, key_name, values_list):
+        """
+        后台线程:按数据结构删除key中的多个值
+        :return: 删除后key中剩余的数据量
+        """
+        if key_type == "hash":
+            con.hdel(key_name, *values_list)
+            return con.hlen(key_name)
+        elif key_type == "set":
+            con.srem(key_name, *values_list)
+            return con.scard(key_name)
+        elif key_type == "zset":
+            con.zrem(key_name, *values_list)
+            return con.zcard(key_name)
+        elif key_type == "list":
+            for value in values_list:  # 从队列头至尾,删除第一个碰到的value
+                con.lrem(key_name, value)
+            return con.llen(key_name)
+
+    #  删除成功后重新加载当前key,key中数据被删光时更新db中key的数量
+    def rows_deleted(self, key_length):
+        if key_length == 0:
+            self.tableView.setModel(None)
+            self.key_size_view.setText('0')
+            self.cur_db_keys_number_reduce()
+            self.key_name = None
+        else:
+            self.show_data()
+
+    #  修改:返回要修改的数据
+    def select_indexs_to_save(self, limit_length):
+        if self.tableView.selectionModel():
+            indexs = self.tableView.selectionModel().selection().indexes()
+        else:
+            return
+        values_list = []
+        print(indexs)
+        if 0 < len(indexs) <= 2 and len(indexs) == limit_length:
+            # 必须为同一行的数据 self.key_type == "hash" or self.key_type == "zset"
+            if len(indexs) == 2 and indexs[0].row() == indexs[1].row():
+                values_list.append(indexs[0].row())
+                values_list.append(self.model.index(indexs[0].row(), 0).data())
+                values_list.append(self.model.index(indexs[0].row(), 1).data())
+            elif len(indexs) == 1 and self.key_type == "string":
+                values_list.append(self.model.index(indexs[0].row(), 0).data())
+            elif self.key_type == "list" or self.key_type == "set":
+                values_list.append(indexs[0].row())
+                values_list.append(self.model.index(indexs[0].row(), 0).data())
+            return values_list
+        else:
+            up_window_im_by_bool(self, False, "", "", "错误", "需要选择单行数据！")
+
+    #  修改前检查选中行所在的页已读取,正在读取或已被淘汰的页只有占位文字,没有可以删除的原始数据
+    def row_loaded(self):
+        indexs = self.tableView.selectionModel().selection().indexes() if self.tableView.selectionModel() else []
+        if indexs and not self.model.original_row(indexs[0].row()):
+            up_window_im_by_bool(self, False, "", "", "错误", "该行数据正在读取,请稍后再保存！")
+            return False
+        return True
+
+    #  修改并存储数据
+    def edit_save_data(self):
+        """
+        编辑并存储单条数据,由于情况种类太多.目前hash,set,zset仅通过表格模型中的原始数据来进行 删除添加操作
+        :return:
+        """
+        if self.key_type == "string" and self.value_read_only:
+            up_window_im_by_bool(self, False, "", "", "错误", "分块展示的string不能按行修改,请先整体读取！")
+        elif self.key_type in ("string", "list", "hash", "set", "zset"):
+            values_list = self.select_indexs_to_save(2 if self.key_type in ("hash", "zset") else 1)
+            if not values_list or (self.key_type != "string" and not self.row_loaded()):
+                return
+            original = self.model.original_row(values_list[0])[0] if self.key_type in ("hash", "set", "zset") \
+                else None
+            start_command(self.save_value, self.con, self.key_type, self.key_name, values_list, original,
+                          on_result=self.value_saved,
+                          on_error=self.show_task_error)
+
+    @staticmethod
+    def save_value(con, key_type, key_name, values_list, original):
+        """
+        后台线程:按数据结构写入修改后的值
+        :param values_list: select_indexs_to_save返回的数据
+        :param original: hash,set,zset中修改前的原始field/member,先删除再添加
+        :return:
+        """
+        if key_type == "string":
+            con.set(key_name, values_list[0])
+        elif key_type == "list":
+            con.lset(key_name, values_list[0], values_list[1])
+        elif key_type == "hash":
+            con.hdel(key_name, original)  # 删除
+            con.hset(key_name, values_list[1], values_list[2])  # 增加
+        elif key_type == "set":
+            con.srem(key_name, original)  # 删除
+            con.sadd(key_name, values_list[1])  # 增加
+        elif key_type == "zset":
+            con.zrem(key_name, original)  # 删除
+            con.zadd(key_name, {values_list[1]: values_list[2]})  # 增加
+
+    #  保存成功后提示并重新加载当前key
+    def value_saved(self, _):
+        up_window_im_by_bool(self, True, "Save value", "Value was updated", "", "")
+        self.show_data()
+
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+    install_event_loop(app)  # 安装了qasync时,异步引擎直接运行在Qt的事件循环中
+    myWin = ParentWindow()
+    myWin.child_window = ChildWindow(myWin)  # 父窗口关联子窗口
+    myWin.add_connection_button.clicked.connect(myWin.child_window.show)
+    myWin.show()
+    myWin.load_cached_census(refresh=True)  # 先展示缓存的统计结果,再在后台重新统计
+    sys.exit(exec_app(app))
+
@@ -0,0 +1,200 @@
+"""
+说明：此脚本用于在前缀数量过多时用概率数据结构统计key数量分布,内存占用固定,不随前缀数量增长
+Count-Min Sketch估算任意前缀的数量,Space-Saving保留数量最多的前缀,HyperLogLog估算不同前缀的数量
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import heapq
+import math
+from array import array
+
+
+MAX_EXACT_PREFIXES = 100000  # 精确统计时最多保留的前缀数量,超出后切换为概率统计
+TOP_PREFIXES = 1000  # 概率统计时保留的数量最多的前缀数量
+OTHER_PREFIX = '(other)'  # 未进入前TOP_PREFIXES的前缀合计为一项
+SKETCH_WIDTH = 1 << 14  # Count-Min Sketch每行的计数器数量,误差约为 总数*e/宽度
+SKETCH_DEPTH = 4  # Count-Min Sketch的行数,误差超出上述范围的概率约为 e^-行数
+HLL_PRECISION = 14  # HyperLogLog寄存器数量为2^14,标准误差约为0.8%
+HASH_MASK = (1 << 64) - 1
+
+
+class CountMinSketch(object):
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        """
+        :param width: 每行的计数器数量
+        :param depth: 行数
+        """
+        self.width = width
+        self.depth = depth
+        self._table = [array('q', [0]) * width for _ in range(depth)]
+
+    def _indexes(self, item):
+        # 用一次哈希的高低32位组合出depth个哈希值(Kirsch-Mitzenmacher)
+        value = hash(item) & HASH_MASK
+        low, high = value & 0xffffffff, value >> 32
+        return [(low + i * high) % self.width for i in range(self.depth)]
+
+    def add(self, item, number=1):
+        for row, index in zip(self._table, self._indexes(item)):
+            row[index] += number
+
+    def estimate(self, item):
+        """
+        :return: 数量的估计值,不小于真实数量
+        """
+        return min(row[index] for row, index in zip(self._table, self._indexes(item)))
+
+
+class SpaceSaving(object):
+    """
+    Space-Saving算法保留数量最多的元素.为减少淘汰次数,元素超过2倍容量时才批量淘汰到容量大小
+    """
+
+    def __init__(self, capacity=TOP_PREFIXES):
+        self.capacity = capacity
+        self._count_dict = dict()  # {元素:计数},计数不小于真实数量
+        self._error_dict = dict()  # {元素:计数可能多算的数量}
+        self._floor = 0  # 被淘汰元素的最大计数,新元素的计数从这里开始
+
+    def add(self, item, number=1):
+        if item in self._count_dict:
+            self._count_dict[item] += number
+            return
+        self._count_dict[item] = self._floor + number
+        self._error_dict[item] = self._floor
+        if len(self._count_dict) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self):
+        kept = set(heapq.nlargest(self.capacity, self._count_dict, key=self._count_dict.get))
+        for item in [item for item in self._count_dict if item not in kept]:
+            self._floor = max(self._floor, self._count_dict.pop(item))
+            self._error_dict.pop(item)
+
+    def top(self, n=None):
+        """
+        :param n: 返回的数量,默认为容量
+        :return: [(元素, 计数, 误差)],按计数从大到小排列
+        """
+        item_list = heapq.nlargest(n or self.capacity, self._count_dict, key=self._count_dict.get)
+        return [(item, self._count_dict[item], self._error_dict[item]) for item in item_list]
+
+
+class HyperLogLog(object):
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.m = 1 << precision
+        self._registers = bytearray(self.m)
+        self._alpha = 0.7213 / (1 + 1.079 / self.m)
+
+    def add(self, item):
+        value = hash(item) & HASH_MASK
+        index = value >> (64 - self.precision)
+        rest = value & ((1 << (64 - self.precision)) - 1)
+        rank = 64 - self.precision - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def count(self):
+        """
+        :return: 不同元素数量的估计值
+        """
+        estimate = self._alpha * self.m * self.m / sum(2.0 ** -register for register in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:  # 小基数时使用线性计数
+            estimate = self.m * math.log(self.m / float(zeros))
+        return int(round(estimate))
+
+
+class PrefixCounter(object):
+    """
+    各前缀的key数量.前缀数量不超过max_exact时精确统计,超出后切换为Count-Min Sketch + Space-Saving + HyperLogLog,
+    只保留数量最多的top_n个前缀,内存占用固定
+    """
+
+    def __init__(self, max_exact=MAX_EXACT_PREFIXES, top_n=TOP_PREFIXES):
+        """
+        :param max_exact: 精确统计时最多保留的前缀数量
+        :param top_n: 概率统计时保留的前缀数量
+        """
+        self.max_exact = max_exact
+        self.top_n = top_n
+        self.total = 0  # key总数,概率统计时仍然精确
+        self._number_dict = dict()  # 精确统计的结果 {key:number}
+        self._sketch = None
+        self._heavy_hitters = None
+        self._distinct = None
+
+    @property
+    def exact(self):
+        return self._sketch is None
+
+    def add(self, simple_key_name, number=1):
+        """
+        :param simple_key_name: 统计命名
+        :param number: 数量
+        :return:
+        """
+        self.total += number
+        if self._sketch is None:
+            self._number_dict[simple_key_name] = self._number_dict.get(simple_key_name, 0) + number
+            if len(self._number_dict) > self.max_exact:
+                self._switch_to_sketch()
+            return
+        self._sketch.add(simple_key_name, number)
+        self._heavy_hitters.add(simple_key_name, number)
+        self._distinct.add(simple_key_name)
+
+    def update(self, key_number_dict):
+        """
+        :param key_number_dict: 一个分片的统计结果 {key:number}
+        :return:
+        """
+        for simple_key_name, number in key_number_dict.items():
+            self.add(simple_key_name, number)
+
+    def _switch_to_sketch(self):
+        self._sketch = CountMinSketch()
+        self._heavy_hitters = SpaceSaving(self.top_n)
+        self._distinct = HyperLogLog()
+        for simple_key_name, number in self._number_dict.items():
+            self._sketch.add(simple_key_name, number)
+            self._heavy_hitters.add(simple_key_name, number)
+            self._distinct.add(simple_key_name)
+        self._number_dict = dict()
+
+    def distinct(self):
+        """
+        :return: 不同前缀的数量,概率统计时为HyperLogLog的估计值
+        """
+        return len(self._number_dict) if self._sketch is None else self._distinct.count()
+
+    def top(self, n=None):
+        """
+        :param n: 返回的数量,默认为top_n
+        :return: [(统计命名, 数量, 误差上限)],按数量从大到小排列.数量不小于真实数量,真实数量不小于 数量-误差上限
+        """
+        n = n or self.top_n
+        if self._sketch is None:
+            return [(simple_key_name, number, 0) for simple_key_name, number in
+                    heapq.nlargest(n, self._number_dict.items(), key=lambda item: item[1])]
+        top_list = []
+        for simple_key_name, count, error in self._heavy_hitters.top(n):
+            estimate = min(count, self._sketch.estimate(simple_key_name))  # 两者都不小于真实数量,取较小者
+            top_list.append((simple_key_name, estimate, max(0, estimate - (count - error))))
+        return sorted(top_list, key=lambda item: item[1], reverse=True)
+
+    def to_dict(self):
+        """
+        :return: {key:number}.精确统计时为结果的副本;概率统计时为数量最多的top_n个前缀,其余合计为OTHER_PREFIX
+        """
+        if self._sketch is None:
+            return dict(self._number_dict)
+        key_number_dict = {simple_key_name: number for simple_key_name, number, _ in self.top()}
+        other_number = self.total - sum(key_number_dict.values())
+        if other_number > 0:
+            key_number_dict[OTHER_PREFIX] = other_number
+        return key_number_dict
@@ -0,0 +1,255 @@
+"""
+说明：此脚本用于把统计,大key扫描,导出等只读的遍历任务路由到从库,减轻主库的压力
+从库来自连接信息中的replicas字段,sentinels字段(通过Sentinel发现主从),或主库INFO replication中的从库列表.
+选择复制延迟不超过上限且PING最快的从库,没有可用的从库时回到主库;写操作始终发送到主库
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import threading
+import time
+
+import redis
+from redis import RedisError
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from redis.sentinel import Sentinel
+
+from connection_manager import connection_manager
+
+
+MAX_LAG_SECONDS = 10  # 从库与主库最后一次通信超过该秒数时视为延迟过大,不使用
+CACHE_SECONDS = 30  # 选择结果的缓存时间,过期后重新测量
+PROBE_TIMEOUT = 1  # 探测从库和Sentinel时的超时秒数
+
+
+def parse_address_list(text):
+    """
+    :param text: "ip:port,ip:port",也可以是[(ip, port)]
+    :return: [(ip, port)]
+    """
+    if not text:
+        return []
+    if not isinstance(text, str):
+        return [(str(host), int(port)) for host, port in text]
+    address_list = []
+    for item in text.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.rpartition(':')
+        address_list.append((host or '127.0.0.1', int(port)))
+    return address_list
+
+
+def use_routing(redis_im):
+    """
+    :param redis_im: 连接信息 {'ip':, 'port':, 'auth':, 'read_from':, 'replicas':, 'sentinels':, 'master_name':}
+    :return: 是否需要路由,没有配置读路由字段的连接直接使用ip和port
+    """
+    return redis_im.get('read_from') == 'replica' or bool(redis_im.get('sentinels'))
+
+
+def info_replicas(host, port, password=None):
+    """
+    :return: 主库INFO replication中状态为online的从库 [(ip, port)]
+    """
+    con = redis.StrictRedis(connection_pool=connection_manager.get_pool(host, port, 0, password))
+    replica_list = []
+    for name, value in con.info('replication').items():
+        if name.startswith('slave') and isinstance(value, dict) and value.get('state') == 'online':
+            replica_list.append((str(value['ip']), int(value['port'])))
+    return replica_list
+
+
+def measure_replica(host, port, password=None, max_lag=MAX_LAG_SECONDS):
+    """
+    测量一个从库
+    :return: (复制延迟秒数, PING耗时秒数),不可用(连不上,不是从库,复制断开或延迟过大)时返回None
+    """
+    con = redis.StrictRedis(host=host, port=port, password=password, socket_timeout=PROBE_TIMEOUT,
+                            socket_connect_timeout=PROBE_TIMEOUT, retry=Retry(NoBackoff(), 0))  # 不可用时不重试
+    try:
+        start = time.monotonic()
+        con.ping()
+        latency = time.monotonic() - start
+        info_dict = con.info('replication')
+    except RedisError:
+        return None
+    finally:
+        con.close()
+    if info_dict.get('role') != 'slave' or info_dict.get('master_link_status') != 'up':
+        return None
+    lag = info_dict.get('master_last_io_seconds_ago', 0)
+    if lag < 0 or lag > max_lag:
+        return None
+    return lag, latency
+
+
+class ReadRouter(object):
+
+    def __init__(self, redis_im, max_lag=MAX_LAG_SECONDS, cache_seconds=CACHE_SECONDS):
+        """
+        :param redis_im: 连接信息,见use_routing
+        :param max_lag: 可以接受的最大复制延迟秒数
+        :param cache_seconds: 选择结果的缓存时间
+        """
+        self.redis_im = redis_im
+        self.max_lag = max_lag
+        self.cache_seconds = cache_seconds
+        self._lock = threading.Lock()  # 只保护选择结果,探测期间不持有,GUI线程读取缓存时不会被阻塞
+        self._probe_lock = threading.Lock()  # 同一时间只有一个后台线程探测
+        self._chosen = None  # (主库(ip, port), 读取使用的(ip, port))
+        self._chosen_at = None
+        self._failed_at = None  # 最近一次选择出错的时间,缓存时间内不在后台重复选择
+
+    def _sentinel(self):
+        sentinel_kwargs = {'socket_timeout': PROBE_TIMEOUT, 'socket_connect_timeout': PROBE_TIMEOUT,
+                           'retry': Retry(NoBackoff(), 0)}  # 不可用的Sentinel不重试,直接询问下一个
+        return Sentinel(parse_address_list(self.redis_im['sentinels']), sentinel_kwargs=sentinel_kwargs,
+                        socket_timeout=PROBE_TIMEOUT)
+
+    def discover(self):
+        """
+        :return: (主库(ip, port), [从库(ip, port)])
+        """
+        if self.redis_im.get('sentinels'):
+            sentinel = self._sentinel()
+            master_name = self.redis_im.get('master_name') or 'mymaster'
+            primary = sentinel.discover_master(master_name)
+            replica_list = sentinel.discover_slaves(master_name) if self.redis_im.get('read_from') == 'replica' else []
+            return (str(primary[0]), int(primary[1])), parse_address_list(replica_list)
+        primary = (str(self.redis_im['ip']), int(self.redis_im['port']))
+        replica_list = parse_address_list(self.redis_im.get('replicas'))
+        if not replica_list:
+            try:
+                replica_list = info_replicas(primary[0], primary[1], self.redis_im.get('auth'))
+            except RedisError:
+                replica_list = []
+        return primary, replica_list
+
+    def choose(self):
+        """
+        :return: (主库(ip, port), 读取使用的(ip, port)),没有可用的从库时两者相同
+        """
+        primary, replica_list = self.discover()
+        best, best_score = primary, None
+        for host, port in replica_list:
+            measure = measure_replica(host, port, self.redis_im.get('auth'), self.max_lag)
+            if measure is None:
+                continue
+            score = measure[0] * 1000 + measure[1] * 1000  # 延迟优先,延迟相同时选PING最快的
+            if best_score is None or score < best_score:
+                best, best_score = (host, port), score
+        return primary, best
+
+    def _expired(self):
+        return self._chosen_at is None or time.monotonic() - self._chosen_at > self.cache_seconds
+
+    def _get(self):
+        """
+        会访问Sentinel和从库,只在后台线程中调用
+        """
+        with self._lock:
+            if not self._expired():
+                return self._chosen
+        with self._probe_lock:
+            with self._lock:
+                if not self._expired():  # 等待期间其他线程已经选择完成
+                    return self._chosen
+            try:
+                chosen = self.choose()
+            except RedisError:
+                with self._lock:
+                    self._failed_at = time.monotonic()
+                raise
+            with self._lock:
+                self._chosen, self._chosen_at = chosen, time.monotonic()
+                return chosen
+
+    def primary(self):
+        return self._get()[0]
+
+    def read_node(self):
+        return self._get()[1]
+
+    def cached(self):
+        """
+        不做探测,可以在GUI线程调用
+        :return: (最近一次的选择结果,从未选择过时为None, 是否需要在后台重新选择)
+        """
+        with self._lock:
+            failed = self._failed_at is not None and time.monotonic() - self._failed_at <= self.cache_seconds
+            return self._chosen, self._expired() and not failed
+
+    def invalidate(self):
+        """
+        下次使用时重新选择,例如从库连接出错后.重新选择完成前cached仍返回原来的结果
+        """
+        with self._lock:
+            self._chosen_at = None
+            self._failed_at = None
+
+
+_router_lock = threading.Lock()
+_router_dict = dict()  # {连接信息:ReadRouter}
+
+
+def get_router(redis_im):
+    key = tuple(sorted((name, str(value)) for name, value in redis_im.items()))
+    with _router_lock:
+        if key not in _router_dict:
+            _router_dict[key] = ReadRouter(redis_im)
+        return _router_dict[key]
+
+
+def read_connection(redis_im):
+    """
+    :param redis_im: 连接信息
+    :return: 只读遍历任务使用的连接信息,ip和port替换为选中的从库(或Sentinel发现的主库)
+    """
+    if not use_routing(redis_im):
+        return redis_im
+    host, port = get_router(redis_im).read_node()
+    return dict(redis_im, ip=host, port=port)
+
+
+def write_connection(redis_im):
+    """
+    :param redis_im: 连接信息
+    :return: 写操作使用的连接信息,配置了Sentinel时ip和port替换为当前的主库
+    """
+    if not redis_im.get('sentinels'):
+        return redis_im
+    host, port = get_router(redis_im).primary()
+    return dict(redis_im, ip=host, port=port)
+
+
+def resolve_connection(redis_im):
+    """
+    选择主库和从库并缓存,之后cached_connection直接返回结果.会访问Sentinel和从库,只在后台线程中调用
+    :param redis_im: 连接信息
+    """
+    if use_routing(redis_im):
+        get_router(redis_im).primary()
+
+
+def cached_connection(redis_im, read=False):
+    """
+    与read_connection和write_connection相同,但只使用缓存的选择结果,不做探测,可以在GUI线程调用
+    :param redis_im: 连接信息
+    :param read: 为True时返回只读遍历任务使用的连接信息,否则为写操作使用的连接信息
+    :return: (连接信息, 是否需要在后台调用resolve_connection),从未选择过时连接信息为None
+    """
+    if not (use_routing(redis_im) if read else redis_im.get('sentinels')):
+        return redis_im, False
+    chosen, expired = get_router(redis_im).cached()
+    if chosen is None:
+        return None, expired
+    host, port = chosen[1] if read else chosen[0]
+    return dict(redis_im, ip=host, port=port), expired
+
+
+def invalidate(redis_im):
+    if use_routing(redis_im):
+        get_router(redis_im).invalidate()
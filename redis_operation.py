@@ -1,305 +1,902 @@
-"""
-说明：此脚本用于执行redis增删改查
-作者：huangjunhao
-日期：2021-05-19
-"""
-
-import redis
-from redis import ConnectionError
-
-
-class RedisOperation(object):
-
-    def __init__(self, redis_db, redis_host, redis_port, password=None):
-        """
-        :param redis_db: db号码(0-15)
-        :param redis_host: ip
-        :param redis_port: 端口
-        :param password: 密码
-        """
-        if password:
-            redis_pool = redis.ConnectionPool(db=redis_db, host=redis_host, port=redis_port, password=password)
-            self._db = redis.StrictRedis(connection_pool=redis_pool)
-        else:
-            redis_pool = redis.ConnectionPool(db=redis_db, host=redis_host, port=redis_port)
-            self._db = redis.StrictRedis(connection_pool=redis_pool)
-
-    def set(self, name, value):
-        """
-        string:设置给定key的值.如果key已经存储其他值,SET就覆写旧值,无视该key的数据类型
-        :param name: db的key值
-        :param value: value
-        :return: 返回True代表set成功
-        """
-        return self._db.set(name, value)
-
-    def get(self, name):
-        """
-        string:用于获取指定key的值.如果key不存在,返回None
-        :param name: db的key值
-        :return: value
-        """
-        return self._db.get(name).decode()
-
-    def sadd(self, name, value):
-        """
-        set:判定数据在set中是否重复
-        :param name: db的key值
-        :param value: value
-        :return: 1代表数据不存在并加入了数据,0代表数据已存在
-        """
-        return self._db.sadd(name, value)
-
-    def scard(self, name):
-        """
-        set:返回集合中元素的数量.
-        :param name: db的key值
-        :return: 集合的数量.当集合 key 不存在时，返回 0.
-        """
-        return self._db.scard(name)
-
-    def srem(self, name, *value):
-        """
-        set:删除set中某值
-        :param name: db的key值
-        :param value: 想删除的value值,可以有多个(必须为list类型)
-        :return: 1代表数据存在并已删除,0代表数据不存在
-        """
-        return self._db.srem(name, *value)
-
-    def sscan_iter(self, name):
-        """
-        set:迭代获取
-        :param name: db的key值
-        :return: generator
-        """
-        return self._db.sscan_iter(name)
-
-    def lpop(self, name):
-        """
-        list:左弹出
-        :param name: db的key值
-        :return: value
-        """
-        return self._db.lpop(name).decode()
-
-    def lpush(self, name, value):
-        """
-        list:左插入
-        :param name: db的key值
-        :param data_str: value
-        :return: 当前key中的value数量
-        """
-        return self._db.lpush(name, value)
-
-    def lrange(self, name):
-        """
-        list:迭代获取
-        :param name: db的key值
-        :return:
-        """
-        start = 0
-        end = 1000
-        while True:
-            data = self._db.lrange(name, start, end)
-            if not data:
-                break
-            for im in data:
-                yield im
-            start += 1000
-            end += 1000
-
-    def lset(self, name, index, value):
-        """
-        通过索引来设置元素的值
-        :param name: db的key值
-        :param index: 位置
-        :param value: value
-        :return: 操作成功返回True,否则返回错误信息。
-        """
-        return self._db.lset(name, index, value)
-
-    def llen(self, name):
-        """
-        list: 用于返回列表的长度.如果列表key不存在,则 key被解释为一个空列表,返回 0.如果 key不是列表类型,返回一个错误.
-        :param name: db的key值
-        :return: 列表的长度
-        """
-        return self._db.llen(name)
-
-    def lrem(self, name, value, count=1):
-        """
-        list:删除某value值
-        :param name: db的key值
-        :param value: 想删除的value值
-        :param count: 默认为1,正数表示从表头开始向表尾搜索,移除与VALUE相等的元素,数量为 COUNT
-        :return: 被移除元素的数量,列表不存在该元素时返回0.
-        """
-        return self._db.lrem(name, count, value)
-
-    def hset(self, name, key, field):
-        """
-        hash:插入hash值
-        :param name: db的key值
-        :param key: hash结构的key值
-        :param field: hash结构的field值
-        :return: hash结构的field值已存在则返回0,不存在返回1
-        """
-        return self._db.hset(name, key, field)
-
-    def hget(self, name, field):
-        """
-        hash:获取hash值
-        :param name: db的key值
-        :param field: hash结构的field值
-        :return: hash结构的value值,不存在则返回None
-        """
-        temp = self._db.hget(name, str(field))
-        if temp is not None:
-            return temp.decode()
-
-    def hscan_iter(self, name):
-        """
-        hash:迭代获取数据
-        :param name: db的key值
-        :return: generator
-        """
-        return self._db.hscan_iter(name)
-
-    def hlen(self, name):
-        """
-        hash:获取哈希表中字段的数量
-        :param name: db的key值
-        :return: 哈希表中字段的数量.当 key不存在时,返回 0.
-        """
-        return self._db.hlen(name)
-
-    def hdel(self, name, *field):
-        """
-        :param name: db的key值
-        :param key: 想删除的field值,可以有多个(必须为list类型)
-        :return: 被成功删除field的数量
-        """
-        return self._db.hdel(name, *field)
-
-    def zadd(self, name, mapping):
-        """
-        zset:插入数据
-        :param name: db的key值
-        :param mapping: dict {value:score}
-        :return: 新增value的个数
-        """
-        return self._db.zadd(name, mapping)
-
-    def zrank(self, name, value):
-        """
-        zset:查找数据排名,由小到大排序
-        :param name: db的key值
-        :param value: 该value的名称
-        :return: 该value的排名
-        """
-        return self._db.zrank(name, value)
-
-    def zscore(self, name, value):
-        """
-        zscore:查找数据分数
-        :param name: db的key值
-        :param value: 该value的名称
-        :return: 该value的分数
-        """
-        return self._db.zscore(name, value)
-
-    def zcard(self, name):
-        """
-        用于计算集合中元素的数量
-        :param name: db的key值
-        :return: 当 key存在且是有序集类型时,返回有序集的基数.当 key不存在,返回 0.
-        """
-        return self._db.zcard(name)
-
-    def zscan_iter(self, name):
-        """
-        zset:迭代获取数据
-        :param name: db的key值
-        :return: generator
-        """
-        return self._db.zscan_iter(name)
-
-    def zrem(self, name, *value):
-        """
-        zset: 删除一个或多个key
-        :param name: db的key值
-        :param value: 移除成员的名称,可以有多个(必须为list类型)
-        :return: 被成功移除的成员的数量
-        """
-        return self._db.zrem(name, *value)
-
-    def scan_all_keys(self):
-        """
-        遍历所有的KEY,统计数量分布
-        :return: {key:number}
-        """
-        key_number_dict = dict()  # 不同业务类型的key的数量
-        scan_cursor = 0
-        # 统计遍历key的数量
-        scan_num = 0
-        while True:
-            key_list = self._db.scan(scan_cursor, count=10000)  # 分片为10000条数据
-            scan_cursor = key_list[0]
-            scan_num = scan_num + len(key_list[1])
-            for key_name in key_list[1]:
-                key_name = transform_key_name_to_simple(key_name.decode())
-                key_number_dict[key_name] = key_number_dict.get(key_name, 0)+1
-            if scan_cursor == 0:
-                return key_number_dict
-
-    def get_type(self, name):
-        """
-        获得key的数据结构
-        :param name: db的key值
-        :return: key的数据类型,key不存在返回None
-        """
-        key_type = self._db.type(name).decode()
-        if key_type == 'none':
-            return None
-        return key_type
-
-    def ping(self):
-        """
-        测试是否可以连通redis
-        :return:
-        """
-        self._db.ping()
-
-    def delete(self, name):
-        """
-        删除某key
-        :param name: db的key值
-        :return: 返回1代表成功删除,返回0代表key不存在
-        """
-        return self._db.delete(name)
-
-
-def test_connection(ip, port, password, db=0):
-    try:
-        RedisOperation(db, ip, port, password).ping()
-        return True
-    except ConnectionError:
-        return False
-
-
-def transform_key_name_to_simple(key_name):
-    """
-    key命名规则和统计规则之间的转换
-    :return: 统计命名
-    """
-    return key_name.split(":")[0]
-
-
-if __name__ == '__main__':
-    x = RedisOperation(redis_db='2', redis_host='localhost', redis_port=6379, password='')
-    for i in range(10):
-        x.lpush('list', str(i))
-        x.sadd('set', str(i))
-        x.zadd('zset', {str(i): i})
-        x.hset('hash', str(i), str(i))
+"""
+说明：此脚本用于执行redis增删改查
+作者：huangjunhao
+日期：2021-05-19
+"""
+
+import heapq
+import re
+import time
+
+import redis
+from redis import ConnectionError, ResponseError
+
+from connection_manager import connection_manager
+from prefix_sketch import PrefixCounter, MAX_EXACT_PREFIXES, TOP_PREFIXES, OTHER_PREFIX
+
+
+# 各数据类型获取长度的命令,string为字节数
+LENGTH_COMMAND_DICT = {'string': 'STRLEN', 'list': 'LLEN', 'hash': 'HLEN', 'set': 'SCARD', 'zset': 'ZCARD',
+                       'stream': 'XLEN'}
+
+CENSUS_COUNT = 10000  # 统计key数量时每次SCAN的COUNT
+
+# 执行一次SCAN,在redis中按第一个":"之前的部分统计数量,与transform_key_name_to_simple的规则一致
+# 返回 [下一个cursor, 前缀1, 数量1, 前缀2, 数量2, ...]
+PREFIX_COUNT_SCRIPT = """
+local result = redis.call('SCAN', ARGV[1], 'COUNT', ARGV[2])
+local number_dict = {}
+local prefix_list = {}
+for _, key in ipairs(result[2]) do
+    local prefix = key
+    local pos = string.find(key, ':', 1, true)
+    if pos then
+        prefix = string.sub(key, 1, pos - 1)
+    end
+    if number_dict[prefix] then
+        number_dict[prefix] = number_dict[prefix] + 1
+    else
+        number_dict[prefix] = 1
+        prefix_list[#prefix_list + 1] = prefix
+    end
+end
+local reply = {result[1]}
+for _, prefix in ipairs(prefix_list) do
+    reply[#reply + 1] = prefix
+    reply[#reply + 1] = number_dict[prefix]
+end
+return reply
+"""
+
+
+class RedisOperation(object):
+
+    def __init__(self, redis_db, redis_host, redis_port, password=None, connection_pool=None, cluster=False,
+                 read_host=None, read_port=None, throttle=None):
+        """
+        :param redis_db: db号码(0-15)
+        :param redis_host: ip
+        :param redis_port: 端口
+        :param password: 密码
+        :param connection_pool: 同一server共享的连接池,传入时独占池中的一个连接并通过SELECT切换到redis_db.
+                                不传入时从connection_manager中获取该db缓存的连接池
+        :param cluster: 为True时redis_host为集群中的任意节点,每个命令按key发送到所在的master,只能使用db 0.
+                        遍历整个集群的操作(SCAN,DBSIZE)依次访问所有master,需要并发时见cluster.fan_out
+        :param read_host: 只读命令(读取数据,SCAN,TYPE等)使用的从库ip,写命令仍然发送到redis_host,见read_routing
+        :param read_port: 从库端口
+        :param throttle: scan_throttle.ScanThrottle,传入时遍历类操作按其预算调整COUNT,暂停和限速
+        """
+        self._shared_pool = connection_pool
+        self._redis_db = redis_db
+        self._prefix_count_script = None  # 按前缀统计的lua脚本,第一次使用时注册
+        self.cluster = cluster
+        self.throttle = throttle
+        if cluster:
+            self._db = connection_manager.get_cluster(redis_host, redis_port, password)
+        elif connection_pool is not None:
+            self._db = redis.StrictRedis(connection_pool=connection_pool, single_connection_client=True)
+            self._db.execute_command('SELECT', redis_db)
+        else:
+            redis_pool = connection_manager.get_pool(redis_host, redis_port, redis_db, password)
+            self._db = redis.StrictRedis(connection_pool=redis_pool)
+        self._read_db = self._db  # 只读命令使用的连接
+        if read_host is not None and not cluster and connection_pool is None and \
+                (str(read_host), int(read_port)) != (str(redis_host), int(redis_port)):
+            self._read_db = redis.StrictRedis(
+                connection_pool=connection_manager.get_pool(read_host, read_port, redis_db, password))
+
+    def close(self):
+        """
+        归还共享连接池中独占的连接,归还前切换回连接池默认的db,避免影响其他使用者
+        :return:
+        """
+        if self._shared_pool is not None:
+            try:
+                self._db.execute_command('SELECT', self._shared_pool.connection_kwargs.get('db', 0))
+            finally:
+                self._db.close()
+
+    def _pipeline(self, read=False):
+        """
+        pipeline会从连接池中另取一个连接,使用共享连接池时需要先SELECT到当前db
+        :param read: 为True时pipeline中只有只读命令,发送到只读连接
+        :return: 非事务的pipeline
+        """
+        if self.cluster:
+            return self._db.pipeline()  # 集群的pipeline按key把命令分组发送到各master
+        pipe = (self._read_db if read else self._db).pipeline(transaction=False)
+        if self._shared_pool is not None:
+            pipe.execute_command('SELECT', self._redis_db)
+        return pipe
+
+    def _execute_pipeline(self, pipe, raise_on_error=True):
+        """
+        执行_pipeline创建的pipeline,使用共享连接池时在最后切换回默认的db,并去掉两次SELECT的结果
+        :param pipe: _pipeline创建的pipeline
+        :param raise_on_error: 为False时出错的命令以异常实例的形式返回
+        :return: 各命令的结果列表
+        """
+        if self.throttle is not None:
+            self.throttle.spend(len(pipe))  # 集群pipeline的命令不在command_stack中
+        if self._shared_pool is None:
+            return pipe.execute(raise_on_error=raise_on_error)
+        pipe.execute_command('SELECT', self._shared_pool.connection_kwargs.get('db', 0))
+        return pipe.execute(raise_on_error=raise_on_error)[1:-1]
+
+    def set(self, name, value):
+        """
+        string:设置给定key的值.如果key已经存储其他值,SET就覆写旧值,无视该key的数据类型
+        :param name: db的key值
+        :param value: value
+        :return: 返回True代表set成功
+        """
+        return self._db.set(name, value)
+
+    def get(self, name):
+        """
+        string:用于获取指定key的值.如果key不存在,返回None
+        :param name: db的key值
+        :return: value
+        """
+        return self._read_db.get(name).decode()
+
+    def strlen(self, name):
+        """
+        string:获取值的字节数,key不存在时返回0
+        :param name: db的key值
+        :return: 字节数
+        """
+        return self._read_db.strlen(name)
+
+    def getrange(self, name, start, end):
+        """
+        string:获取start至end(包含end)之间的字节,用于分块读取大string
+        :param name: db的key值
+        :param start: 开始位置
+        :param end: 结束位置,-1为最后一个字节
+        :return: bytes
+        """
+        return self._read_db.getrange(name, start, end)
+
+    def sadd(self, name, value):
+        """
+        set:判定数据在set中是否重复
+        :param name: db的key值
+        :param value: value
+        :return: 1代表数据不存在并加入了数据,0代表数据已存在
+        """
+        return self._db.sadd(name, value)
+
+    def scard(self, name):
+        """
+        set:返回集合中元素的数量.
+        :param name: db的key值
+        :return: 集合的数量.当集合 key 不存在时，返回 0.
+        """
+        return self._read_db.scard(name)
+
+    def srem(self, name, *value):
+        """
+        set:删除set中某值
+        :param name: db的key值
+        :param value: 想删除的value值,可以有多个(必须为list类型)
+        :return: 1代表数据存在并已删除,0代表数据不存在
+        """
+        return self._db.srem(name, *value)
+
+    def sscan_iter(self, name):
+        """
+        set:迭代获取
+        :param name: db的key值
+        :return: generator
+        """
+        return self._read_db.sscan_iter(name)
+
+    def sismember(self, name, value):
+        """
+        set:判断value是否在set中
+        :param name: db的key值
+        :param value: value
+        :return: 是否存在
+        """
+        return bool(self._read_db.sismember(name, value))
+
+    def sscan(self, name, cursor=0, match=None, count=None):
+        """
+        set:从cursor开始扫描一批数据
+        :param name: db的key值
+        :param cursor: 上一次返回的cursor,0代表从头开始
+        :param match: 匹配的模式
+        :param count: 每次扫描的数量提示
+        :return: (下一个cursor, [value])
+        """
+        return self._read_db.sscan(name, cursor, match=match, count=count)
+
+    def lpop(self, name):
+        """
+        list:左弹出
+        :param name: db的key值
+        :return: value
+        """
+        return self._db.lpop(name).decode()
+
+    def lpush(self, name, value):
+        """
+        list:左插入
+        :param name: db的key值
+        :param data_str: value
+        :return: 当前key中的value数量
+        """
+        return self._db.lpush(name, value)
+
+    def lrange(self, name, step=1000):
+        """
+        list:迭代获取
+        :param name: db的key值
+        :param step: 每次LRANGE获取的数量
+        :return:
+        """
+        start = 0
+        while True:
+            data = self._read_db.lrange(name, start, start + step - 1)
+            if not data:
+                break
+            for im in data:
+                yield im
+            start += step
+
+    def lrange_page(self, name, start, end):
+        """
+        list:获取start至end(包含end)之间的数据
+        :param name: db的key值
+        :param start: 开始位置
+        :param end: 结束位置
+        :return: [value]
+        """
+        return self._read_db.lrange(name, start, end)
+
+    def lset(self, name, index, value):
+        """
+        通过索引来设置元素的值
+        :param name: db的key值
+        :param index: 位置
+        :param value: value
+        :return: 操作成功返回True,否则返回错误信息。
+        """
+        return self._db.lset(name, index, value)
+
+    def llen(self, name):
+        """
+        list: 用于返回列表的长度.如果列表key不存在,则 key被解释为一个空列表,返回 0.如果 key不是列表类型,返回一个错误.
+        :param name: db的key值
+        :return: 列表的长度
+        """
+        return self._read_db.llen(name)
+
+    def lrem(self, name, value, count=1):
+        """
+        list:删除某value值
+        :param name: db的key值
+        :param value: 想删除的value值
+        :param count: 默认为1,正数表示从表头开始向表尾搜索,移除与VALUE相等的元素,数量为 COUNT
+        :return: 被移除元素的数量,列表不存在该元素时返回0.
+        """
+        return self._db.lrem(name, count, value)
+
+    def hset(self, name, key, field):
+        """
+        hash:插入hash值
+        :param name: db的key值
+        :param key: hash结构的key值
+        :param field: hash结构的field值
+        :return: hash结构的field值已存在则返回0,不存在返回1
+        """
+        return self._db.hset(name, key, field)
+
+    def hget(self, name, field):
+        """
+        hash:获取hash值
+        :param name: db的key值
+        :param field: hash结构的field值
+        :return: hash结构的value值,不存在则返回None
+        """
+        temp = self._read_db.hget(name, str(field))
+        if temp is not None:
+            return temp.decode()
+
+    def hscan_iter(self, name):
+        """
+        hash:迭代获取数据
+        :param name: db的key值
+        :return: generator
+        """
+        return self._read_db.hscan_iter(name)
+
+    def hscan(self, name, cursor=0, match=None, count=None):
+        """
+        hash:从cursor开始扫描一批数据
+        :param name: db的key值
+        :param cursor: 上一次返回的cursor,0代表从头开始
+        :param match: 匹配的模式
+        :param count: 每次扫描的数量提示
+        :return: (下一个cursor, {field:value})
+        """
+        return self._read_db.hscan(name, cursor, match=match, count=count)
+
+    def hlen(self, name):
+        """
+        hash:获取哈希表中字段的数量
+        :param name: db的key值
+        :return: 哈希表中字段的数量.当 key不存在时,返回 0.
+        """
+        return self._read_db.hlen(name)
+
+    def hdel(self, name, *field):
+        """
+        :param name: db的key值
+        :param key: 想删除的field值,可以有多个(必须为list类型)
+        :return: 被成功删除field的数量
+        """
+        return self._db.hdel(name, *field)
+
+    def zadd(self, name, mapping):
+        """
+        zset:插入数据
+        :param name: db的key值
+        :param mapping: dict {value:score}
+        :return: 新增value的个数
+        """
+        return self._db.zadd(name, mapping)
+
+    def zrank(self, name, value):
+        """
+        zset:查找数据排名,由小到大排序
+        :param name: db的key值
+        :param value: 该value的名称
+        :return: 该value的排名
+        """
+        return self._read_db.zrank(name, value)
+
+    def zscore(self, name, value):
+        """
+        zscore:查找数据分数
+        :param name: db的key值
+        :param value: 该value的名称
+        :return: 该value的分数
+        """
+        return self._read_db.zscore(name, value)
+
+    def zcard(self, name):
+        """
+        用于计算集合中元素的数量
+        :param name: db的key值
+        :return: 当 key存在且是有序集类型时,返回有序集的基数.当 key不存在,返回 0.
+        """
+        return self._read_db.zcard(name)
+
+    def zcount(self, name, min_score, max_score):
+        """
+        zset:获取分数在min_score至max_score之间的数据数量
+        :param name: db的key值
+        :param min_score: 最小分数,可以为'-inf'或'(1'等redis格式
+        :param max_score: 最大分数,可以为'+inf'
+        :return: 数量
+        """
+        return self._read_db.zcount(name, min_score, max_score)
+
+    def zrange_page(self, name, start, end, desc=False):
+        """
+        zset:按排名获取start至end(包含end)之间的数据
+        :param name: db的key值
+        :param start: 开始排名
+        :param end: 结束排名
+        :param desc: 为True时按分数由大到小排名
+        :return: [(value, score)]
+        """
+        return self._read_db.zrange(name, start, end, desc=desc, withscores=True)
+
+    def zrangebyscore_page(self, name, min_score, max_score, offset, count, desc=False):
+        """
+        zset:按分数获取min_score至max_score之间的一页数据
+        :param name: db的key值
+        :param min_score: 最小分数
+        :param max_score: 最大分数
+        :param offset: 跳过的条数
+        :param count: 最多返回的条数
+        :param desc: 为True时按分数由大到小返回
+        :return: [(value, score)]
+        """
+        if desc:
+            return self._read_db.zrevrangebyscore(name, max_score, min_score, offset, count, withscores=True)
+        return self._read_db.zrangebyscore(name, min_score, max_score, offset, count, withscores=True)
+
+    def zscan_iter(self, name):
+        """
+        zset:迭代获取数据
+        :param name: db的key值
+        :return: generator
+        """
+        return self._read_db.zscan_iter(name)
+
+    def zscan(self, name, cursor=0, match=None, count=None):
+        """
+        zset:从cursor开始扫描一批数据
+        :param name: db的key值
+        :param cursor: 上一次返回的cursor,0代表从头开始
+        :param match: 匹配的模式
+        :param count: 每次扫描的数量提示
+        :return: (下一个cursor, [(value, score)])
+        """
+        return self._read_db.zscan(name, cursor, match=match, count=count)
+
+    def zrem(self, name, *value):
+        """
+        zset: 删除一个或多个key
+        :param name: db的key值
+        :param value: 移除成员的名称,可以有多个(必须为list类型)
+        :return: 被成功移除的成员的数量
+        """
+        return self._db.zrem(name, *value)
+
+    def _throttled_scan(self, scan_fn, count, *args, **kwargs):
+        """
+        执行一次SCAN类的调用,有throttle时按预算调整COUNT,调用前暂停并限速,调用后根据耗时调整
+        :param scan_fn: scan_fn(*args, count=COUNT, **kwargs)
+        :param count: 调用方指定的COUNT
+        :return: scan_fn的返回值
+        """
+        if self.throttle is None:
+            return scan_fn(*args, count=count, **kwargs)
+        count = self.throttle.count(count)
+        self.throttle.before_scan(None if self.cluster else self._read_db)
+        start = time.monotonic()
+        try:
+            return scan_fn(*args, count=count, **kwargs)
+        finally:
+            self.throttle.after_scan(time.monotonic() - start, count)
+
+    def scan_keys_batches(self, count=10000, match=None):
+        """
+        按SCAN分片遍历所有的KEY
+        :param count: 每次SCAN的COUNT,有throttle时为调整的上限
+        :param match: SCAN的MATCH模式,为None时遍历所有key
+        :return: generator (本次SCAN返回的cursor, key列表)
+        """
+        if self.cluster:  # 依次遍历每个master,cursor只代表当前master的进度
+            for node in self._read_db.get_primaries():
+                scan_cursor = 0
+                while True:
+                    cursor_dict, key_list = self._throttled_scan(self._read_db.scan, count, scan_cursor, match=match,
+                                                                 target_nodes=node)
+                    scan_cursor = cursor_dict[node.name]
+                    yield scan_cursor, key_list
+                    if scan_cursor == 0:
+                        break
+            return
+        scan_cursor = 0
+        while True:
+            scan_cursor, key_list = self._throttled_scan(self._read_db.scan, count, scan_cursor, match=match)
+            yield scan_cursor, key_list
+            if scan_cursor == 0:
+                return
+
+    def scan_prefix_counts(self, scan_cursor, count=10000):
+        """
+        在redis中执行一次SCAN并按前缀统计,只有统计结果会返回客户端
+        :param scan_cursor: 上一次返回的cursor,0代表从头开始
+        :param count: SCAN的COUNT
+        :return: (下一个cursor, {key:number})
+        """
+        if self._prefix_count_script is None:
+            self._prefix_count_script = self._read_db.register_script(PREFIX_COUNT_SCRIPT)
+        return parse_prefix_counts(self._prefix_count_script(args=[scan_cursor, count]))
+
+    def scan_prefix_batches(self, count=10000, server_side=False, namespace_rule=None, key_callback=None):
+        """
+        按SCAN分片统计key数量分布
+        :param count: 每次SCAN的COUNT
+        :param server_side: 为True时通过lua脚本在redis中统计,redis不支持脚本时自动改为在客户端统计.
+                            lua脚本只实现了默认规则,使用其他命名空间规则时在客户端统计
+        :param namespace_rule: key_namespace.NamespaceRule,为None时使用transform_key_name_to_simple
+        :param key_callback: 客户端统计时每个SCAN分片的key名列表的回调 key_callback(key列表),用于建立key索引
+        :return: generator (本次SCAN返回的cursor, 分片的{key:number})
+        """
+        transform = namespace_rule.transform_to_name if namespace_rule else transform_key_name_to_simple
+        if server_side and (namespace_rule is None or namespace_rule.is_simple):
+            try:
+                scan_cursor, batch_key_number_dict = self._throttled_scan(self.scan_prefix_counts, count, 0)
+            except ResponseError:
+                server_side = False  # 脚本被禁用等情况,此时还没有返回任何分片,可以直接从头改为客户端统计
+            else:
+                yield scan_cursor, batch_key_number_dict
+                while scan_cursor != 0:
+                    scan_cursor, batch_key_number_dict = self._throttled_scan(self.scan_prefix_counts, count,
+                                                                              scan_cursor)
+                    yield scan_cursor, batch_key_number_dict
+                return
+        for scan_cursor, key_list in self.scan_keys_batches(count=count):
+            if key_callback:
+                key_callback(key_list)
+            yield scan_cursor, count_key_prefixes(key_list, transform)
+
+    def scan_all_keys(self, batch_callback=None, cancel_event=None, server_side=False, namespace_rule=None,
+                      key_callback=None, count=CENSUS_COUNT):
+        """
+        遍历所有的KEY,统计数量分布
+        :param batch_callback: 每个SCAN分片统计完成后的回调 batch_callback(分片的{key:number}, 进度0-1)
+        :param cancel_event: threading.Event,被set后停止遍历并返回已统计的部分
+        :param server_side: 为True时在redis中按前缀统计,key名不经过网络传输
+        :param namespace_rule: key_namespace.NamespaceRule,为None时使用transform_key_name_to_simple
+        :param key_callback: 客户端统计时每个SCAN分片的key名列表的回调,见scan_prefix_batches
+        :param count: 每次SCAN的COUNT,有throttle时为调整的上限
+        :return: {key:number},前缀数量过多时只保留数量最多的前缀,其余合计为prefix_sketch.OTHER_PREFIX
+        """
+        key_number_counter = PrefixCounter()  # 不同业务类型的key的数量,前缀过多时切换为概率统计
+        dbsize = self._read_db.dbsize() if batch_callback else 0
+        for scan_cursor, batch_key_number_dict in self.scan_prefix_batches(count, server_side, namespace_rule,
+                                                                               key_callback):
+            key_number_counter.update(batch_key_number_dict)
+            if batch_callback:
+                batch_callback(batch_key_number_dict, scan_cursor_progress(scan_cursor, dbsize))
+            if cancel_event is not None and cancel_event.is_set():
+                break
+        return key_number_counter.to_dict()
+
+    def describe_keys(self, key_list, memory=True):
+        """
+        用两次pipeline获取一批key的类型,长度和占用内存,不会每个key都产生一次网络往返
+        第一次pipeline:TYPE和MEMORY USAGE;第二次pipeline:按类型执行STRLEN/LLEN/HLEN/SCARD/ZCARD/XLEN
+        :param key_list: key名列表
+        :param memory: 是否获取MEMORY USAGE
+        :return: [(key_name, key_type, 长度, 内存字节数)],执行期间被删除的key不返回,无法获取的内存为None
+        """
+        pipe = self._pipeline(read=True)
+        for key_name in key_list:
+            pipe.type(key_name)
+            if memory:
+                pipe.memory_usage(key_name)
+        key_info_list = key_info_from_reply(key_list, self._execute_pipeline(pipe, raise_on_error=False), memory)
+        pipe = self._pipeline(read=True)
+        for key_name, key_type, command, memory_usage in key_info_list:
+            if command:
+                pipe.execute_command(command, key_name)
+        return described_keys(key_info_list, self._execute_pipeline(pipe, raise_on_error=False))
+
+    def scan_key_stats(self, batch_callback=None, cancel_event=None, memory=True, count=1000, namespace_rule=None,
+                       key_callback=None):
+        """
+        遍历所有的KEY,按前缀统计数据类型分布,元素数量和占用内存
+        :param batch_callback: 每个SCAN分片统计完成后的回调 batch_callback(分片的统计结果, 进度0-1)
+        :param cancel_event: threading.Event,被set后停止遍历并返回已统计的部分
+        :param memory: 是否统计MEMORY USAGE
+        :param count: 每次SCAN的COUNT,同时也是每次pipeline中的key数量
+        :param namespace_rule: key_namespace.NamespaceRule,为None时使用transform_key_name_to_simple
+        :param key_callback: 每个SCAN分片的key名列表的回调 key_callback(key列表)
+        :return: {key:{'number':key数量, 'types':{类型:数量}, 'elements':元素总数, 'mean':平均元素数, 'bytes':内存字节数}}
+                 前缀过多时只保留数量最多的前缀,见KeyStatsCounter
+        """
+        key_stats_counter = KeyStatsCounter()
+        transform = namespace_rule.transform_to_name if namespace_rule else transform_key_name_to_simple
+        dbsize = self._read_db.dbsize() if batch_callback else 0
+        for scan_cursor, key_list in self.scan_keys_batches(count=count):
+            if key_callback:
+                key_callback(key_list)
+            batch_key_stats_dict = batch_key_stats(self.describe_keys(key_list, memory), transform)
+            key_stats_counter.update(batch_key_stats_dict)
+            if batch_callback:
+                batch_callback(batch_key_stats_dict, scan_cursor_progress(scan_cursor, dbsize))
+            if cancel_event is not None and cancel_event.is_set():
+                break
+        return key_stats_counter.to_dict()
+
+    def dbsize(self):
+        """
+        :return: 当前db中key的数量
+        """
+        return self._read_db.dbsize()
+
+    def random_keys(self, number):
+        """
+        用一次pipeline执行多次RANDOMKEY,结果可能重复(有放回抽样)
+        :param number: RANDOMKEY的次数
+        :return: key名列表(bytes),db为空时返回[]
+        """
+        pipe = self._pipeline(read=True)
+        for _ in range(number):
+            pipe.randomkey()
+        return [key_name for key_name in self._execute_pipeline(pipe) if key_name is not None]
+
+    def pttl_keys(self, key_list):
+        """
+        用一次pipeline获取一批key的剩余过期时间
+        :param key_list: key名列表
+        :return: [毫秒],-1代表没有过期时间,-2代表key不存在
+        """
+        pipe = self._pipeline(read=True)
+        for key_name in key_list:
+            pipe.pttl(key_name)
+        return self._execute_pipeline(pipe)
+
+    def read_values(self, key_type_list):
+        """
+        用一次pipeline读取一批key的全部数据,只适合元素数量较少的key
+        :param key_type_list: [(key名, 数据类型)],类型为string/list/hash/set/zset
+        :return: [value],string为bytes,list为[bytes],hash为{bytes:bytes},set为{bytes},zset为[(bytes, score)],
+                 读取失败时为异常实例
+        """
+        pipe = self._pipeline(read=True)
+        for key_name, key_type in key_type_list:
+            if key_type == 'string':
+                pipe.get(key_name)
+            elif key_type == 'list':
+                pipe.lrange(key_name, 0, -1)
+            elif key_type == 'hash':
+                pipe.hgetall(key_name)
+            elif key_type == 'set':
+                pipe.smembers(key_name)
+            else:
+                pipe.zrange(key_name, 0, -1, withscores=True)
+        return self._execute_pipeline(pipe, raise_on_error=False)
+
+    def dump_keys(self, key_list):
+        """
+        用一次pipeline获取一批key的DUMP序列化数据和剩余过期时间
+        :param key_list: key名列表
+        :return: [(key名, 毫秒, DUMP数据)],执行期间被删除的key不返回
+        """
+        pipe = self._pipeline(read=True)
+        for key_name in key_list:
+            pipe.dump(key_name)
+            pipe.pttl(key_name)
+        reply = self._execute_pipeline(pipe)
+        return [(key_name, reply[i * 2 + 1], reply[i * 2]) for i, key_name in enumerate(key_list)
+                if reply[i * 2] is not None]
+
+    def execute_commands(self, command_list):
+        """
+        用一次pipeline执行一批命令
+        :param command_list: [(命令, 参数1, 参数2, ...)]
+        :return: 各命令的结果列表,执行失败的命令为异常实例
+        """
+        pipe = self._pipeline()
+        for command in command_list:
+            pipe.execute_command(*command)
+        return self._execute_pipeline(pipe, raise_on_error=False)
+
+    def get_type(self, name):
+        """
+        获得key的数据结构
+        :param name: db的key值
+        :return: key的数据类型,key不存在返回None
+        """
+        key_type = self._read_db.type(name).decode()
+        if key_type == 'none':
+            return None
+        return key_type
+
+    def ping(self):
+        """
+        测试是否可以连通redis
+        :return:
+        """
+        self._db.ping()
+
+    def delete(self, name):
+        """
+        删除某key
+        :param name: db的key值
+        :return: 返回1代表成功删除,返回0代表key不存在
+        """
+        return self._db.delete(name)
+
+
+def test_connection(ip, port, password, db=0):
+    try:
+        RedisOperation(db, ip, port, password).ping()
+        return True
+    except ConnectionError:
+        connection_manager.discard_pool(ip, port, db, password)  # 连接失败的连接池不再缓存
+        return False
+
+
+def parse_prefix_counts(reply):
+    """
+    :param reply: PREFIX_COUNT_SCRIPT的返回值
+    :return: (下一个cursor, {key:number})
+    """
+    return int(reply[0]), {reply[i].decode(): reply[i + 1] for i in range(1, len(reply), 2)}
+
+
+def count_key_prefixes(key_list, transform):
+    """
+    :param key_list: 一个SCAN分片的key名列表(bytes)
+    :param transform: key名转换为统计命名的函数
+    :return: 分片的{key:number}
+    """
+    batch_key_number_dict = dict()
+    for key_name in key_list:
+        key_name = transform(key_name.decode())
+        batch_key_number_dict[key_name] = batch_key_number_dict.get(key_name, 0)+1
+    return batch_key_number_dict
+
+
+def key_info_from_reply(key_list, reply, memory):
+    """
+    解析describe_keys第一次pipeline(TYPE和MEMORY USAGE)的结果
+    :param key_list: key名列表
+    :param reply: pipeline的结果列表,出错的命令为异常实例
+    :param memory: pipeline中是否有MEMORY USAGE
+    :return: [[key名, 类型, 获取长度的命令, 内存字节数]],已被删除的key不返回,不支持获取长度的类型命令为None
+    """
+    step = 2 if memory else 1
+    key_info_list = []
+    for i, key_name in enumerate(key_list):
+        key_type = reply[i * step]
+        if isinstance(key_type, Exception):
+            continue
+        key_type = key_type.decode() if isinstance(key_type, bytes) else key_type
+        if key_type == 'none':
+            continue
+        memory_usage = reply[i * step + 1] if memory else None
+        if isinstance(memory_usage, Exception):
+            memory_usage = None
+        key_info_list.append([key_name, key_type, LENGTH_COMMAND_DICT.get(key_type), memory_usage])
+    return key_info_list
+
+
+def described_keys(key_info_list, length_reply):
+    """
+    :param key_info_list: key_info_from_reply的结果
+    :param length_reply: 按key_info_list中的长度命令执行的第二次pipeline的结果列表
+    :return: [(key_name, key_type, 长度, 内存字节数)]
+    """
+    length_iter = iter(length_reply)
+    described_list = []
+    for key_name, key_type, command, memory_usage in key_info_list:
+        length = next(length_iter) if command else 0
+        if isinstance(length, Exception):
+            length = 0
+        described_list.append((key_name, key_type, length, memory_usage))
+    return described_list
+
+
+def batch_key_stats(described_list, transform):
+    """
+    :param described_list: describe_keys的结果
+    :param transform: key名转换为统计命名的函数
+    :return: 分片的{key:统计结果}
+    """
+    batch_key_stats_dict = dict()
+    for key_name, key_type, length, memory_usage in described_list:
+        add_key_stats(batch_key_stats_dict, transform(key_name.decode()), key_type, length, memory_usage or 0)
+    return batch_key_stats_dict
+
+
+def scan_cursor_progress(scan_cursor, dbsize):
+    """
+    根据SCAN返回的cursor估算遍历进度.
+    SCAN按反向二进制的顺序遍历大小为2^n的哈希表,把cursor的低n位反转后除以2^n即为已遍历的槽位比例
+    :param scan_cursor: SCAN返回的cursor,为0代表遍历结束
+    :param dbsize: db中key的数量,用于估算哈希表的大小
+    :return: 0-1之间的进度
+    """
+    if scan_cursor == 0:
+        return 1.0
+    bits = max(scan_cursor.bit_length(), (max(dbsize, 1)-1).bit_length())
+    reversed_cursor = int(format(scan_cursor, '0{}b'.format(bits))[::-1], 2)
+    return reversed_cursor / float(1 << bits)
+
+
+def add_key_stats(key_stats_dict, simple_key_name, key_type, length, memory_usage):
+    """
+    把一个key计入按前缀统计的结果
+    :param key_stats_dict: {key:统计结果},见RedisOperation.scan_key_stats
+    :param simple_key_name: 统计命名
+    :param key_type: key的数据类型
+    :param length: 元素数量(string为字节数)
+    :param memory_usage: 内存字节数
+    :return:
+    """
+    key_stats = key_stats_dict.get(simple_key_name)
+    if key_stats is None:
+        key_stats = key_stats_dict[simple_key_name] = {'number': 0, 'types': dict(), 'elements': 0, 'mean': 0.0,
+                                                       'bytes': 0}
+    key_stats['number'] += 1
+    key_stats['types'][key_type] = key_stats['types'].get(key_type, 0) + 1
+    key_stats['elements'] += length
+    key_stats['bytes'] += memory_usage
+    key_stats['mean'] = key_stats['elements'] / float(key_stats['number'])
+
+
+def merge_key_stats(key_stats_dict, batch_key_stats_dict):
+    """
+    把一个分片的统计结果合并到总的统计结果中
+    :param key_stats_dict: {key:统计结果}
+    :param batch_key_stats_dict: 分片的{key:统计结果}
+    :return:
+    """
+    for simple_key_name, batch_key_stats in batch_key_stats_dict.items():
+        key_stats = key_stats_dict.get(simple_key_name)
+        if key_stats is None:
+            key_stats_dict[simple_key_name] = {'number': batch_key_stats['number'],
+                                               'types': dict(batch_key_stats['types']),
+                                               'elements': batch_key_stats['elements'],
+                                               'mean': batch_key_stats['mean'], 'bytes': batch_key_stats['bytes']}
+            continue
+        key_stats['number'] += batch_key_stats['number']
+        for key_type, number in batch_key_stats['types'].items():
+            key_stats['types'][key_type] = key_stats['types'].get(key_type, 0) + number
+        key_stats['elements'] += batch_key_stats['elements']
+        key_stats['bytes'] += batch_key_stats['bytes']
+        key_stats['mean'] = key_stats['elements'] / float(key_stats['number'])
+
+
+class KeyStatsCounter(object):
+    """
+    详细统计的各前缀统计结果,内存上限与PrefixCounter相同:前缀数量不超过max_exact时精确统计,
+    超出后只保留key数量最多的top_n个前缀,其余合并为OTHER_PREFIX.被合并的前缀之后再出现时重新计数,
+    其数量为下限,所有前缀合计的数量,类型分布,元素数量和内存仍然精确
+    """
+
+    def __init__(self, max_exact=MAX_EXACT_PREFIXES, top_n=TOP_PREFIXES):
+        """
+        :param max_exact: 精确统计时最多保留的前缀数量
+        :param top_n: 超出后保留的前缀数量
+        """
+        self.max_exact = max_exact
+        self.top_n = top_n
+        self.total = 0  # key总数
+        self.exact = True
+        self._stats_dict = dict()  # {key:统计结果}
+
+    def update(self, batch_key_stats_dict):
+        """
+        :param batch_key_stats_dict: 一个分片的统计结果 {key:统计结果}
+        :return:
+        """
+        merge_key_stats(self._stats_dict, batch_key_stats_dict)
+        self.total += sum(batch_key_stats['number'] for batch_key_stats in batch_key_stats_dict.values())
+        if len(self._stats_dict) > (self.max_exact if self.exact else 2 * self.top_n):  # 批量淘汰,减少淘汰次数
+            self._prune()
+
+    def _prune(self):
+        self.exact = False
+        other_stats = self._stats_dict.pop(OTHER_PREFIX, None)
+        kept = set(heapq.nlargest(self.top_n, self._stats_dict,
+                                  key=lambda simple_key_name: self._stats_dict[simple_key_name]['number']))
+        other_dict = {OTHER_PREFIX: other_stats} if other_stats else dict()
+        for simple_key_name in [simple_key_name for simple_key_name in self._stats_dict if simple_key_name not in kept]:
+            merge_key_stats(other_dict, {OTHER_PREFIX: self._stats_dict.pop(simple_key_name)})
+        self._stats_dict.update(other_dict)
+
+    def to_dict(self):
+        """
+        :return: {key:统计结果}的副本,见RedisOperation.scan_key_stats
+        """
+        return {simple_key_name: dict(key_stats, types=dict(key_stats['types']))
+                for simple_key_name, key_stats in self._stats_dict.items()}
+
+
+def escape_pattern(prefix):
+    """
+    :param prefix: key前缀
+    :return: 匹配该前缀的SCAN MATCH模式,前缀中的通配符被转义
+    """
+    return re.sub(r'([\\*?\[\]])', r'\\\1', prefix) + '*'
+
+
+def transform_key_name_to_simple(key_name):
+    """
+    key命名规则和统计规则之间的转换
+    :return: 统计命名
+    """
+    return key_name.split(":")[0]
+
+
+if __name__ == '__main__':
+    x = RedisOperation(redis_db='2', redis_host='localhost', redis_port=6379, password='')
+    for i in range(10):
+        x.lpush('list', str(i))
+        x.sadd('set', str(i))
+        x.zadd('zset', {str(i): i})
+        x.hset('hash', str(i), str(i))
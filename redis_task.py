@@ -0,0 +1,113 @@
+"""
+说明：此脚本用于在后台线程池中执行redis操作,避免阻塞GUI线程
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import threading
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from instrumentation import action_scope
+
+
+_running_task_set = set()  # 持有运行中任务的引用,防止信号对象在任务结束前被回收
+
+
+class TaskSignals(QObject):
+    """
+    QRunnable不是QObject,无法直接定义信号,所以单独用一个QObject承载信号
+    信号跨线程发送时由Qt排队到GUI线程执行槽函数
+    """
+    partial = pyqtSignal(object)  # 分批返回的中间结果
+    progress = pyqtSignal(int)  # 进度百分比(0-100)
+    result = pyqtSignal(object)  # 最终结果
+    error = pyqtSignal(str)  # 异常信息
+    finished = pyqtSignal()  # 任务结束(无论成功,失败还是取消)
+
+
+class RedisTask(QRunnable):
+
+    def __init__(self, fn, *args, **kwargs):
+        """
+        :param fn: 后台执行的函数,第一个参数为当前task实例,可用于上报进度和检查取消状态
+        :param args: fn的位置参数
+        :param kwargs: fn的关键字参数
+        """
+        super(RedisTask, self).__init__()
+        self.fn = fn
+        self.action = getattr(fn, '__name__', 'task')  # 命令统计中的操作名,见instrumentation
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """
+        请求取消任务,由fn在合适的位置检查cancel_event后自行退出
+        :return:
+        """
+        self.cancel_event.set()
+
+    def report_partial(self, data):
+        self.signals.partial.emit(data)
+
+    def report_progress(self, percent):
+        self.signals.progress.emit(max(0, min(100, int(percent))))
+
+    def run(self):
+        try:
+            with action_scope(self.action):
+                result = self.fn(self, *self.args, **self.kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+def start_task(fn, *args, on_result=None, on_partial=None, on_progress=None, on_error=None, on_finished=None,
+               action=None, **kwargs):
+    """
+    创建并提交一个后台任务
+    :param fn: 后台执行的函数 fn(task, *args, **kwargs)
+    :param on_result: 结果回调,在GUI线程执行
+    :param on_partial: 中间结果回调,在GUI线程执行
+    :param on_progress: 进度回调,在GUI线程执行
+    :param on_error: 异常回调,在GUI线程执行
+    :param on_finished: 结束回调,在GUI线程执行
+    :param action: 命令统计中的操作名,默认为fn的函数名
+    :return: RedisTask
+    """
+    task = RedisTask(fn, *args, **kwargs)
+    if action:
+        task.action = action
+    for signal, slot in ((task.signals.result, on_result), (task.signals.partial, on_partial),
+                         (task.signals.progress, on_progress), (task.signals.error, on_error),
+                         (task.signals.finished, on_finished)):
+        if slot:
+            signal.connect(slot)
+    _running_task_set.add(task)
+    task.signals.finished.connect(lambda: _running_task_set.discard(task))
+    QThreadPool.globalInstance().start(task)
+    return task
+
+
+def start_command(command, *args, on_result=None, on_error=None):
+    """
+    后台执行一个不需要上报进度的redis命令
+    :param command: RedisOperation的方法或其他可调用对象
+    :param args: command的参数
+    :param on_result: 结果回调,在GUI线程执行
+    :param on_error: 异常回调,在GUI线程执行
+    :return: RedisTask
+    """
+    return start_task(lambda task: command(*args), on_result=on_result, on_error=on_error,
+                      action=getattr(command, '__name__', None))
@@ -0,0 +1,220 @@
+"""
+说明：此脚本用于抽样估算各db的key数量分布,以DBSIZE为总数外推各前缀的数量并给出置信区间,适用于遍历所有key代价过大的场景
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import math
+import time
+
+from cluster import NodeProgress
+from connection_manager import connection_manager
+from key_census import DB_NUMBER
+from redis_operation import RedisOperation, transform_key_name_to_simple
+
+
+SAMPLE_KEYS = 100000  # 每个db默认最多抽样的key数量
+SAMPLE_SECONDS = 30  # 每个db默认最长的抽样时间
+SAMPLE_BATCH = 1000  # 每次SCAN的COUNT,或每次pipeline中RANDOMKEY的次数
+ESTIMATE_INTERVAL = 0.5  # 抽样过程中两次回调估算结果的最小间隔(秒)
+Z_SCORE = 1.96  # 95%置信水平
+
+
+def estimate_interval(count, sample_number, total, with_replacement=False, z=Z_SCORE):
+    """
+    用Wilson区间估算某前缀在总体中的数量,比正态近似在占比很小时更可靠
+    :param count: 样本中该前缀的key数量
+    :param sample_number: 样本数量
+    :param total: 总体数量,即DBSIZE
+    :param with_replacement: 是否为有放回抽样(RANDOMKEY),无放回抽样(SCAN)时使用有限总体校正
+    :param z: 置信水平对应的z值
+    :return: (估计值, 下限, 上限)
+    """
+    if sample_number <= 0 or total <= 0:
+        return 0, 0, 0
+    p = count / float(sample_number)
+    z2 = z * z
+    denominator = 1 + z2 / sample_number
+    center = (p + z2 / (2 * sample_number)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / sample_number + z2 / (4 * sample_number * sample_number)) / denominator
+    if not with_replacement and total > 1:  # 有限总体校正,样本接近总体时区间收窄到样本比例
+        correction = math.sqrt(max(0.0, (total - sample_number) / float(total - 1)))
+        center = p + (center - p) * correction
+        half_width *= correction
+    low = max(0.0, center - half_width) * total
+    high = min(1.0, center + half_width) * total
+    # 无放回抽样时样本中的key一定存在,有放回抽样时至少存在1个
+    low = max(low, count if not with_replacement else min(count, 1))
+    return int(round(p * total)), int(math.floor(low)), int(math.ceil(max(high, low)))
+
+
+class SampleCensus(object):
+
+    def __init__(self, redis_host, redis_port, password=None, db_list=None, max_keys=SAMPLE_KEYS,
+                 max_seconds=SAMPLE_SECONDS, random_key=False, namespace_rule=None, node_list=None):
+        """
+        :param redis_host: ip
+        :param redis_port: 端口
+        :param password: 密码
+        :param db_list: 需要统计的db号码列表,默认为0-15
+        :param max_keys: 每个db最多抽样的key数量,为None时不限制
+        :param max_seconds: 每个db最长的抽样时间,为None时不限制.两者都为None时一直细化,直到遍历完或被取消
+        :param random_key: 为True时用RANDOMKEY有放回抽样,否则用SCAN分片无放回抽样
+        :param namespace_rule: key_namespace.NamespaceRule,为None时使用transform_key_name_to_simple
+        :param node_list: 集群所有master的[(host, port)],见cluster.cluster_masters.传入时只抽样db 0,
+                          在每个master上分别抽样后把估算结果相加
+        """
+        self.db_list = list(range(DB_NUMBER)) if db_list is None else list(db_list)
+        self.max_keys = max_keys
+        self.max_seconds = max_seconds
+        self.random_key = random_key
+        self._transform = namespace_rule.transform_to_name if namespace_rule else transform_key_name_to_simple
+        self._pool = connection_manager.get_server_pool(redis_host, redis_port, password)
+        self.node_list = list(node_list or [])
+        if self.node_list:  # 集群只有db 0,不能SELECT到其他db
+            self.db_list = [0]
+            self._node_pool_list = [connection_manager.get_server_pool(host, port, password)
+                                    for host, port in self.node_list]
+
+    def sample_batches(self, con):
+        """
+        :param con: RedisOperation实例
+        :return: generator (key列表, 是否已遍历完整个db)
+        """
+        if self.random_key:
+            while True:
+                yield con.random_keys(SAMPLE_BATCH), False
+        for scan_cursor, key_list in con.scan_keys_batches(count=SAMPLE_BATCH):
+            yield key_list, scan_cursor == 0
+
+    def estimate(self, sample_dict, sample_number, total, exact=False):
+        """
+        :param sample_dict: 样本中各统计命名的数量 {key:number}
+        :param sample_number: 样本数量
+        :param total: DBSIZE
+        :param exact: SCAN已遍历完整个db时,样本即为总体
+        :return: {key:(估计值, 下限, 上限)}
+        """
+        if exact:
+            return {simple_key_name: (number, number, number) for simple_key_name, number in sample_dict.items()}
+        return {simple_key_name: estimate_interval(number, sample_number, total, self.random_key)
+                for simple_key_name, number in sample_dict.items()}
+
+    def sample_steps(self, con, db, batch_callback=None, cancel_event=None):
+        """
+        抽样估算单个db的key数量分布,每抽样一批后让出一次,供run在各db之间轮流执行
+        :param con: 该db的RedisOperation实例
+        :param db: db号码
+        :param batch_callback: 估算结果更新时的回调 batch_callback(db, {key:(估计值, 下限, 上限)}, 进度0-1),db为str
+        :param cancel_event: threading.Event,被set后停止抽样并返回当前的估算结果
+        :return: generator,结束时的返回值为{key:(估计值, 下限, 上限)}
+        """
+        total = con.dbsize()
+        if total == 0:
+            return dict()
+        sample_dict = dict()
+        sample_number = 0
+        elapsed = 0.0  # 该db实际用于抽样的时间,轮流抽样时不计其他db的时间
+        last_report_time = time.time()
+        max_keys = self.max_keys if self.random_key or self.max_keys is None else min(self.max_keys, total)
+        batch_iter = self.sample_batches(con)
+        while True:
+            start_time = time.time()
+            key_list, exact = next(batch_iter, ([], True))
+            for key_name in key_list:
+                simple_key_name = self._transform(key_name.decode('utf-8', 'replace'))
+                sample_dict[simple_key_name] = sample_dict.get(simple_key_name, 0) + 1
+            sample_number += len(key_list)
+            elapsed += time.time() - start_time
+            progress = max(sample_number / float(max_keys) if max_keys else 0.0,
+                           elapsed / self.max_seconds if self.max_seconds else 0.0)
+            stop = exact or progress >= 1.0 or not key_list and self.random_key or \
+                cancel_event is not None and cancel_event.is_set()
+            if batch_callback and (stop or time.time() - last_report_time >= ESTIMATE_INTERVAL):
+                last_report_time = time.time()
+                batch_callback(str(db), self.estimate(sample_dict, sample_number, total, exact),
+                               1.0 if stop else min(progress, 0.99))
+            if stop:
+                return self.estimate(sample_dict, sample_number, total, exact)
+            yield
+
+    def sample_db(self, db, batch_callback=None, cancel_event=None):
+        """
+        抽样估算单个db的key数量分布,抽样过程中不断细化估算结果,参数见sample_steps
+        :return: {key:(估计值, 下限, 上限)}
+        """
+        con = RedisOperation(db, None, None, connection_pool=self._pool)
+        try:
+            steps = self.sample_steps(con, db, batch_callback, cancel_event)
+            while True:
+                try:
+                    next(steps)
+                except StopIteration as e:
+                    return e.value
+        finally:
+            con.close()
+
+    def run(self, batch_callback=None, cancel_event=None):
+        """
+        在一个线程中轮流抽样所有db,每个db每轮抽样一批,同一时刻只有一个命令在执行,对线上redis的压力与单个客户端相当.
+        一直细化(不限制数量和时间)时所有db同时得到估算结果,不会停留在第一个db上.集群时轮流抽样各master的db 0
+        :param batch_callback: 估算结果更新时的回调 batch_callback(db, {key:(估计值, 下限, 上限)}, 进度0-1)
+        :param cancel_event: threading.Event,被set后停止抽样,返回各db当前的估算结果
+        :return: {db:{key:(估计值, 下限, 上限)}}
+        """
+        if self.node_list:
+            node_estimate_list = [dict()] * len(self.node_list)  # 各master最近的估算结果
+            node_progress = NodeProgress(len(self.node_list))
+
+            def node_callback(node_index):
+                def callback(db, key_estimate_dict, progress):
+                    node_estimate_list[node_index] = key_estimate_dict
+                    batch_callback(db, merge_estimates(node_estimate_list), node_progress.update(node_index, progress))
+                return callback if batch_callback else None
+
+            target_list = [(0, pool, node_callback(node_index)) for node_index, pool in enumerate(self._node_pool_list)]
+        else:
+            target_list = [(db, self._pool, batch_callback) for db in self.db_list]
+        estimate_list = [dict()] * len(target_list)
+        running_list = []  # [(序号, RedisOperation, 抽样步骤)]
+        try:
+            for index, (db, pool, callback) in enumerate(target_list):
+                con = RedisOperation(db, None, None, connection_pool=pool)
+                running_list.append((index, con, self.sample_steps(con, db, callback, cancel_event)))
+            while running_list:
+                for item in list(running_list):
+                    index, con, steps = item
+                    try:
+                        next(steps)
+                    except StopIteration as e:
+                        estimate_list[index] = e.value
+                        running_list.remove(item)
+                        con.close()
+        finally:
+            for _, con, _ in running_list:
+                con.close()
+        if self.node_list:
+            return {'0': merge_estimates(estimate_list)}
+        return {str(db): estimate for (db, _, _), estimate in zip(target_list, estimate_list)}
+
+
+def merge_estimates(key_estimate_dict_list):
+    """
+    相加集群各master的估算结果.各master上的key互不重叠,估计值和上下限分别相加,得到的区间偏保守
+    :param key_estimate_dict_list: [{key:(估计值, 下限, 上限)}]
+    :return: {key:(估计值, 下限, 上限)}
+    """
+    merged_dict = dict()
+    for key_estimate_dict in key_estimate_dict_list:
+        for simple_key_name, (estimate, low, high) in key_estimate_dict.items():
+            merged = merged_dict.get(simple_key_name, (0, 0, 0))
+            merged_dict[simple_key_name] = (merged[0] + estimate, merged[1] + low, merged[2] + high)
+    return merged_dict
+
+
+def estimate_to_number(key_estimate_dict):
+    """
+    :param key_estimate_dict: {key:(估计值, 下限, 上限)}
+    :return: {key:估计值}
+    """
+    return {simple_key_name: estimate[0] for simple_key_name, estimate in key_estimate_dict.items()}
@@ -0,0 +1,143 @@
+"""
+说明：此脚本用于限制遍历类任务(统计,大key查找,导出)对redis的影响
+测量每次SCAN的耗时,超出预算时减小COUNT,COUNT已降到下限仍超出时在两次SCAN之间暂停;
+按每秒命令数限速;定时读取INFO,redis繁忙(CPU使用率或每秒命令数过高)时进一步减小COUNT并加长暂停
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import threading
+import time
+
+from redis import RedisError
+
+
+MIN_COUNT = 100  # COUNT的下限
+MIN_SCALE = 0.01  # COUNT相对调用方COUNT的最小比例
+MIN_PAUSE = 0.01  # 需要暂停时的最短暂停秒数,低于该值时不再暂停
+MAX_PAUSE = 1.0  # 两次SCAN之间的最长暂停秒数
+LOAD_CHECK_SECONDS = 2  # 读取INFO检查redis负载的间隔
+MAX_CPU = 0.7  # redis进程的CPU使用率(单核)超过该值时视为繁忙
+
+
+class ScanThrottle(object):
+    """
+    一个实例代表一份预算,同一个任务的多个扫描线程共用时合计不超过预算
+    """
+
+    def __init__(self, max_call_ms=None, max_ops=None, max_cpu=MAX_CPU, max_server_ops=None,
+                 min_count=MIN_COUNT, load_check_seconds=LOAD_CHECK_SECONDS):
+        """
+        :param max_call_ms: 每次SCAN的耗时上限(毫秒),为None时不限制
+        :param max_ops: 每秒发送给redis的命令数上限,SCAN计1个命令,pipeline按其中的命令数计算,为None时不限制
+        :param max_cpu: redis的CPU使用率超过该值时视为繁忙,为None时不检查
+        :param max_server_ops: redis的instantaneous_ops_per_sec超过该值时视为繁忙,为None时不检查
+        :param min_count: COUNT的下限
+        :param load_check_seconds: 读取INFO检查负载的间隔
+        """
+        self.max_call_ms = max_call_ms
+        self.max_ops = max_ops
+        self.max_cpu = max_cpu
+        self.max_server_ops = max_server_ops
+        self.min_count = min_count
+        self.load_check_seconds = load_check_seconds
+        self._lock = threading.Lock()
+        self.scale = 1.0  # 当前COUNT相对调用方COUNT的比例
+        self.pause = 0.0  # 当前两次SCAN之间的暂停秒数
+        self.busy = False  # 最近一次检查时redis是否繁忙
+        self._next_time = 0.0  # 按max_ops限速时下一个命令最早的发送时间
+        self._load_dict = dict()  # {server:(检查时间, CPU累计秒数)},INFO不可用的server为None
+
+    def count(self, count):
+        """
+        :param count: 调用方指定的COUNT,也是调整的上限
+        :return: 本次SCAN使用的COUNT
+        """
+        return max(min(self.min_count, count), int(count * self.scale))
+
+    def spend(self, ops):
+        """
+        按max_ops限速,需要时阻塞等待
+        :param ops: 即将发送的命令数
+        :return:
+        """
+        if not self.max_ops:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + ops / float(self.max_ops)
+        if start > now:
+            time.sleep(start - now)
+
+    def before_scan(self, client=None):
+        """
+        每次SCAN之前调用:按需检查负载,然后暂停并按max_ops限速
+        :param client: 即将执行SCAN的redis客户端,用于读取INFO,为None时不检查负载
+        :return:
+        """
+        if client is not None and (self.max_cpu or self.max_server_ops):
+            self.check_load(client)
+        if self.pause:
+            time.sleep(self.pause)
+        self.spend(1)
+
+    def after_scan(self, elapsed, count):
+        """
+        每次SCAN之后调用,根据耗时调整COUNT和暂停
+        :param elapsed: 本次SCAN的耗时(秒)
+        :param count: 本次SCAN使用的COUNT
+        :return:
+        """
+        with self._lock:
+            pressure = self.busy
+            if self.max_call_ms:
+                elapsed_ms = elapsed * 1000
+                if elapsed_ms > self.max_call_ms:
+                    if count <= self.min_count:
+                        pressure = True  # COUNT已到下限仍超出预算,只能拉长间隔
+                    self.scale = max(MIN_SCALE, self.scale * max(0.1, 0.8 * self.max_call_ms / elapsed_ms))
+                elif elapsed_ms < self.max_call_ms / 2 and not self.busy:
+                    self.scale = min(1.0, self.scale * 1.25)
+            if pressure:
+                self.pause = min(MAX_PAUSE, max(self.pause * 2, MIN_PAUSE, elapsed))
+            else:
+                self.pause = self.pause / 2 if self.pause / 2 >= MIN_PAUSE else 0.0
+
+    def check_load(self, client):
+        """
+        距离上次检查超过load_check_seconds时读取INFO,按CPU使用率和每秒命令数判断redis是否繁忙
+        :param client: redis客户端
+        :return:
+        """
+        kwargs = client.connection_pool.connection_kwargs
+        server = (kwargs.get('host'), kwargs.get('port'))
+        now = time.monotonic()
+        with self._lock:
+            if server in self._load_dict and (self._load_dict[server] is None or
+                                              now - self._load_dict[server][0] < self.load_check_seconds):
+                return
+            previous = self._load_dict.get(server)
+            self._load_dict[server] = (now, previous[1] if previous else None)  # 占位,其他线程不重复检查
+        try:
+            info_dict = client.info()
+        except RedisError:
+            with self._lock:
+                self._load_dict[server] = None  # INFO被禁用,只按耗时调整
+            return
+        cpu = info_dict.get('used_cpu_sys', 0) + info_dict.get('used_cpu_user', 0)
+        busy = bool(self.max_server_ops and info_dict.get('instantaneous_ops_per_sec', 0) > self.max_server_ops)
+        if previous and previous[1] is not None and self.max_cpu:
+            busy = busy or (cpu - previous[1]) / max(now - previous[0], 1e-3) > self.max_cpu
+        with self._lock:
+            self._load_dict[server] = (now, cpu)
+            self.busy = busy
+            if busy:
+                self.scale = max(MIN_SCALE, self.scale / 2)
+
+    def summary(self):
+        """
+        :return: 当前状态的说明,用于界面展示
+        """
+        return 'scan x{:.2f}, pause {:.0f}ms{}'.format(self.scale, self.pause * 1000,
+                                                       ', server busy' if self.busy else '')
@@ -0,0 +1,83 @@
+"""
+说明：此脚本用于展示instrumentation统计的各命令的调用次数,耗时分布,字节数和pipeline大小,可导出为json
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+from PyQt5.QtCore import Qt, QTimer, QSortFilterProxyModel
+from PyQt5.QtGui import QStandardItemModel, QStandardItem
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QTableView, QPushButton, QLabel, QAbstractItemView, \
+    QFileDialog, QMessageBox
+
+from instrumentation import recorder
+
+
+COLUMN_LIST = [('action', None), ('command', None), ('calls', 'calls'), ('errors', 'errors'), ('p50 ms', 'p50_ms'),
+               ('p99 ms', 'p99_ms'), ('max ms', 'max_ms'), ('out bytes', 'request_bytes'),
+               ('in bytes', 'response_bytes'), ('pipeline avg', 'pipeline_mean'), ('pipeline max', 'pipeline_max')]
+REFRESH_INTERVAL = 1000  # 自动刷新间隔(毫秒)
+
+
+class StatsDialog(QDialog):
+
+    def __init__(self, parent):
+        """
+        :param parent: 主窗口
+        """
+        super(StatsDialog, self).__init__(parent)
+        self.setWindowTitle('Command stats')
+        self.resize(900, 480)
+        self.status_label = QLabel(self)
+        self.reset_button = QPushButton('Reset', self)
+        self.reset_button.clicked.connect(self.reset)
+        self.export_button = QPushButton('Export JSON...', self)
+        self.export_button.clicked.connect(self.export_json)
+        self.model = QStandardItemModel(0, len(COLUMN_LIST), self)
+        self.model.setHorizontalHeaderLabels([title for title, _ in COLUMN_LIST])
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.table_view = QTableView(self)
+        self.table_view.setModel(self.proxy_model)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(self.status_label)
+        top_layout.addStretch()
+        top_layout.addWidget(self.reset_button)
+        top_layout.addWidget(self.export_button)
+        layout = QVBoxLayout(self)
+        layout.addLayout(top_layout)
+        layout.addWidget(self.table_view)
+        self.refresh_timer = QTimer(self)  # 打开期间定时刷新
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(REFRESH_INTERVAL)
+        self.refresh()
+
+    def refresh(self):
+        self.status_label.setText(recorder.summary() if recorder.enabled else 'recording is off (Tools menu)')
+        self.model.removeRows(0, self.model.rowCount())
+        for action, command, stats in recorder.rows():
+            row = [QStandardItem(action), QStandardItem(command)]
+            for _, field in COLUMN_LIST[2:]:
+                item = QStandardItem()
+                value = stats[field]
+                item.setData(round(value, 3) if isinstance(value, float) else value, Qt.DisplayRole)  # 按数值排序
+                row.append(item)
+            self.model.appendRow(row)
+
+    def reset(self):
+        recorder.reset()
+        self.refresh()
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export command stats', 'command_stats.json', 'JSON (*.json)')
+        if not path:
+            return
+        try:
+            recorder.save(path)
+        except OSError as e:
+            QMessageBox.warning(self, 'Export command stats', str(e))
+
+    def closeEvent(self, event):
+        self.refresh_timer.stop()
+        super(StatsDialog, self).closeEvent(event)
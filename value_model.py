@@ -0,0 +1,221 @@
+"""
+说明：此脚本用于按需加载key数据的表格模型,页在后台读取,滚动到底部时才读取下一页,内存中只保留有限的页;以及逐批追加过滤结果的表格模型
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import time
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, pyqtSignal
+
+from redis_task import start_command
+from value_reader import PageCache, MAX_CACHED_PAGES
+
+
+LOADING_TEXT = '...'  # 页正在后台读取时单元格展示的文字
+RETRY_SECONDS = 5  # 读取失败的页在该秒数后才重新读取
+
+
+class EditableValueModel(QAbstractTableModel):
+    """
+    可编辑的key数据表格模型,界面上的修改保存在edit_dict中,original_row返回redis中的原始数据,由子类实现
+    """
+
+    def __init__(self, column_list):
+        super(EditableValueModel, self).__init__()
+        self.column_list = list(column_list)
+        self.edit_dict = dict()  # 界面上被修改过的单元格 {(行号, 列号):value}
+
+    def original_row(self, row):
+        raise NotImplementedError
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.column_list)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.column_list[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        cell = (index.row(), index.column())
+        if cell in self.edit_dict:
+            return self.edit_dict[cell]
+        row = self.original_row(index.row())
+        return row[index.column()] if index.column() < len(row) else None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        self.edit_dict[(index.row(), index.column())] = value
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        return super(EditableValueModel, self).flags(index) | Qt.ItemIsEditable
+
+
+class LazyValueModel(EditableValueModel):
+    """
+    页都在后台读取:未缓存的页先展示占位文字,读取完成后刷新对应的行,滚动到任何位置都不会在GUI线程中等待redis
+    """
+    page_error = pyqtSignal(str)  # 读取页失败时的错误信息,连续失败时只发出一次
+
+    def __init__(self, reader, column_list, first_page_rows=None, max_cached_pages=MAX_CACHED_PAGES):
+        """
+        :param reader: value_reader中的按页读取器
+        :param column_list: 字段标题
+        :param first_page_rows: 已在后台读取好的第一页数据
+        :param max_cached_pages: 内存中最多保留的页数,超出后淘汰最久未访问的页
+        """
+        super(LazyValueModel, self).__init__(column_list)
+        self.reader = reader
+        self.page_cache = PageCache(max_cached_pages)
+        self.loaded_row_number = 0  # 已经展示给视图的行数
+        self.loading_page_set = set()  # 正在后台读取的页号
+        self.failed_page_dict = dict()  # 读取失败的页 {页号:失败时间}
+        self.failing = False  # 最近一次读取是否失败,恢复前不重复发出page_error
+        if first_page_rows is not None:
+            self.page_cache.put(0, first_page_rows)
+            self.loaded_row_number = len(first_page_rows)
+        if getattr(reader, 'random_access', False):
+            self.loaded_row_number = reader.row_number  # 可以直接读取任意一页,所有行一次性交给视图
+
+    def page_rows(self, page):
+        """
+        获取某页数据,不在缓存中时在后台读取
+        :param page: 页号
+        :return: [(列1, 列2)],正在读取时返回None
+        """
+        rows = self.page_cache.get(page)
+        if rows is None:
+            self.load_page(page, prefetch=getattr(self.reader, 'prefetch', False))
+        return rows
+
+    def load_page(self, page, prefetch=False):
+        """
+        在后台读取一页放入缓存,已缓存或正在读取的页被忽略
+        :param page: 页号
+        :param prefetch: 读取完成后是否预读相邻的页,来回滚动时不需要等待读取
+        """
+        if page < 0 or page in self.page_cache or page in self.loading_page_set or not self.reader.has_page(page):
+            return
+        if page in self.failed_page_dict and time.monotonic() - self.failed_page_dict[page] < RETRY_SECONDS:
+            return
+        self.loading_page_set.add(page)
+        start_command(self.reader.read_page, page,
+                      on_result=lambda rows, page=page: self.page_loaded(page, rows, prefetch),
+                      on_error=lambda message, page=page: self.page_failed(page, message))
+
+    def prefetch_pages(self, page_list):
+        """
+        :param page_list: 在后台预读的页号列表
+        """
+        for page in page_list:
+            self.load_page(page)
+
+    def page_loaded(self, page, rows, prefetch=False):
+        """
+        后台读取完成:刷新已展示的占位行,或者把等待中的下一页交给视图
+        """
+        self.loading_page_set.discard(page)
+        self.failed_page_dict.pop(page, None)
+        self.failing = False
+        self.page_cache.put(page, rows)
+        if page * self.reader.page_size == self.loaded_row_number:
+            self.fetchMore()
+        else:
+            self.page_changed(page)
+        if prefetch:
+            self.prefetch_pages((page + 1, page - 1))
+
+    def page_failed(self, page, message):
+        """
+        后台读取失败:该页不放入缓存,继续展示占位文字,RETRY_SECONDS后刷新已展示的行以重新读取
+        """
+        self.loading_page_set.discard(page)
+        self.failed_page_dict[page] = time.monotonic()
+        QTimer.singleShot(RETRY_SECONDS * 1000, lambda: self.page_changed(page))
+        if not self.failing:
+            self.failing = True
+            self.page_error.emit(message)
+
+    def page_changed(self, page):
+        """
+        :param page: 页号,该页已展示给视图的行被刷新
+        """
+        first_row = page * self.reader.page_size
+        if first_row < self.loaded_row_number:
+            last_row = min(first_row + self.reader.page_size, self.loaded_row_number) - 1
+            self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, len(self.column_list) - 1))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role == Qt.DisplayRole and (index.row(), index.column()) not in self.edit_dict and \
+                self.page_rows(index.row() // self.reader.page_size) is None:
+            return LOADING_TEXT
+        return super(LazyValueModel, self).data(index, role)
+
+    def original_row(self, row):
+        """
+        :param row: 行号
+        :return: 该行从redis中读取到的原始数据(不包含界面上的修改),该页正在读取或读取后数据已被删除则返回空tuple
+        """
+        rows = self.page_rows(row // self.reader.page_size) or []
+        offset = row % self.reader.page_size
+        return rows[offset] if offset < len(rows) else tuple()
+
+    def flags(self, index):
+        if getattr(self.reader, 'read_only', False):
+            return QAbstractTableModel.flags(self, index)
+        return super(LazyValueModel, self).flags(index)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded_row_number
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or getattr(self.reader, 'random_access', False):
+            return False
+        if self.loaded_row_number % self.reader.page_size:
+            return False  # 最后一页不满一页,说明已经全部读取
+        return self.reader.has_page(self.loaded_row_number // self.reader.page_size)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        rows = self.page_rows(self.loaded_row_number // self.reader.page_size)
+        if not rows:
+            return  # 正在后台读取,读取完成后由page_loaded再次调用
+        self.beginInsertRows(QModelIndex(), self.loaded_row_number, self.loaded_row_number + len(rows) - 1)
+        self.loaded_row_number += len(rows)
+        self.endInsertRows()
+
+
+class StreamValueModel(EditableValueModel):
+    """
+    过滤结果的表格模型,后台扫描到的匹配行逐批追加到表格末尾
+    """
+
+    def __init__(self, column_list):
+        super(StreamValueModel, self).__init__(column_list)
+        self.row_list = []
+
+    def append_rows(self, rows):
+        """
+        :param rows: [(列1, 列2)]
+        :return:
+        """
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.row_list), len(self.row_list) + len(rows) - 1)
+        self.row_list.extend(rows)
+        self.endInsertRows()
+
+    def original_row(self, row):
+        return self.row_list[row] if row < len(self.row_list) else tuple()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.row_list)
@@ -0,0 +1,414 @@
+"""
+说明：此脚本用于按页读取redis中list/hash/set/zset的数据,以及用GETRANGE分块读取大string,供界面按需加载
+作者：huangjunhao
+日期：2026-10-18
+"""
+
+import codecs
+import threading
+from collections import OrderedDict
+
+from redis_operation import scan_cursor_progress
+
+
+PAGE_SIZE = 200  # 每页的数据条数
+MAX_CACHED_PAGES = 20  # 内存中最多保留的页数
+SEARCH_COUNT = 1000  # 过滤时每次HSCAN/SSCAN/ZSCAN的默认COUNT
+MAX_SEARCH_ROWS = 100000  # 过滤时最多展示的匹配行数
+SMALL_STRING = 64 << 10  # 不超过该字节数的文本string整体读取,可以直接编辑
+SNIFF_BYTES = 4096  # 判断string是否为二进制数据时读取的开头字节数
+TEXT_ROW_BYTES = 1024  # 文本方式每行展示的字节数
+HEX_ROW_BYTES = 16  # 十六进制方式每行展示的字节数
+
+
+class PageCache(object):
+    """
+    按最近使用顺序淘汰的页缓存 {页号:[行数据]}
+    """
+
+    def __init__(self, max_pages=MAX_CACHED_PAGES):
+        self.max_pages = max_pages
+        self._page_dict = OrderedDict()
+
+    def get(self, page):
+        """
+        :param page: 页号
+        :return: 该页的行数据,不在缓存中返回None
+        """
+        rows = self._page_dict.get(page)
+        if rows is not None:
+            self._page_dict.move_to_end(page)
+        return rows
+
+    def put(self, page, rows):
+        self._page_dict[page] = rows
+        self._page_dict.move_to_end(page)
+        while len(self._page_dict) > self.max_pages:
+            self._page_dict.popitem(last=False)
+
+    def clear(self):
+        self._page_dict.clear()
+
+    def __len__(self):
+        return len(self._page_dict)
+
+    def __contains__(self, page):
+        return page in self._page_dict
+
+
+class ListPageReader(object):
+    """
+    list:第page页对应下标 page*page_size 至 (page+1)*page_size-1 的数据,可以直接读取任意一页.
+    靠近表尾的页使用负数下标读取,redis从表尾开始定位,读取表尾数据的耗时与列表长度无关
+    """
+    random_access = True  # 可以按下标直接读取任意一页
+
+    def __init__(self, con, key_name, page_size=PAGE_SIZE, list_length=None):
+        """
+        :param con: RedisOperation实例
+        :param key_name: db的key值
+        :param page_size: 每页的数据条数
+        :param list_length: 列表长度,为None时通过LLEN获取
+        """
+        self.con = con
+        self.key_name = key_name
+        self.page_size = page_size
+        self.row_number = con.llen(key_name) if list_length is None else list_length
+
+    def normalize_index(self, index):
+        """
+        把负数下标(-1代表最后一个元素)转换为正数下标
+        :param index: 下标
+        :return: 0 至 row_number-1 之间的下标
+        """
+        if index < 0:
+            index += self.row_number
+        if not 0 <= index < self.row_number:
+            raise IndexError('list index out of range')
+        return index
+
+    def has_page(self, page):
+        return 0 <= page * self.page_size < self.row_number
+
+    def read_page(self, page):
+        """
+        :param page: 页号
+        :return: [(value,)]
+        """
+        start = page * self.page_size
+        end = min(start + self.page_size, self.row_number) - 1
+        if start > self.row_number // 2:
+            start, end = start - self.row_number, end - self.row_number
+        return [(value.decode(),) for value in self.con.lrange_page(self.key_name, start, end)]
+
+
+class ScanPageReader(object):
+    """
+    hash/set/zset:用HSCAN/SSCAN/ZSCAN按页读取.
+    SCAN每次返回的条数不固定,所以记录每页起始的(cursor, 该批数据中需要跳过的条数),
+    被缓存淘汰的页可以从记录的位置重新扫描,不需要从头开始
+    """
+
+    def __init__(self, con, key_name, key_type, page_size=PAGE_SIZE, match=None):
+        """
+        :param con: RedisOperation实例
+        :param key_name: db的key值
+        :param key_type: hash/set/zset
+        :param page_size: 每页的数据条数
+        :param match: SCAN的MATCH模式
+        """
+        self.key_name = key_name
+        self.key_type = key_type
+        self.page_size = page_size
+        self.match = match
+        self._scan = {'hash': con.hscan, 'set': con.sscan, 'zset': con.zscan}[key_type]
+        self._lock = threading.Lock()  # 页在后台线程中读取,GUI线程同时查询page_start_dict
+        self.page_start_dict = {0: (0, 0)}  # {页号:(cursor, 跳过条数)}
+        self.last_page = None  # 最后一页的页号,未读到结尾时为None
+
+    def has_page(self, page):
+        with self._lock:
+            return page in self.page_start_dict
+
+    def decode_rows(self, data):
+        """
+        把SCAN返回的数据转换为表格的行
+        :return: [(列1, 列2)] 或 [(value,)]
+        """
+        return decode_scan_rows(self.key_type, data)
+
+    def read_page(self, page):
+        """
+        从该页记录的起始位置开始扫描,直到凑满一页或扫描结束.只能读取已经记录了起始位置的页
+        :param page: 页号
+        :return: [(列1, 列2)] 或 [(value,)]
+        """
+        with self._lock:
+            cursor, skip = self.page_start_dict[page]
+        row_list = []
+        while True:
+            next_cursor, data = self._scan(self.key_name, cursor, match=self.match, count=self.page_size)
+            batch_row_list = self.decode_rows(data)[skip:]
+            need = self.page_size - len(row_list)
+            if len(batch_row_list) > need:  # 本页在这一批数据中间结束
+                row_list.extend(batch_row_list[:need])
+                with self._lock:
+                    self.page_start_dict[page + 1] = (cursor, skip + need)
+                return row_list
+            row_list.extend(batch_row_list)
+            if next_cursor == 0:
+                with self._lock:
+                    self.last_page = page
+                return row_list
+            cursor, skip = next_cursor, 0
+            if len(row_list) == self.page_size:
+                with self._lock:
+                    self.page_start_dict[page + 1] = (cursor, 0)
+                return row_list
+
+
+class ZsetRankReader(ListPageReader):
+    """
+    zset:用ZRANGE WITHSCORES按排名读取,第page页对应排名 page*page_size 至 (page+1)*page_size-1,可以直接读取任意一页
+    """
+    prefetch = True  # 读取某页后在后台预读相邻的页
+
+    def __init__(self, con, key_name, page_size=PAGE_SIZE, zset_length=None, descending=False):
+        """
+        :param con: RedisOperation实例
+        :param key_name: db的key值
+        :param page_size: 每页的数据条数
+        :param zset_length: zset的数据数量,为None时通过ZCARD获取
+        :param descending: 为True时按分数由大到小排名
+        """
+        self.con = con
+        self.key_name = key_name
+        self.page_size = page_size
+        self.descending = descending
+        self.row_number = con.zcard(key_name) if zset_length is None else zset_length
+
+    def rank_of(self, member):
+        """
+        :param member: zset中的value
+        :return: 该value在当前排序方向下的排名,不存在时返回None
+        """
+        rank = self.con.zrank(self.key_name, member)
+        if rank is None:
+            return None
+        return self.row_number - 1 - rank if self.descending else rank
+
+    def read_page(self, page):
+        """
+        :param page: 页号
+        :return: [(value, score)]
+        """
+        start = page * self.page_size
+        end = min(start + self.page_size, self.row_number) - 1
+        return decode_scan_rows('zset', self.con.zrange_page(self.key_name, start, end, self.descending))
+
+
+class ZsetScoreReader(object):
+    """
+    zset:用ZRANGEBYSCORE LIMIT按分数范围逐页读取.LIMIT的offset越大越慢,
+    所以记录每页起始的(分数, 该分数中需要跳过的条数),下一页从上一页最后的分数开始读取
+    """
+    prefetch = True  # 读取某页后在后台预读下一页
+
+    def __init__(self, con, key_name, min_score='-inf', max_score='+inf', page_size=PAGE_SIZE, descending=False):
+        """
+        :param con: RedisOperation实例
+        :param key_name: db的key值
+        :param min_score: 最小分数,可以为'-inf'或'(1'等redis格式
+        :param max_score: 最大分数,可以为'+inf'
+        :param page_size: 每页的数据条数
+        :param descending: 为True时按分数由大到小读取
+        """
+        self.con = con
+        self.key_name = key_name
+        self.min_score = min_score
+        self.max_score = max_score
+        self.page_size = page_size
+        self.descending = descending
+        self.row_number = con.zcount(key_name, min_score, max_score)  # 范围内的数据数量
+        self._lock = threading.Lock()  # 页在后台线程中读取,GUI线程同时查询page_start_dict
+        self.page_start_dict = {0: (max_score if descending else min_score, 0)}  # {页号:(分数, 跳过条数)}
+
+    def has_page(self, page):
+        with self._lock:
+            return page in self.page_start_dict
+
+    def read_page(self, page):
+        """
+        从该页记录的起始分数开始读取一页.只能读取已经记录了起始位置的页
+        :param page: 页号
+        :return: [(value, score)]
+        """
+        with self._lock:
+            score, skip = self.page_start_dict[page]
+        if self.descending:
+            data = self.con.zrangebyscore_page(self.key_name, self.min_score, score, skip, self.page_size, True)
+        else:
+            data = self.con.zrangebyscore_page(self.key_name, score, self.max_score, skip, self.page_size)
+        if len(data) == self.page_size and (page + 1) * self.page_size < self.row_number:
+            last_score = data[-1][1]
+            same_number = sum(1 for _, member_score in data if member_score == last_score)
+            if same_number == len(data) and last_score == score:  # 整页分数相同,下一页继续跳过
+                same_number += skip
+            with self._lock:
+                self.page_start_dict[page + 1] = (last_score, same_number)
+        return decode_scan_rows('zset', data)
+
+
+def is_binary(sample):
+    """
+    :param sample: string开头的一段字节
+    :return: 包含NUL,不是utf-8(允许结尾的字符被截断)或控制字符过多时视为二进制数据
+    """
+    if b'\x00' in sample:
+        return True
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return True
+    control_number = sum(1 for byte in sample if byte < 32 and byte not in (9, 10, 13))
+    return control_number > len(sample) // 10
+
+
+def hex_rows(offset, data, row_bytes=HEX_ROW_BYTES):
+    """
+    :param offset: data第一个字节在string中的位置
+    :param data: bytes
+    :return: [(偏移, 十六进制, 可打印字符)],每行row_bytes个字节
+    """
+    rows = []
+    for start in range(0, len(data), row_bytes):
+        chunk = data[start:start + row_bytes]
+        rows.append(('{:08x}'.format(offset + start), chunk.hex(' '),
+                     ''.join(chr(byte) if 32 <= byte < 127 else '.' for byte in chunk)))
+    return rows
+
+
+class StringChunkReader(object):
+    """
+    string:先STRLEN获取长度,滚动时用GETRANGE逐页读取,内存中只保留PageCache中的页,不会读取整个值.
+    文本方式每行约TEXT_ROW_BYTES个字节,行的边界向后移到utf-8字符的开头,多字节字符不会被拆开;
+    十六进制方式每行HEX_ROW_BYTES个字节
+    """
+    random_access = False  # 行数可能很多,随滚动逐页交给视图
+    read_only = True  # 每行只是值的一部分,不能按行修改
+
+    def __init__(self, con, key_name, hex_view=False, page_size=PAGE_SIZE, string_length=None):
+        """
+        :param con: RedisOperation实例
+        :param key_name: db的key值
+        :param hex_view: 是否按十六进制展示
+        :param page_size: 每页的行数
+        :param string_length: 值的字节数,为None时通过STRLEN获取
+        """
+        self.con = con
+        self.key_name = key_name
+        self.hex_view = hex_view
+        self.page_size = page_size
+        self.row_bytes = HEX_ROW_BYTES if hex_view else TEXT_ROW_BYTES
+        self.string_length = con.strlen(key_name) if string_length is None else string_length
+        self.row_number = -(-self.string_length // self.row_bytes)
+        self.column_list = ['offset', 'hex', 'ascii'] if hex_view else ['offset', 'value']
+
+    def has_page(self, page):
+        return 0 <= page * self.page_size < self.row_number
+
+    def read_page(self, page):
+        """
+        :param page: 页号
+        :return: 十六进制方式为[(偏移, 十六进制, 可打印字符)],文本方式为[(偏移, 文本)]
+        """
+        start = page * self.page_size * self.row_bytes
+        end = min(start + self.page_size * self.row_bytes, self.string_length)
+        if start >= end:
+            return []
+        if self.hex_view:
+            return hex_rows(start, self.con.getrange(self.key_name, start, end - 1), self.row_bytes)
+        data = self.con.getrange(self.key_name, start, end + 2)  # 多读3个字节,最后一行可以包含完整的字符
+
+        def boundary(pos):
+            # utf-8的后续字节为10xxxxxx,一个字符最多4个字节
+            limit = min(pos + 3, len(data))
+            while pos < limit and data[pos] & 0xC0 == 0x80:
+                pos += 1
+            return pos
+        row_start_list = [boundary(pos) for pos in range(0, end - start, self.row_bytes)] + [boundary(end - start)]
+        return [('{:08x}'.format(start + row_start), data[row_start:row_end].decode('utf-8', 'replace'))
+                for row_start, row_end in zip(row_start_list, row_start_list[1:])]
+
+
+def decode_scan_rows(key_type, data):
+    """
+    把HSCAN/SSCAN/ZSCAN返回的数据转换为表格的行
+    :return: [(列1, 列2)] 或 [(value,)]
+    """
+    if key_type == 'hash':
+        return [(field.decode(), value.decode()) for field, value in data.items()]
+    if key_type == 'zset':
+        return [(value.decode(), str(score)) for value, score in data]
+    return [(value.decode(),) for value in data]
+
+
+def search_values(con, key_name, key_type, match, count=SEARCH_COUNT, key_length=0):
+    """
+    用HSCAN/SSCAN/ZSCAN的MATCH在redis中过滤,每批匹配结果立即返回
+    :param con: RedisOperation实例
+    :param key_name: db的key值
+    :param key_type: hash/set/zset
+    :param match: MATCH模式
+    :param count: 每次扫描的COUNT,越大往返次数越少,但单次阻塞redis的时间越长
+    :param key_length: key的元素数量,用于估算进度
+    :return: generator (本批匹配的行, 进度0-1)
+    """
+    scan = {'hash': con.hscan, 'set': con.sscan, 'zset': con.zscan}[key_type]
+    cursor = 0
+    while True:
+        cursor, data = scan(key_name, cursor, match=match, count=count)
+        yield decode_scan_rows(key_type, data), scan_cursor_progress(cursor, key_length)
+        if cursor == 0:
+            return
+
+
+def find_exact(con, key_name, key_type, member):
+    """
+    精确查找一个field或member,只需要一次往返
+    :param con: RedisOperation实例
+    :param key_name: db的key值
+    :param key_type: hash/set/zset
+    :param member: hash的field,set/zset的member
+    :return: 找到时为一行数据,否则为[]
+    """
+    if key_type == 'hash':
+        value = con.hget(key_name, member)
+        return [] if value is None else [(member, value)]
+    if key_type == 'set':
+        return [(member,)] if con.sismember(key_name, member) else []
+    score = con.zscore(key_name, member)
+    return [] if score is None else [(member, str(score))]
+
+
+def create_page_reader(con, key_name, key_type, page_size=PAGE_SIZE, key_length=None, zset_order=None,
+                       score_range=None):
+    """
+    :param con: RedisOperation实例
+    :param key_name: db的key值
+    :param key_type: key的数据类型
+    :param page_size: 每页的数据条数
+    :param key_length: 已知的key长度,list可以省去一次LLEN
+    :param zset_order: zset的顺序,None为ZSCAN的顺序,'asc'/'desc'为按分数由小到大/由大到小
+    :param score_range: (最小分数, 最大分数),不为None时zset只读取该分数范围,未指定顺序时由小到大
+    :return: 对应数据类型的按页读取器,不支持的类型返回None
+    """
+    if key_type == 'list':
+        return ListPageReader(con, key_name, page_size, key_length)
+    if key_type == 'zset' and score_range is not None:
+        return ZsetScoreReader(con, key_name, score_range[0], score_range[1], page_size, zset_order == 'desc')
+    if key_type == 'zset' and zset_order is not None:
+        return ZsetRankReader(con, key_name, page_size, key_length, zset_order == 'desc')
+    if key_type in ('hash', 'set', 'zset'):
+        return ScanPageReader(con, key_name, key_type, page_size)
+    return None
@@ -1,150 +1,150 @@
-# -*- coding: utf-8 -*-
-
-# Form implementation generated from reading ui file 'window.ui'
-#
-# Created by: PyQt5 UI code generator 5.15.4
-#
-# WARNING: Any manual changes made to this file will be lost when pyuic5 is
-# run again.  Do not edit this file unless you know what you are doing.
-
-
-from PyQt5 import QtCore, QtGui, QtWidgets
-
-
-class Ui_RedisDesktop(object):
-    def setupUi(self, RedisDesktop):
-        RedisDesktop.setObjectName("RedisDesktop")
-        RedisDesktop.resize(1000, 600)
-        RedisDesktop.setMaximumSize(QtCore.QSize(1000, 1000))
-        font = QtGui.QFont()
-        font.setFamily("Arial")
-        font.setPointSize(11)
-        RedisDesktop.setFont(font)
-        self.centralwidget = QtWidgets.QWidget(RedisDesktop)
-        self.centralwidget.setObjectName("centralwidget")
-        self.add_connection_button = QtWidgets.QPushButton(self.centralwidget)
-        self.add_connection_button.setGeometry(QtCore.QRect(10, 500, 241, 28))
-        self.add_connection_button.setObjectName("add_connection_button")
-        self.connection_name = QtWidgets.QComboBox(self.centralwidget)
-        self.connection_name.setGeometry(QtCore.QRect(10, 90, 151, 21))
-        self.connection_name.setObjectName("connection_name")
-        self.label = QtWidgets.QLabel(self.centralwidget)
-        self.label.setGeometry(QtCore.QRect(20, 20, 200, 60))
-        self.label.setMinimumSize(QtCore.QSize(200, 60))
-        self.label.setObjectName("label")
-        self.label_2 = QtWidgets.QLabel(self.centralwidget)
-        self.label_2.setGeometry(QtCore.QRect(20, 120, 200, 60))
-        self.label_2.setMinimumSize(QtCore.QSize(200, 60))
-        self.label_2.setObjectName("label_2")
-        self.select_button = QtWidgets.QPushButton(self.centralwidget)
-        self.select_button.setGeometry(QtCore.QRect(80, 360, 151, 41))
-        self.select_button.setObjectName("select_button")
-        self.connection_db = QtWidgets.QComboBox(self.centralwidget)
-        self.connection_db.setGeometry(QtCore.QRect(10, 200, 151, 21))
-        self.connection_db.setObjectName("connection_db")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.connection_db.addItem("")
-        self.select_connection_button = QtWidgets.QPushButton(self.centralwidget)
-        self.select_connection_button.setGeometry(QtCore.QRect(180, 90, 81, 21))
-        self.select_connection_button.setObjectName("select_connection_button")
-        self.select_db_button = QtWidgets.QPushButton(self.centralwidget)
-        self.select_db_button.setGeometry(QtCore.QRect(180, 200, 81, 21))
-        self.select_db_button.setObjectName("select_db_button")
-        self.label_4 = QtWidgets.QLabel(self.centralwidget)
-        self.label_4.setGeometry(QtCore.QRect(10, 260, 200, 60))
-        self.label_4.setMinimumSize(QtCore.QSize(200, 60))
-        font = QtGui.QFont()
-        font.setFamily("Arial")
-        font.setPointSize(11)
-        font.setBold(False)
-        font.setWeight(50)
-        self.label_4.setFont(font)
-        self.label_4.setObjectName("label_4")
-        self.tableView = QtWidgets.QTableView(self.centralwidget)
-        self.tableView.setGeometry(QtCore.QRect(330, 50, 541, 471))
-        self.tableView.setObjectName("tableView")
-        self.key_edit = QtWidgets.QLineEdit(self.centralwidget)
-        self.key_edit.setGeometry(QtCore.QRect(150, 270, 151, 41))
-        self.key_edit.setObjectName("key_edit")
-        self.key_type_view = QtWidgets.QLabel(self.centralwidget)
-        self.key_type_view.setGeometry(QtCore.QRect(340, 20, 101, 21))
-        self.key_type_view.setText("")
-        self.key_type_view.setObjectName("key_type_view")
-        self.key_size_view = QtWidgets.QLabel(self.centralwidget)
-        self.key_size_view.setGeometry(QtCore.QRect(650, 20, 101, 21))
-        self.key_size_view.setText("")
-        self.key_size_view.setObjectName("key_size_view")
-        self.label_3 = QtWidgets.QLabel(self.centralwidget)
-        self.label_3.setGeometry(QtCore.QRect(610, 20, 72, 21))
-        self.label_3.setObjectName("label_3")
-        self.layoutWidget = QtWidgets.QWidget(self.centralwidget)
-        self.layoutWidget.setGeometry(QtCore.QRect(891, 71, 101, 281))
-        self.layoutWidget.setObjectName("layoutWidget")
-        self.verticalLayout = QtWidgets.QVBoxLayout(self.layoutWidget)
-        self.verticalLayout.setContentsMargins(0, 0, 0, 0)
-        self.verticalLayout.setObjectName("verticalLayout")
-        self.delete_key_button = QtWidgets.QPushButton(self.layoutWidget)
-        self.delete_key_button.setObjectName("delete_key_button")
-        self.verticalLayout.addWidget(self.delete_key_button)
-        self.delete_row_button = QtWidgets.QPushButton(self.layoutWidget)
-        self.delete_row_button.setObjectName("delete_row_button")
-        self.verticalLayout.addWidget(self.delete_row_button)
-        self.save_value_button = QtWidgets.QPushButton(self.layoutWidget)
-        self.save_value_button.setObjectName("save_value_button")
-        self.verticalLayout.addWidget(self.save_value_button)
-        RedisDesktop.setCentralWidget(self.centralwidget)
-        self.menubar = QtWidgets.QMenuBar(RedisDesktop)
-        self.menubar.setGeometry(QtCore.QRect(0, 0, 1000, 26))
-        self.menubar.setObjectName("menubar")
-        RedisDesktop.setMenuBar(self.menubar)
-        self.statusbar = QtWidgets.QStatusBar(RedisDesktop)
-        self.statusbar.setObjectName("statusbar")
-        RedisDesktop.setStatusBar(self.statusbar)
-
-        self.retranslateUi(RedisDesktop)
-        QtCore.QMetaObject.connectSlotsByName(RedisDesktop)
-
-    def retranslateUi(self, RedisDesktop):
-        _translate = QtCore.QCoreApplication.translate
-        RedisDesktop.setWindowTitle(_translate("RedisDesktop", "MainWindow"))
-        self.add_connection_button.setText(_translate("RedisDesktop", "Connect to Redis Server"))
-        self.label.setText(_translate("RedisDesktop", "Connection"))
-        self.label_2.setText(_translate("RedisDesktop", "Db"))
-        self.select_button.setText(_translate("RedisDesktop", "OK"))
-        self.connection_db.setItemText(0, _translate("RedisDesktop", "0"))
-        self.connection_db.setItemText(1, _translate("RedisDesktop", "1"))
-        self.connection_db.setItemText(2, _translate("RedisDesktop", "2"))
-        self.connection_db.setItemText(3, _translate("RedisDesktop", "3"))
-        self.connection_db.setItemText(4, _translate("RedisDesktop", "4"))
-        self.connection_db.setItemText(5, _translate("RedisDesktop", "5"))
-        self.connection_db.setItemText(6, _translate("RedisDesktop", "6"))
-        self.connection_db.setItemText(7, _translate("RedisDesktop", "7"))
-        self.connection_db.setItemText(8, _translate("RedisDesktop", "8"))
-        self.connection_db.setItemText(9, _translate("RedisDesktop", "9"))
-        self.connection_db.setItemText(10, _translate("RedisDesktop", "10"))
-        self.connection_db.setItemText(11, _translate("RedisDesktop", "11"))
-        self.connection_db.setItemText(12, _translate("RedisDesktop", "12"))
-        self.connection_db.setItemText(13, _translate("RedisDesktop", "13"))
-        self.connection_db.setItemText(14, _translate("RedisDesktop", "14"))
-        self.connection_db.setItemText(15, _translate("RedisDesktop", "15"))
-        self.select_connection_button.setText(_translate("RedisDesktop", "OK"))
-        self.select_db_button.setText(_translate("RedisDesktop", "OK"))
-        self.label_4.setText(_translate("RedisDesktop", "Key"))
-        self.label_3.setText(_translate("RedisDesktop", "size:"))
-        self.delete_key_button.setText(_translate("RedisDesktop", "Delete key"))
-        self.delete_row_button.setText(_translate("RedisDesktop", "Delete row"))
-        self.save_value_button.setText(_translate("RedisDesktop", "save row"))
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'window.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.4
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_RedisDesktop(object):
+    def setupUi(self, RedisDesktop):
+        RedisDesktop.setObjectName("RedisDesktop")
+        RedisDesktop.resize(1000, 600)
+        RedisDesktop.setMaximumSize(QtCore.QSize(1000, 1000))
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(11)
+        RedisDesktop.setFont(font)
+        self.centralwidget = QtWidgets.QWidget(RedisDesktop)
+        self.centralwidget.setObjectName("centralwidget")
+        self.add_connection_button = QtWidgets.QPushButton(self.centralwidget)
+        self.add_connection_button.setGeometry(QtCore.QRect(10, 500, 241, 28))
+        self.add_connection_button.setObjectName("add_connection_button")
+        self.connection_name = QtWidgets.QComboBox(self.centralwidget)
+        self.connection_name.setGeometry(QtCore.QRect(10, 90, 151, 21))
+        self.connection_name.setObjectName("connection_name")
+        self.label = QtWidgets.QLabel(self.centralwidget)
+        self.label.setGeometry(QtCore.QRect(20, 20, 200, 60))
+        self.label.setMinimumSize(QtCore.QSize(200, 60))
+        self.label.setObjectName("label")
+        self.label_2 = QtWidgets.QLabel(self.centralwidget)
+        self.label_2.setGeometry(QtCore.QRect(20, 120, 200, 60))
+        self.label_2.setMinimumSize(QtCore.QSize(200, 60))
+        self.label_2.setObjectName("label_2")
+        self.select_button = QtWidgets.QPushButton(self.centralwidget)
+        self.select_button.setGeometry(QtCore.QRect(80, 360, 151, 41))
+        self.select_button.setObjectName("select_button")
+        self.connection_db = QtWidgets.QComboBox(self.centralwidget)
+        self.connection_db.setGeometry(QtCore.QRect(10, 200, 151, 21))
+        self.connection_db.setObjectName("connection_db")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.connection_db.addItem("")
+        self.select_connection_button = QtWidgets.QPushButton(self.centralwidget)
+        self.select_connection_button.setGeometry(QtCore.QRect(180, 90, 81, 21))
+        self.select_connection_button.setObjectName("select_connection_button")
+        self.select_db_button = QtWidgets.QPushButton(self.centralwidget)
+        self.select_db_button.setGeometry(QtCore.QRect(180, 200, 81, 21))
+        self.select_db_button.setObjectName("select_db_button")
+        self.label_4 = QtWidgets.QLabel(self.centralwidget)
+        self.label_4.setGeometry(QtCore.QRect(10, 260, 200, 60))
+        self.label_4.setMinimumSize(QtCore.QSize(200, 60))
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(11)
+        font.setBold(False)
+        font.setWeight(50)
+        self.label_4.setFont(font)
+        self.label_4.setObjectName("label_4")
+        self.tableView = QtWidgets.QTableView(self.centralwidget)
+        self.tableView.setGeometry(QtCore.QRect(330, 50, 541, 471))
+        self.tableView.setObjectName("tableView")
+        self.key_edit = QtWidgets.QLineEdit(self.centralwidget)
+        self.key_edit.setGeometry(QtCore.QRect(150, 270, 151, 41))
+        self.key_edit.setObjectName("key_edit")
+        self.key_type_view = QtWidgets.QLabel(self.centralwidget)
+        self.key_type_view.setGeometry(QtCore.QRect(340, 20, 101, 21))
+        self.key_type_view.setText("")
+        self.key_type_view.setObjectName("key_type_view")
+        self.key_size_view = QtWidgets.QLabel(self.centralwidget)
+        self.key_size_view.setGeometry(QtCore.QRect(650, 20, 101, 21))
+        self.key_size_view.setText("")
+        self.key_size_view.setObjectName("key_size_view")
+        self.label_3 = QtWidgets.QLabel(self.centralwidget)
+        self.label_3.setGeometry(QtCore.QRect(610, 20, 72, 21))
+        self.label_3.setObjectName("label_3")
+        self.layoutWidget = QtWidgets.QWidget(self.centralwidget)
+        self.layoutWidget.setGeometry(QtCore.QRect(891, 71, 101, 281))
+        self.layoutWidget.setObjectName("layoutWidget")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.layoutWidget)
+        self.verticalLayout.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.delete_key_button = QtWidgets.QPushButton(self.layoutWidget)
+        self.delete_key_button.setObjectName("delete_key_button")
+        self.verticalLayout.addWidget(self.delete_key_button)
+        self.delete_row_button = QtWidgets.QPushButton(self.layoutWidget)
+        self.delete_row_button.setObjectName("delete_row_button")
+        self.verticalLayout.addWidget(self.delete_row_button)
+        self.save_value_button = QtWidgets.QPushButton(self.layoutWidget)
+        self.save_value_button.setObjectName("save_value_button")
+        self.verticalLayout.addWidget(self.save_value_button)
+        RedisDesktop.setCentralWidget(self.centralwidget)
+        self.menubar = QtWidgets.QMenuBar(RedisDesktop)
+        self.menubar.setGeometry(QtCore.QRect(0, 0, 1000, 26))
+        self.menubar.setObjectName("menubar")
+        RedisDesktop.setMenuBar(self.menubar)
+        self.statusbar = QtWidgets.QStatusBar(RedisDesktop)
+        self.statusbar.setObjectName("statusbar")
+        RedisDesktop.setStatusBar(self.statusbar)
+
+        self.retranslateUi(RedisDesktop)
+        QtCore.QMetaObject.connectSlotsByName(RedisDesktop)
+
+    def retranslateUi(self, RedisDesktop):
+        _translate = QtCore.QCoreApplication.translate
+        RedisDesktop.setWindowTitle(_translate("RedisDesktop", "MainWindow"))
+        self.add_connection_button.setText(_translate("RedisDesktop", "Connect to Redis Server"))
+        self.label.setText(_translate("RedisDesktop", "Connection"))
+        self.label_2.setText(_translate("RedisDesktop", "Db"))
+        self.select_button.setText(_translate("RedisDesktop", "OK"))
+        self.connection_db.setItemText(0, _translate("RedisDesktop", "0"))
+        self.connection_db.setItemText(1, _translate("RedisDesktop", "1"))
+        self.connection_db.setItemText(2, _translate("RedisDesktop", "2"))
+        self.connection_db.setItemText(3, _translate("RedisDesktop", "3"))
+        self.connection_db.setItemText(4, _translate("RedisDesktop", "4"))
+        self.connection_db.setItemText(5, _translate("RedisDesktop", "5"))
+        self.connection_db.setItemText(6, _translate("RedisDesktop", "6"))
+        self.connection_db.setItemText(7, _translate("RedisDesktop", "7"))
+        self.connection_db.setItemText(8, _translate("RedisDesktop", "8"))
+        self.connection_db.setItemText(9, _translate("RedisDesktop", "9"))
+        self.connection_db.setItemText(10, _translate("RedisDesktop", "10"))
+        self.connection_db.setItemText(11, _translate("RedisDesktop", "11"))
+        self.connection_db.setItemText(12, _translate("RedisDesktop", "12"))
+        self.connection_db.setItemText(13, _translate("RedisDesktop", "13"))
+        self.connection_db.setItemText(14, _translate("RedisDesktop", "14"))
+        self.connection_db.setItemText(15, _translate("RedisDesktop", "15"))
+        self.select_connection_button.setText(_translate("RedisDesktop", "OK"))
+        self.select_db_button.setText(_translate("RedisDesktop", "OK"))
+        self.label_4.setText(_translate("RedisDesktop", "Key"))
+        self.label_3.setText(_translate("RedisDesktop", "size:"))
+        self.delete_key_button.setText(_translate("RedisDesktop", "Delete key"))
+        self.delete_row_button.setText(_translate("RedisDesktop", "Delete row"))
+        self.save_value_button.setText(_translate("RedisDesktop", "save row"))